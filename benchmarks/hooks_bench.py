@@ -0,0 +1,275 @@
+"""Benchmark every CLI of `cli.py` on synthetic repositories.
+
+Run with `python benchmarks/hooks_bench.py [--files 1000,10000,100000]`.
+
+Each CLI is timed in-process, i.e. hook work only, and as a subprocess,
+i.e. what git waits for, imports included. Results are written as JSON;
+`--compare OLD.json` flags medians over `--threshold` times the old ones.
+"""
+
+# ruff: noqa: S404 S603 T201
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import rich
+from rich.table import Table
+from synthetic_repo import PENDING_FILE, RepoSpec, make_repo
+
+from incolume.py.githooks import __version__, cli
+from incolume.py.githooks.core import get_committer_ident, get_git_context
+from incolume.py.githooks.stats import THRESHOLD
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+MODES: Final[tuple[str, ...]] = ('inprocess', 'subprocess')
+RESULTS_DIR: Final[Path] = Path(__file__).parent / 'results'
+ENV: Final[dict[str, str]] = {
+    'GIT_AUTHOR_NAME': 'Bench',
+    'GIT_AUTHOR_EMAIL': 'bench@example.com',
+    'GIT_COMMITTER_NAME': 'Bench',
+    'GIT_COMMITTER_EMAIL': 'bench@example.com',
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    """How to call one CLI inside a synthetic repository."""
+
+    argv: tuple[str, ...] = ()
+    stdin: bool = False
+    """Feed a pre-receive line for the pending push."""
+    rewrites: bool = False
+    """The CLI rewrites the commit message, restored before each run."""
+
+
+MSG: Final[str] = '.git/COMMIT_EDITMSG'
+CASES: Final[dict[str, Case]] = {
+    'audit_branchnames_cli': Case(),
+    'audit_commits_cli': Case(('HEAD',)),
+    'check_len_first_line_commit_msg_cli': Case((MSG, 'message', '')),
+    'check_type_commit_msg_cli': Case((MSG,)),
+    'check_valid_branchname_cli': Case((MSG,)),
+    'check_valid_filenames_cli': Case(('--staged',)),
+    'clean_commit_msg_cli': Case((MSG, 'message', ''), rewrites=True),
+    'detect_private_key_cli': Case(('--staged',)),
+    'effort_msg_cli': Case(),
+    'footer_signedoffby_cli': Case((MSG, 'message', ''), rewrites=True),
+    'get_msg_cli': Case(),
+    'hooks_stats_cli': Case(),
+    'insert_diff_cli': Case((MSG, 'message', ''), rewrites=True),
+    'pre_commit_installed_cli': Case(),
+    'pre_receive_cli': Case(stdin=True),
+    'validate_commit_range_cli': Case(('HEAD',)),
+    'validate_format_commit_msg_cli': Case((MSG,)),
+}
+
+
+@dataclass
+class Measure:
+    """Wall times of one CLI, in seconds."""
+
+    repo: str
+    cli: str
+    mode: str
+    runs: int
+    min: float
+    median: float
+    max: float
+    code: int
+
+
+def exit_code(call: Callable[[], object]) -> int:
+    """Call, mapping the outcome to a code as `sys.exit` does for scripts."""
+    try:
+        code = call()
+    except SystemExit as e:
+        code = e.code
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+@contextlib.contextmanager
+def redirect_stdin(stream: io.StringIO) -> Iterator[None]:
+    """Replace `sys.stdin` for the block."""
+    saved, sys.stdin = sys.stdin, stream
+    try:
+        yield
+    finally:
+        sys.stdin = saved
+
+
+def run_inprocess(name: str, case: Case, stdin: str) -> int:
+    """Run a CLI in this process, as a fresh hook invocation would."""
+    get_git_context.cache_clear()
+    get_committer_ident.cache_clear()
+    sink = io.StringIO()
+    with (
+        contextlib.redirect_stdout(sink),
+        contextlib.redirect_stderr(sink),
+        contextlib.ExitStack() as stack,
+    ):
+        if case.stdin:
+            stack.enter_context(redirect_stdin(io.StringIO(stdin)))
+        return exit_code(lambda: getattr(cli, name)(list(case.argv)))
+
+
+def run_subprocess(name: str, case: Case, stdin: str) -> int:
+    """Run a CLI in a new interpreter, like its console script."""
+    code = (
+        'import sys\n'
+        f'from incolume.py.githooks.cli import {name}\n'
+        f'sys.exit({name}())\n'
+    )
+    return subprocess.run(
+        [sys.executable, '-c', code, *case.argv],
+        input=stdin if case.stdin else None,
+        capture_output=True,
+        text=True,
+        check=False,
+    ).returncode
+
+
+def measure(path: Path, name: str, mode: str, repeat: int) -> Measure:
+    """Time `repeat` runs of a CLI inside the repository at `path`."""
+    case = CASES[name]
+    message = path / MSG
+    original = message.read_bytes()
+    pending = (path / '.git' / PENDING_FILE).read_text(encoding='utf-8')
+    stdin = f'{"0" * 40} {pending} refs/heads/feat/issue#9999\n'
+    run = run_inprocess if mode == 'inprocess' else run_subprocess
+    walls, code = [], 0
+    for _ in range(repeat):
+        if case.rewrites:
+            message.write_bytes(original)
+        start = time.perf_counter()
+        code = run(name, case, stdin)
+        walls.append(time.perf_counter() - start)
+    message.write_bytes(original)
+    return Measure(
+        path.name,
+        name,
+        mode,
+        repeat,
+        min(walls),
+        statistics.median(walls),
+        max(walls),
+        code,
+    )
+
+
+def compare(
+    current: list[Measure], previous: Path, threshold: float
+) -> list[str]:
+    """Print medians side by side, returning the regressed keys."""
+    old = {
+        (x['repo'], x['cli'], x['mode']): x['median']
+        for x in json.loads(previous.read_text(encoding='utf-8'))['results']
+    }
+    table = Table(title=f'Median (ms) against {previous.name}')
+    for column in ('repo', 'cli', 'mode', 'old', 'new', 'ratio'):
+        table.add_column(column)
+    regressions = []
+    for item in current:
+        key = (item.repo, item.cli, item.mode)
+        if key not in old:
+            continue
+        ratio = item.median / old[key] if old[key] else 1.0
+        text = f'{ratio:.2f}x'
+        if ratio > threshold:
+            regressions.append(' '.join(key))
+            text = f'[red]{text}[/red]'
+        table.add_row(
+            *key, f'{old[key] * 1e3:.1f}', f'{item.median * 1e3:.1f}', text
+        )
+    rich.print(table)
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Generate the repositories, time the CLIs and write the results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', default='1000,10000,100000')
+    parser.add_argument('--size', default=RepoSpec.size, type=int)
+    parser.add_argument('--branches', default=RepoSpec.branches, type=int)
+    parser.add_argument('--commits', default=RepoSpec.commits, type=int)
+    parser.add_argument('--message', default=RepoSpec.message, type=int)
+    parser.add_argument('--repeat', default=5, type=int)
+    parser.add_argument('--mode', default=','.join(MODES))
+    parser.add_argument('--cli', default=','.join(CASES))
+    parser.add_argument(
+        '--workdir',
+        default=Path(tempfile.gettempdir()) / 'incolume-bench',
+        type=Path,
+        help='Generated repositories, reused between runs.',
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    parser.add_argument('--threshold', default=THRESHOLD, type=float)
+    args = parser.parse_args(argv)
+
+    os.environ.update(ENV)
+    home, results = Path.cwd(), []
+    try:
+        for files in map(int, args.files.split(',')):
+            spec = RepoSpec(
+                files, args.size, args.branches, args.commits, args.message
+            )
+            path = make_repo(args.workdir, spec)
+            os.chdir(path)
+            for name in args.cli.split(','):
+                for mode in args.mode.split(','):
+                    item = measure(path, name, mode, args.repeat)
+                    results.append(item)
+                    print(
+                        f'{item.repo:<32}{name:<40}{mode:<12}'
+                        f'{item.median * 1e3:>10.1f}ms',
+                        file=sys.stderr,
+                    )
+    finally:
+        os.chdir(home)
+
+    output = args.output or RESULTS_DIR / (
+        f'hooks-{__version__}-{time.strftime("%Y%m%dT%H%M%S")}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                'version': __version__,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': [asdict(x) for x in results],
+            },
+            indent=2,
+        ),
+        encoding='utf-8',
+    )
+    print(f'Results written: {output}', file=sys.stderr)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            rich.print(f'[red]Regressions: {", ".join(regressions)}[/red]')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Micro-benchmark: per-call regex construction versus the rule registry.
+
+Run with `python benchmarks/rules_bench.py [--number N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+from typing import TYPE_CHECKING
+
+from incolume.py.githooks.core.registry import RULES
+from incolume.py.githooks.core.rules import (
+    RULE_COMMITFORMAT,
+    ProtectedBranchName,
+    Status,
+    TypeCommit,
+)
+from incolume.py.githooks.validate_branchname import (
+    BranchViolation,
+    classify_branchname,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+SUBJECT = 'feat(ui): #1234 implementa o botão de envio'
+BRANCH = 'feat/issue#1234'
+
+
+def legacy_type_commit() -> bool:
+    """Check the type as `check_type_commit_msg` used to."""
+    regex = re.compile(rf'^({"|".join(TypeCommit.to_set())})(\([\w\W\s]+\))?:')
+    return bool(regex.match(SUBJECT))
+
+
+def legacy_commit_format() -> bool:
+    """Check the format as `validate_format_commit_msg` used to."""
+    regex = re.compile(RULE_COMMITFORMAT, flags=re.IGNORECASE)
+    return bool(regex.match(SUBJECT))
+
+
+def legacy_incolume_branch() -> bool:
+    """Check a branch as `ValidateBranchname` used to."""
+    regex = rf'^({"|".join(TypeCommit.to_set())})/(epoch|issue)#([0-9]+)$'
+    return bool(re.match(regex, BRANCH))
+
+
+def legacy_branch_violations() -> BranchViolation:
+    """Evaluate each branch rule in turn as `is_valid` used to."""
+    violations = BranchViolation.NONE
+    if BRANCH in {
+        ProtectedBranchName.MAIN.value,
+        ProtectedBranchName.MASTER.value,
+    }:
+        violations |= BranchViolation.PROTECTED_MAIN
+    if RULES.match('branchname_refused', BRANCH):
+        violations |= BranchViolation.REFUSED
+    if not RULES.match('branchname', BRANCH):
+        violations |= BranchViolation.NOT_MATCHES_RULE
+    return violations
+
+
+def legacy_status_or() -> Status:
+    """Combine a status with an int as `Status.__or__` used to."""
+    return Status(Status.SUCCESS.value | Status(1).value)
+
+
+CASES: dict[str, tuple[Callable[[], object], Callable[[], object]]] = {
+    'type_commit': (
+        legacy_type_commit,
+        lambda: bool(RULES.match('type_commit', SUBJECT)),
+    ),
+    'commit_format': (
+        legacy_commit_format,
+        lambda: bool(RULES.match('commit_format', SUBJECT)),
+    ),
+    'branchname_incolume': (
+        legacy_incolume_branch,
+        lambda: bool(RULES.match('branchname_incolume', BRANCH)),
+    ),
+    'branch_classifier': (
+        legacy_branch_violations,
+        lambda: classify_branchname(BRANCH),
+    ),
+    'status_or': (legacy_status_or, lambda: Status.SUCCESS | 1),
+}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print the per-call cost of each approach in microseconds."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', default=100_000, type=int)
+    args = parser.parse_args(argv)
+
+    print(f'{"rule":<22}{"per-call":>12}{"registry":>12}{"speedup":>10}')  # noqa: T201
+    for name, (legacy, registry) in CASES.items():
+        assert legacy() == registry()  # noqa: S101
+        before, after = (
+            min(timeit.repeat(f, number=args.number, repeat=5))
+            / args.number
+            * 1e6
+            for f in (legacy, registry)
+        )
+        print(  # noqa: T201
+            f'{name:<22}{before:>10.2f}us{after:>10.2f}us'
+            f'{before / after:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
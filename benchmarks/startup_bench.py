@@ -0,0 +1,293 @@
+"""Guard the startup time of every console script.
+
+Run with `python benchmarks/startup_bench.py [--runs 20] [--budget 300]`.
+
+Each script of `[project.scripts]` is run as its entry point would be,
+doing nothing (`--nonexequi`, or `--help` where there is no such option),
+under `-X importtime`. The median wall time is checked against the budget,
+and the import time is broken down by package, e.g. `icecream` including
+the `pygments` it pulls in, whoever imported `icecream`.
+"""
+
+# ruff: noqa: S404 S603 T201
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import rich
+from rich.table import Table
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    import tomllib as tomli  # type: ignore[import]
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    import tomli  # type: ignore[import]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+PYPROJECT: Final[Path] = Path(__file__).parents[1] / 'pyproject.toml'
+RESULTS_DIR: Final[Path] = Path(__file__).parent / 'results'
+BUDGET: Final[float] = 300.0
+"""Median startup allowed per script, in milliseconds."""
+THIRD_PARTY: Final[tuple[str, ...]] = (
+    'colorama',
+    'deprecated',
+    'icecream',
+    'rich',
+    'tomli',
+)
+OWN: Final[str] = 'incolume'
+NO_NONEXEQUI: Final[frozenset[str]] = frozenset({
+    'audit-branchnames',
+    'audit-commits',
+    'hooks-stats',
+})
+MSG: Final[str] = 'COMMIT_EDITMSG'
+POSITIONALS: Final[dict[str, tuple[str, ...]]] = {
+    'check-len-first-line': (MSG, 'message', ''),
+    'clean-commit-msg': (MSG, 'message', ''),
+    'insert-diff-commit': (MSG, 'message', ''),
+    'is-valid-branchname': (MSG,),
+    'set-footer-signed-off-by': (MSG, 'message', ''),
+}
+"""Required arguments, never read with `--nonexequi`."""
+
+
+@dataclass
+class Import:
+    """One line of `-X importtime`, times in microseconds."""
+
+    module: str
+    own: int
+    cumulative: int
+    depth: int
+    owner: str = ''
+    """Outermost package of `TRACKED` that led here, else the top level."""
+
+
+TRACKED: Final[frozenset[str]] = frozenset({*THIRD_PARTY, OWN})
+
+
+def package(module: str) -> str:
+    """Top-level package, `tomllib` counted as `tomli`.
+
+    Examples:
+        >>> package('rich.console'), package('tomllib._parser')
+        ('rich', 'tomli')
+
+    """
+    root = module.partition('.')[0]
+    return 'tomli' if root == 'tomllib' else root
+
+
+def parse_importtime(stderr: str) -> list[Import]:
+    r"""Parse `-X importtime` lines, finding the owner of each import.
+
+    Lines come children first; read backwards, each parent precedes its
+    children, so the owners of the ancestors are a stack indexed by depth.
+    A third-party package of `THIRD_PARTY` owns what it imports, whoever
+    imported it; anything else is owned by its importer.
+
+    Examples:
+        >>> lines = (
+        ...     'import time: self [us] | cumulative | imported package\n'
+        ...     'import time:        5 |          5 |     pygments\n'
+        ...     'import time:       10 |         15 |   icecream\n'
+        ...     'import time:        1 |          1 |   json\n'
+        ...     'import time:       20 |         36 | incolume\n'
+        ... )
+        >>> [x.owner for x in parse_importtime(lines)]
+        ['icecream', 'icecream', 'incolume', 'incolume']
+
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(Import(module, int(own), int(cumulative), depth))
+    stack: list[str] = []
+    for item in reversed(imports):
+        del stack[item.depth :]
+        parent = stack[-1] if stack else ''
+        root = package(item.module)
+        if parent in TRACKED - {OWN} or (parent and root not in TRACKED):
+            item.owner = parent
+        else:
+            item.owner = root
+        stack.append(item.owner)
+    return imports
+
+
+def breakdown(imports: Iterable[Import]) -> dict[str, int]:
+    """Self microseconds per owner, so the columns add up to the total.
+
+    Owners out of `TRACKED` are added up as `other`, mostly the standard
+    library imported by the interpreter itself.
+    """
+    totals = dict.fromkeys((*THIRD_PARTY, OWN, 'other'), 0)
+    for item in imports:
+        totals[item.owner if item.owner in totals else 'other'] += item.own
+    return totals
+
+
+@dataclass
+class Startup:
+    """Startup of one console script over many runs."""
+
+    script: str
+    entry_point: str
+    runs: int
+    median: float
+    """Wall time, in milliseconds."""
+    p95: float
+    imports: float
+    """Median of the total import time, in milliseconds."""
+    packages: dict[str, float] = field(default_factory=dict)
+    """Median milliseconds per package, see `breakdown`."""
+    tree: list[dict] = field(default_factory=list)
+    """Import tree of the median run."""
+
+
+def read_scripts(path: Path = PYPROJECT) -> dict[str, str]:
+    """Console scripts and their `module:function` entry points."""
+    with path.open('rb') as file:
+        return tomli.load(file)['project']['scripts']
+
+
+def script_argv(script: str) -> list[str]:
+    """Arguments for a run that only starts up.
+
+    Examples:
+        >>> script_argv('is-valid-branchname')
+        ['COMMIT_EDITMSG', '--nonexequi']
+        >>> script_argv('hooks-stats')
+        ['--help']
+
+    """
+    if script in NO_NONEXEQUI:
+        return ['--help']
+    return [*POSITIONALS.get(script, ()), '--nonexequi']
+
+
+def run_once(entry_point: str, argv: Sequence[str]) -> tuple[float, str]:
+    """Run an entry point like its script; wall ms and `importtime` lines."""
+    module, _, function = entry_point.partition(':')
+    code = (
+        f'import sys\nfrom {module} import {function}\nsys.exit({function}())'
+    )
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code, *argv],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall = (time.perf_counter() - start) * 1e3
+    return wall, process.stderr
+
+
+def measure(script: str, entry_point: str, runs: int) -> Startup:
+    """Run a script `runs` times, keeping the tree of the median run."""
+    samples = sorted(
+        (run_once(entry_point, script_argv(script)) for _ in range(runs)),
+        key=itemgetter(0),
+    )
+    trees = [parse_importtime(stderr) for _, stderr in samples]
+    walls = [wall for wall, _ in samples]
+    totals = [breakdown(x) for x in trees]
+    return Startup(
+        script,
+        entry_point,
+        runs,
+        statistics.median(walls),
+        walls[min(len(walls) - 1, round(0.95 * (len(walls) - 1)))],
+        statistics.median(sum(x.values()) for x in totals) / 1e3,
+        {
+            name: statistics.median(x[name] for x in totals) / 1e3
+            for name in totals[0]
+        },
+        [asdict(x) for x in trees[len(trees) // 2]],
+    )
+
+
+def render(results: Iterable[Startup], budget: float) -> Table:
+    """Table of startups, over the budget in red, in milliseconds."""
+    table = Table(title=f'Startup (ms), budget {budget:.0f}')
+    columns = ('script', 'median', 'p95', 'imports', *THIRD_PARTY, OWN)
+    for column in columns:
+        table.add_column(
+            column, justify='left' if column == 'script' else 'right'
+        )
+    for item in results:
+        median = f'{item.median:.1f}'
+        table.add_row(
+            item.script,
+            f'[red]{median}[/red]' if item.median > budget else median,
+            f'{item.p95:.1f}',
+            f'{item.imports:.1f}',
+            *(f'{item.packages[x]:.1f}' for x in (*THIRD_PARTY, OWN)),
+        )
+    return table
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Measure every script, exit 1 when one is over the budget."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', default=20, type=int)
+    parser.add_argument(
+        '--budget',
+        default=BUDGET,
+        type=float,
+        help='Median startup allowed per script, in milliseconds.',
+    )
+    parser.add_argument('--script', action='append', help='Default: all.')
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args(argv)
+
+    scripts = read_scripts()
+    results = [
+        measure(name, scripts[name], args.runs)
+        for name in args.script or scripts
+    ]
+    rich.print(render(results, args.budget))
+
+    output = args.output or RESULTS_DIR / (
+        f'startup-{time.strftime("%Y%m%dT%H%M%S")}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                'python': sys.version,
+                'budget': args.budget,
+                'results': [asdict(x) for x in results],
+            },
+            indent=2,
+        ),
+        encoding='utf-8',
+    )
+    print(f'Results written: {output}', file=sys.stderr)
+
+    if over := [x.script for x in results if x.median > args.budget]:
+        rich.print(f'[red]Over budget: {", ".join(over)}[/red]')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Generate local git repositories for benchmarking hooks, offline.
+
+Run with `python benchmarks/synthetic_repo.py DIR [--files N] ...`.
+
+History, branches and the commits of a pending push are written through a
+single `git fast-import`; the files are written to the worktree and staged,
+as before a `git commit`.
+"""
+
+# ruff: noqa: S404 S603 S607
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+IDENT: Final[str] = 'Bench <bench@example.com>'
+EPOCH: Final[int] = 1_700_000_000
+WORDS: Final[tuple[str, ...]] = (
+    'alpha',
+    'beta',
+    'gamma',
+    'delta',
+    'import',
+    'return',
+    'value',
+    'cache',
+    'index',
+    'staged',
+    'commit',
+    'branch',
+    'message',
+    'hook',
+    'scan',
+    'file',
+    'path',
+    'tree',
+    'blob',
+    'refs',
+    'config',
+)
+SPEC_FILE: Final[str] = 'bench-spec.json'
+PENDING_FILE: Final[str] = 'bench-pending'
+"""Tip of the commits of a pending push, unreachable from any ref."""
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """Shape of a synthetic repository."""
+
+    files: int = 1_000
+    size: int = 1_024
+    branches: int = 100
+    commits: int = 100
+    message: int = 200
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        """Directory name, one per shape.
+
+        Examples:
+            >>> RepoSpec(files=10).name
+            'f10-s1024-b100-c100-m200'
+
+        """
+        return (
+            f'f{self.files}-s{self.size}-b{self.branches}'
+            f'-c{self.commits}-m{self.message}'
+        )
+
+
+def text(rng: random.Random, size: int, width: int = 72) -> str:
+    """Words wrapped at `width`, exactly `size` characters long."""
+    lines, line, length = [], [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if line and len(' '.join([*line, word])) > width:
+            lines.append(' '.join(line))
+            length += len(lines[-1]) + 1
+            line = []
+        line.append(word)
+    return '\n'.join(lines)[:size].ljust(size)
+
+
+def commit_message(rng: random.Random, index: int, size: int) -> str:
+    """Conventional subject, with a body up to `size` characters."""
+    subject = f'feat(bench): #{index} synthetic change'
+    body = size - len(subject) - 2
+    return subject if body <= 0 else f'{subject}\n\n{text(rng, body)}'
+
+
+def branch_name(index: int) -> str:
+    """Branch name, one in ten refused by the naming rules.
+
+    Examples:
+        >>> branch_name(1), branch_name(10)
+        ('feat/issue#1', 'wip-10')
+
+    """
+    return f'wip-{index}' if index % 10 == 0 else f'feat/issue#{index}'
+
+
+def data(content: str) -> str:
+    """Encode a fast-import `data` command."""
+    return f'data {len(content.encode())}\n{content}\n'
+
+
+def fast_import_stream(spec: RepoSpec) -> Iterator[str]:
+    """Commands for history on `main`, branches and a pending push."""
+    rng = random.Random(spec.seed)  # noqa: S311
+    for mark in range(1, 2 * spec.commits + 1):
+        pending = mark > spec.commits
+        ref = 'refs/bench/pending' if pending else 'refs/heads/main'
+        yield f'commit {ref}\nmark :{mark}\n'
+        yield f'committer {IDENT} {EPOCH + mark} +0000\n'
+        yield data(commit_message(rng, mark, spec.message))
+        if mark == spec.commits + 1:
+            yield f'from :{spec.commits}\n'
+        yield 'M 644 inline CHANGELOG.md\n'
+        yield data(f'change {mark}\n')
+    for index in range(spec.branches):
+        yield f'reset refs/heads/{branch_name(index)}\nfrom :{spec.commits}\n'
+
+
+def run_git(path: Path, *args: str, stdin: str | None = None) -> str:
+    """Run git in `path`, returning its stripped output."""
+    return subprocess.run(
+        ['git', '-C', str(path), *args],
+        input=stdin,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
+def write_files(path: Path, spec: RepoSpec) -> None:
+    """Write `files` snake_case modules of `size` bytes each."""
+    rng = random.Random(spec.seed + 1)  # noqa: S311
+    for index in range(spec.files):
+        target = path / 'src' / f'pkg_{index // 1000:03d}'
+        if index % 1000 == 0:
+            target.mkdir(parents=True, exist_ok=True)
+        (target / f'module_{index:06d}.py').write_text(
+            text(rng, spec.size), encoding='utf-8'
+        )
+
+
+def make_repo(root: Path, spec: RepoSpec) -> Path:
+    """Create the repository of `spec` under `root`, reused when present.
+
+    HEAD is a valid feature branch with the files staged and a commit
+    message in `.git/COMMIT_EDITMSG`. The pending push tip is kept in
+    `.git/bench-pending`.
+    """
+    path = root / spec.name
+    if (path / '.git' / SPEC_FILE).is_file():
+        return path
+    path.mkdir(parents=True, exist_ok=True)
+    run_git(path, 'init', '-q', '-b', 'main')
+    run_git(
+        path,
+        'fast-import',
+        '--quiet',
+        stdin=''.join(fast_import_stream(spec)),
+    )
+    pending = run_git(path, 'rev-parse', 'refs/bench/pending')
+    run_git(path, 'update-ref', '-d', 'refs/bench/pending')
+    run_git(path, 'pack-refs', '--all')
+    run_git(path, 'symbolic-ref', 'HEAD', f'refs/heads/{branch_name(1)}')
+    run_git(path, 'reset', '-q', '--hard')
+    write_files(path, spec)
+    run_git(path, 'add', '.')
+
+    git_dir = path / '.git'
+    rng = random.Random(spec.seed + 2)  # noqa: S311
+    (git_dir / 'COMMIT_EDITMSG').write_text(
+        commit_message(rng, 0, spec.message) + '\n', encoding='utf-8'
+    )
+    (git_dir / PENDING_FILE).write_text(pending, encoding='utf-8')
+    (git_dir / SPEC_FILE).write_text(json.dumps(asdict(spec)), 'utf-8')
+    return path
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Create one repository and print its path."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('root', type=Path)
+    for name, default in asdict(RepoSpec()).items():
+        parser.add_argument(f'--{name}', default=default, type=int)
+    args = vars(parser.parse_args(argv))
+    print(make_repo(args.pop('root'), RepoSpec(**args)))  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
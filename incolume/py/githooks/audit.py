@@ -0,0 +1,200 @@
+"""Module to audit the conformance of a whole commit history."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING, Final
+
+from rich.table import Table
+
+from incolume.py.githooks.core import debug_enable
+from incolume.py.githooks.core.gitlog import iter_log
+from incolume.py.githooks.core.registry import RULES, resolve_type
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Future
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing import Self  # type: ignore[import]
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing_extensions import Self  # type: ignore[import]
+
+debug_enable()
+
+AUDIT_FIELDS: Final[tuple[str, ...]] = ('%aN', '%ad', '%B')
+DATE_FORMAT: Final[str] = '--date=format:%Y-%m'
+CHUNK_SIZE: Final[int] = 5_000
+DIMENSIONS: Final[tuple[str, ...]] = ('type', 'author', 'month')
+UNTYPED: Final[str] = '-'
+REGEX_PREFIX: Final[re.Pattern[str]] = re.compile(r'(\w+)(?:\(.*?\))?!?:')
+
+AuditRecord = tuple[str, str, str]
+"""Commit as `(author, month, subject)`."""
+
+
+def commit_type(subject: str) -> str:
+    """Canonical type of a subject, or `UNTYPED`.
+
+    Examples:
+        >>> commit_type('Feature(ui)!: #1 x'), commit_type('wip')
+        ('feat', '-')
+
+    """
+    if (match := REGEX_PREFIX.match(subject)) is None:
+        return UNTYPED
+    if (member := resolve_type(match.group(1))) is None:
+        return UNTYPED
+    return member.value
+
+
+def is_conforming(subject: str) -> bool:
+    """Check a subject against `RULE_COMMITFORMAT` and `TypeCommit`.
+
+    Only the first line decides, as `RULE_COMMITFORMAT` accepts any body.
+    """
+    return bool(RULES.match('commit_format', subject)) and bool(
+        RULES.match('type_commit', subject)
+    )
+
+
+@dataclass
+class AuditReport:
+    """Pass/fail counts keyed by `(dimension, value)`."""
+
+    passed: Counter[tuple[str, str]] = field(default_factory=Counter)
+    failed: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    def add(self, author: str, month: str, subject: str) -> None:
+        """Count one commit in every dimension."""
+        counter = self.failed
+        if is_conforming(subject):
+            counter = self.passed
+        for key in zip(
+            DIMENSIONS, (commit_type(subject), author, month), strict=True
+        ):
+            counter[key] += 1
+
+    def update(self, other: AuditReport) -> Self:
+        """Merge counts of another report."""
+        self.passed.update(other.passed)
+        self.failed.update(other.failed)
+        return self
+
+    @property
+    def total(self) -> tuple[int, int]:
+        """Passed and failed commits."""
+        return (
+            sum(v for (d, _), v in self.passed.items() if d == DIMENSIONS[0]),
+            sum(v for (d, _), v in self.failed.items() if d == DIMENSIONS[0]),
+        )
+
+    def rows(self, dimension: str) -> list[tuple[str, int, int]]:
+        """Rows `(value, passed, failed)` of a dimension, busiest first."""
+        values = {
+            value
+            for counter in (self.passed, self.failed)
+            for d, value in counter
+            if d == dimension
+        }
+        return sorted(
+            (
+                (v, self.passed[dimension, v], self.failed[dimension, v])
+                for v in values
+            ),
+            key=lambda row: (-row[1] - row[2], row[0]),
+        )
+
+
+def audit_chunk(records: Iterable[AuditRecord]) -> AuditReport:
+    """Audit a chunk of commits; runs in the worker processes."""
+    report = AuditReport()
+    for record in records:
+        report.add(*record)
+    return report
+
+
+def iter_chunks(
+    *args: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[list[AuditRecord]]:
+    """Stream `git log` as chunks of `(author, month, subject)`."""
+    records = (
+        (author, month, message.strip().partition('\n')[0])
+        for author, month, message in iter_log(
+            AUDIT_FIELDS, DATE_FORMAT, *args
+        )
+    )
+    while chunk := list(islice(records, chunk_size)):
+        yield chunk
+
+
+def audit_history(
+    *args: str, jobs: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> AuditReport:
+    """Audit commit messages of a history with a process pool.
+
+    `git log` is streamed in chunks and at most two chunks per worker are
+    in flight, so memory stays bounded whatever the history size.
+
+    Args:
+        args: Revisions and other `git log` arguments, e.g. `--all`.
+        jobs: Worker processes, default is the number of CPUs; 1 audits
+            in this process.
+        chunk_size: Commits sent to a worker at once.
+
+    Returns:
+        AuditReport: Aggregated counts.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    jobs = jobs or os.cpu_count() or 1
+    report = AuditReport()
+    chunks = iter_chunks(*args, chunk_size=chunk_size)
+    if jobs == 1:
+        for chunk in chunks:
+            report.update(audit_chunk(chunk))
+        return report
+
+    with ProcessPoolExecutor(jobs) as pool:
+        pending: set[Future[AuditReport]] = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.update(future.result())
+            pending.add(pool.submit(audit_chunk, chunk))
+        for future in pending:
+            report.update(future.result())
+    return report
+
+
+def render_report(report: AuditReport, top: int = 20) -> list[Table]:
+    """Render one table per dimension, `top` rows at most."""
+    tables = []
+    for dimension in DIMENSIONS:
+        rows = report.rows(dimension)
+        if dimension == 'month':
+            rows = sorted(rows)[-top:]
+        table = Table(title=f'Conformance by {dimension}')
+        for column in (dimension, 'passed', 'failed', '%'):
+            table.add_column(
+                column, justify='left' if column == dimension else 'right'
+            )
+        for value, passed, failed in rows[:top]:
+            table.add_row(
+                value,
+                str(passed),
+                str(failed),
+                f'{100 * passed / (passed + failed):.1f}',
+            )
+        tables.append(table)
+    return tables
@@ -3,41 +3,81 @@
 from __future__ import annotations
 
 import argparse
-import inspect
 import logging
 import platform
 import sys
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
 import rich
-from icecream import ic
+from rich.markup import escape
 
+from incolume.py.githooks.audit import (
+    CHUNK_SIZE,
+    audit_history,
+    render_report,
+)
 from incolume.py.githooks.commit_msg import get_msg
 from incolume.py.githooks.core import (
+    GitContext,
+    debug,
     debug_enable,
-    get_git_diff,
+    get_git_context,
+    get_signed_off_by,
 )
+from incolume.py.githooks.core.catfile import MAX_BLOB_SIZE
+from incolume.py.githooks.core.deadline import Deadline, report_unscanned
 from incolume.py.githooks.core.decorators import logging_call
+from incolume.py.githooks.core.gitrefs import iter_refnames
+from incolume.py.githooks.core.pipeline import MessagePipeline
 from incolume.py.githooks.core.rules import (
+    Backup,
     Result,
     Status,
 )
-from incolume.py.githooks.detect_private_key import has_private_key
+from incolume.py.githooks.core.staged import iter_staged_changes
+from incolume.py.githooks.core.timing import annotate, history_path
+from incolume.py.githooks.core.tracing import traced
+from incolume.py.githooks.detect_private_key import (
+    has_private_key,
+    scan_private_key,
+    staged_scanner,
+)
 from incolume.py.githooks.effort_message import effort_msg
 from incolume.py.githooks.footer_signedoffby import (
-    add_blank_line_if_needed,
-    add_signed_off_by,
     clean_commit_msg,
+    prepend_blank_line,
+    signing_off,
+    strip_commit_help,
 )
-from incolume.py.githooks.gitdiff import insert_git_diff
+from incolume.py.githooks.gitdiff import (
+    TOP_PATHS,
+    insert_git_diff,
+    summarize_git_diff,
+)
+from incolume.py.githooks.pre_receive import pre_receive
 from incolume.py.githooks.prepare_commit_msg import (
     check_max_len_first_line_commit_msg,
     check_min_len_first_line_commit_msg,
     check_type_commit_msg,
+    default_commit_range,
+    message_checks,
+    validate_commit_range,
     validate_format_commit_msg,
 )
-from incolume.py.githooks.validate_branchname import ValidateBranchname
+from incolume.py.githooks.stats import (
+    RECENT,
+    THRESHOLD,
+    hook_stats,
+    read_history,
+    render_stats,
+)
+from incolume.py.githooks.validate_branchname import (
+    ValidateBranchname,
+    audit_refnames,
+    violation_names,
+)
 from incolume.py.githooks.validate_filename import ValidateFilename
 
 debug_enable()
@@ -48,6 +88,12 @@ if TYPE_CHECKING:
 
 logging.debug('Python %s', platform.python_version())
 
+echo = traced(rich.print, 'output')
+"""Print with rich, as an `output` span while tracing."""
+
+MESSAGE_FACTS: Final[tuple[str, ...]] = ('committer_ident', 'git_diff')
+"""Facts read by the prepare-commit-msg hooks, gathered at once by either."""
+
 
 @logging_call(logging.INFO, 'Checking length of first line in commit message.')
 def check_len_first_line_commit_msg_cli(
@@ -87,14 +133,14 @@ def check_len_first_line_commit_msg_cli(
     )
     args = parser.parse_args(argv)
 
-    logging.info(inspect.stack()[0][3])
+    logging.info('check_len_first_line_commit_msg_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return result_code.value
 
     for filename in args.filenames:
-        ic(filename)
+        debug.log('filename: %s', filename)
         results.extend((
             check_min_len_first_line_commit_msg(
                 commit_msg_filepath=filename, len_line=args.min_first_line
@@ -104,7 +150,7 @@ def check_len_first_line_commit_msg_cli(
             ),
         ))
     for result in results:
-        rich.print(result.message)
+        echo(result.message)
         result_code |= result.code
 
     return result_code.value  # Validation passed, allow commit
@@ -125,7 +171,7 @@ def check_type_commit_msg_cli(
         help='Não executar hook.',
     )
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('check_type_commit_msg_cli')
     logging.debug('msgfile: %s', args)
 
     result = check_type_commit_msg(*args.filenames)
@@ -133,16 +179,22 @@ def check_type_commit_msg_cli(
     if args.nonexequi:
         sys.exit(0)
 
-    rich.print(result.message)
+    echo(result.message)
     sys.exit(result.code)  # Validation passed or failure, allowing commit
 
 
 @logging_call(logging.INFO, 'Checking valid branchname.')
-def check_valid_branchname_cli(argv: Sequence[str] | None = None) -> int:
+def check_valid_branchname_cli(
+    argv: Sequence[str] | None = None, context: GitContext | None = None
+) -> int:
     """Check valid branchname.
 
     Hook designed for stages: pre-commit, pre-push, manual
 
+    Args:
+        argv: Arguments values sequence.
+        context: Shared git context, default is the process-scoped one.
+
     Returns:
         int: 0 to SUCCESS or 1 to FAILURE
 
@@ -186,13 +238,13 @@ def check_valid_branchname_cli(argv: Sequence[str] | None = None) -> int:
     )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('check_valid_branchname_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return Status.SUCCESS.value
 
-    return ValidateBranchname().is_valid(
+    return ValidateBranchname(context=context or get_git_context()).is_valid(
         protected_dev=args.protected_dev,
         protected_tags=args.protected_tags,
         protected_main=args.protected_main,
@@ -200,10 +252,17 @@ def check_valid_branchname_cli(argv: Sequence[str] | None = None) -> int:
 
 
 @logging_call(logging.INFO, 'Checking valid filenames.')
-def check_valid_filenames_cli(argv: Sequence[str] | None = None) -> int:
+def check_valid_filenames_cli(
+    argv: Sequence[str] | None = None, context: GitContext | None = None
+) -> int:
     """Maint entry point for the script.
 
     Hook designed for stages: pre-commit, pre-push, manual
+
+    Args:
+        argv: Arguments values sequence.
+        context: Shared git context, default is the process-scoped one.
+
     """
     codes: Status = Status.SUCCESS
     parser = argparse.ArgumentParser(
@@ -211,9 +270,14 @@ def check_valid_filenames_cli(argv: Sequence[str] | None = None) -> int:
     )
     parser.add_argument(
         'filenames',
-        nargs='+',
+        nargs='*',
         help='Filenames to process.',
     )
+    parser.add_argument(
+        '--staged',
+        action='store_true',
+        help='Process staged files, read straight from the git index.',
+    )
     parser.add_argument(
         '--min-len',
         default=3,
@@ -228,6 +292,18 @@ def check_valid_filenames_cli(argv: Sequence[str] | None = None) -> int:
         required=False,
         help='Maximum length for a filename.',
     )
+    parser.add_argument(
+        '--time-budget',
+        default=None,
+        type=float,
+        metavar='SECONDS',
+        help='Stop scanning after SECONDS, failing unless --fail-open.',
+    )
+    parser.add_argument(
+        '--fail-open',
+        action='store_true',
+        help='Only warn about files left unscanned by --time-budget.',
+    )
     parser.add_argument(
         '--nonexequi',
         default=False,
@@ -237,32 +313,54 @@ def check_valid_filenames_cli(argv: Sequence[str] | None = None) -> int:
     )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('check_valid_filenames_cli')
     logging.debug('msgfile: %s', args)
 
+    if not args.filenames and not args.staged:
+        parser.error('the following arguments are required: filenames')
+
     if args.nonexequi:
         return 0
 
-    results: list[Result] = [
-        ValidateFilename.is_valid(
-            filename=filename, min_len=args.min_len, max_len=args.max_len
+    if args.staged:
+        args.filenames += (context or get_git_context()).staged_files
+
+    annotate(files=len(args.filenames))
+    deadline = Deadline(args.time_budget)
+    results: list[Result] = []
+    for index, filename in enumerate(args.filenames):
+        if deadline.expired():
+            results.append(
+                report_unscanned(
+                    Result(),
+                    args.filenames[index:],
+                    deadline,
+                    fail_open=args.fail_open,
+                )
+            )
+            break
+        results.append(
+            ValidateFilename.is_valid(
+                filename=filename, min_len=args.min_len, max_len=args.max_len
+            )
         )
-        for filename in args.filenames
-    ]
     for result in results:
-        rich.print(result.message)
+        echo(result.message)
         codes |= result.code
     return codes.value
 
 
 @logging_call(logging.INFO, 'Checking private keys in files.')
-def detect_private_key_cli(argv: Sequence[str] | None = None) -> int:
+def detect_private_key_cli(
+    argv: Sequence[str] | None = None, context: GitContext | None = None
+) -> int:
     """CLI to check private key.
 
     Hook designed for stages: all
 
     Args:
         argv (Sequence[str] | None, optional): _description_. Defaults to None.
+        context: Shared git context, default is the process-scoped one.
 
     Returns:
         int: _description_
@@ -270,6 +368,23 @@ def detect_private_key_cli(argv: Sequence[str] | None = None) -> int:
     """
     parser = argparse.ArgumentParser()
     parser.add_argument('filenames', nargs='*', help='Filenames to check')
+    parser.add_argument(
+        '--staged',
+        action='store_true',
+        help='Check staged files, scanning their content in the git index.',
+    )
+    parser.add_argument(
+        '--time-budget',
+        default=None,
+        type=float,
+        metavar='SECONDS',
+        help='Stop scanning after SECONDS, failing unless --fail-open.',
+    )
+    parser.add_argument(
+        '--fail-open',
+        action='store_true',
+        help='Only warn about files left unscanned by --time-budget.',
+    )
     parser.add_argument(
         '--nonexequi',
         default=False,
@@ -278,33 +393,50 @@ def detect_private_key_cli(argv: Sequence[str] | None = None) -> int:
         help='Não executar hook.',
     )
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('detect_private_key_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return 0
 
-    ic(args)
-    result = has_private_key(*args.filenames)
-    rich.print(result.message)
+    scan = scan_private_key
+    if args.staged:
+        context = context or get_git_context()
+        args.filenames += context.staged_files
+        scan = staged_scanner(context.git_dir)
+
+    debug.log('args: %s', args)
+    result = has_private_key(
+        *args.filenames,
+        deadline=Deadline(args.time_budget),
+        fail_open=args.fail_open,
+        scan=scan,
+    )
+    echo(result.message)
     return result.code.value
 
 
 @logging_call(
     logging.INFO, 'Processing footer signed-off-by in commit message.'
 )
-def footer_signedoffby_cli(argv: Sequence[str] | None = None) -> int:
+def footer_signedoffby_cli(
+    argv: Sequence[str] | None = None, context: GitContext | None = None
+) -> int:
     """Função principal que processa os argumentos.
 
     E aplica as transformações no arquivo de commit.
 
     Hook designed for stages: pre-commit, pre-push, manual
 
-    Fluxo:
+    Fluxo, aplicado em memória e gravado uma única vez:
     1. Remove linhas desnecessárias do template de commit.
     2. Adiciona 'Signed-off-by' do committer atual.
     3. Adiciona linha em branco no topo se necessário.
 
+    Args:
+        argv: Arguments values sequence.
+        context: Shared git context, default is the process-scoped one.
+
     Returns:
         None
 
@@ -330,18 +462,28 @@ def footer_signedoffby_cli(argv: Sequence[str] | None = None) -> int:
         action='store_true',
         help='Not run hook, ignore adding Signed-off-by',
     )
+    parser.add_argument(
+        '--backup',
+        default=Backup.LINK.value,
+        choices=Backup.to_list(),
+        help='Backup da mensagem original em `.bak` (padrão: link).',
+    )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('footer_signedoffby_cli')
     logging.debug('msgfile: %s', args)
     commit_source = '' or args.commit_source
 
-    ic(args)
+    debug.log('args: %s', args)
 
-    clean_commit_msg(args.commit_msg_filename)
+    pipeline = MessagePipeline(
+        args.commit_msg_filename, [strip_commit_help], Backup(args.backup)
+    )
     if not args.nonexequi:
-        add_signed_off_by(args.commit_msg_filename)
-    add_blank_line_if_needed(args.commit_msg_filename, commit_source)
+        context = (context or get_git_context()).prefetch(*MESSAGE_FACTS)
+        pipeline.pipe(signing_off(get_signed_off_by(context)))
+    pipeline.pipe(partial(prepend_blank_line, commit_source=commit_source))
+    pipeline.run()
     return Status.SUCCESS.value
 
 
@@ -363,13 +505,13 @@ def effort_msg_cli(argv: Sequence[str] | None = None) -> int:
     )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('effort_msg_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return 0
 
-    rich.print(effort_msg())
+    echo(effort_msg())
     return 0
 
 
@@ -379,7 +521,8 @@ def clean_commit_msg_cli(
 ) -> int:
     """Remove the help message.
 
-    Remove "# Please enter the commit message..." from help message.
+    Remove "# Please enter the commit message..." from help message,
+    streaming the file through `clean_commit_msg` in a single pass.
 
     Hook designed for stages: pre-commit, pre-push, manual
 
@@ -404,42 +547,27 @@ def clean_commit_msg_cli(
         action='store_true',
         help='Do not run this hook.',
     )
+    parser.add_argument(
+        '--backup',
+        default=Backup.LINK.value,
+        choices=Backup.to_list(),
+        help='Backup of the original message as `.bak` (default: link).',
+    )
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('clean_commit_msg_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return Status.SUCCESS
 
-    commit_msg_file = args.commit_msg_file
-    commit_source = args.commit_source
-    commit_hash = args.commit_hash
-
-    ic(commit_msg_file, commit_source, commit_hash)
-
-    commit_msg_file = Path(commit_msg_file)
-
-    backup = commit_msg_file.with_suffix(commit_msg_file.suffix + '.bak')
-    backup.write_bytes(commit_msg_file.read_bytes())
-
-    result = []
-    skipping = False
-
-    for line in commit_msg_file.read_text(encoding='utf-8').splitlines(
-        keepends=True
-    ):
-        if not skipping and line.lstrip().startswith(
-            'Please enter the commit message'
-        ):
-            skipping = True
-            continue
-        if skipping and line.strip() == '#':
-            skipping = False
-            continue
-        if not skipping:
-            result.append(line)
-
-    commit_msg_file.write_text(''.join(result), encoding='utf-8')
+    commit_msg_file = Path(args.commit_msg_file)
+    debug.log(
+        'msgfile: %s, source: %s, hash: %s',
+        commit_msg_file,
+        args.commit_source,
+        args.commit_hash,
+    )
+    clean_commit_msg(commit_msg_file, Backup(args.backup))
 
     return Status.SUCCESS
 
@@ -462,23 +590,344 @@ def validate_format_commit_msg_cli(
         help='Do not run this hook.',
     )
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('validate_format_commit_msg_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
         return 0
 
-    ic(fl := Path('.git/COMMIT_EDITMSG'))
-    ic(fl.is_file())
+    if debug.ENABLED:
+        fl = Path('.git/COMMIT_EDITMSG')
+        debug.log('msgfile: %s, exists: %s', fl, fl.is_file())
 
     logging.debug('msgfile: %s', args)
 
     result = validate_format_commit_msg(*args.filenames)
 
-    rich.print(result.message)
+    echo(result.message)
+    return result.code.value
+
+
+@logging_call(logging.INFO, 'Validating commit messages of a range.')
+def validate_commit_range_cli(argv: Sequence[str] | None = None) -> int:
+    """Validate every commit message of a revision range at once.
+
+    Hook designed for stages: pre-push, manual
+
+    Args:
+        argv: Arguments values sequence.
+
+    Returns:
+        int: 0 to SUCCESS or 1 to FAILURE
+
+    """
+    checks = message_checks()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'revision_range',
+        nargs='?',
+        default=None,
+        help='Commits to check (default: pushed or unpushed commits)',
+    )
+    parser.add_argument(
+        '--min-first-line',
+        default=10,
+        type=int,
+        help='Minimum Length of line for first line',
+    )
+    parser.add_argument(
+        '--max-first-line',
+        default=50,
+        type=int,
+        help='Maximum Length of line for first line',
+    )
+    parser.add_argument(
+        '--skip',
+        action='append',
+        default=[],
+        choices=list(checks),
+        help='Check to skip, may be repeated.',
+    )
+    parser.add_argument(
+        '--merges',
+        default=False,
+        action='store_true',
+        help='Validate merge commits too.',
+    )
+    parser.add_argument(
+        '--nonexequi',
+        default=False,
+        dest='nonexequi',
+        action='store_true',
+        help='Não executar hook.',
+    )
+    args = parser.parse_args(argv)
+    logging.debug('args: %s', args)
+
+    if args.nonexequi:
+        return Status.SUCCESS.value
+
+    checks = {
+        name: check
+        for name, check in message_checks(
+            args.min_first_line, args.max_first_line
+        ).items()
+        if name not in args.skip
+    }
+    revisions = (
+        (args.revision_range,)
+        if args.revision_range
+        else default_commit_range()
+    )
+    options = () if args.merges else ('--no-merges',)
+    result_code = Status.SUCCESS
+    total = failed = 0
+    try:
+        for _, result in validate_commit_range(
+            *options, *revisions, checks=checks
+        ):
+            echo(result.message)
+            result_code |= result.code
+            total += 1
+            failed += result.code.value
+    except RuntimeError as e:
+        echo(f'[red]{e}[/red]')
+        return Status.FAILURE.value
+
+    echo(f'{total} commits validated, {failed} rejected.')
+    return result_code.value
+
+
+@logging_call(logging.INFO, 'Checking pushed refs on pre-receive.')
+def pre_receive_cli(argv: Sequence[str] | None = None) -> int:
+    """Run the pre-receive hook of a bare repository.
+
+    Reads `<old> <new> <ref>` lines from stdin.
+
+    Args:
+        argv: Arguments values sequence.
+
+    Returns:
+        int: 0 to SUCCESS or 1 to FAILURE
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--min-first-line',
+        default=10,
+        type=int,
+        help='Minimum Length of line for first line',
+    )
+    parser.add_argument(
+        '--max-first-line',
+        default=50,
+        type=int,
+        help='Maximum Length of line for first line',
+    )
+    parser.add_argument(
+        '--skip',
+        action='append',
+        default=[],
+        choices=list(message_checks()),
+        help='Commit message check to skip, may be repeated.',
+    )
+    parser.add_argument(
+        '--merges',
+        default=False,
+        action='store_true',
+        help='Validate merge commits too.',
+    )
+    parser.add_argument(
+        '--max-blob-size',
+        default=MAX_BLOB_SIZE,
+        type=int,
+        help='Largest blob read at once, larger ones by chunks, in bytes.',
+    )
+    parser.add_argument(
+        '--nonexequi',
+        default=False,
+        dest='nonexequi',
+        action='store_true',
+        help='Não executar hook.',
+    )
+    args = parser.parse_args(argv)
+    logging.debug('args: %s', args)
+
+    if args.nonexequi:
+        return Status.SUCCESS.value
+
+    checks = {
+        name: check
+        for name, check in message_checks(
+            args.min_first_line, args.max_first_line
+        ).items()
+        if name not in args.skip
+    }
+    try:
+        result = pre_receive(
+            sys.stdin, checks, args.max_blob_size, merges=args.merges
+        )
+    except RuntimeError as e:
+        echo(f'[red]{e}[/red]')
+        return Status.FAILURE.value
+
+    if result.message:
+        echo(result.message)
     return result.code.value
 
 
+@logging_call(logging.INFO, 'Auditing commit history.')
+def audit_commits_cli(argv: Sequence[str] | None = None) -> int:
+    """Report how much of a history conforms to the commit rules.
+
+    Args:
+        argv: Arguments values sequence.
+
+    Returns:
+        int: 0 to SUCCESS or 1 to FAILURE
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'revisions',
+        nargs='*',
+        default=['HEAD'],
+        help='Revisions to audit, e.g. --all (default: HEAD)',
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        default=None,
+        type=int,
+        help='Worker processes (default: number of CPUs)',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        default=CHUNK_SIZE,
+        type=int,
+        help='Commits sent to a worker at once.',
+    )
+    parser.add_argument(
+        '--top', default=20, type=int, help='Rows shown per table.'
+    )
+    parser.add_argument(
+        '--merges',
+        default=False,
+        action='store_true',
+        help='Include merge commits.',
+    )
+    args, extra = parser.parse_known_args(argv)
+    logging.debug('args: %s', args)
+
+    options = [*extra, *([] if args.merges else ['--no-merges'])]
+    try:
+        report = audit_history(
+            *options,
+            *args.revisions,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+        )
+    except RuntimeError as e:
+        echo(f'[red]{e}[/red]')
+        return Status.FAILURE.value
+
+    for table in render_report(report, args.top):
+        echo(table)
+    passed, failed = report.total
+    echo(f'{passed + failed} commits audited, {passed} conforming.')
+    return Status.SUCCESS.value
+
+
+@logging_call(logging.INFO, 'Auditing branch names of refs.')
+def audit_branchnames_cli(argv: Sequence[str] | None = None) -> int:
+    """Validate the branch names of every local and remote ref at once.
+
+    Args:
+        argv: Arguments values sequence.
+
+    Returns:
+        int: 0 to SUCCESS or 1 to FAILURE
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'patterns',
+        nargs='*',
+        default=[],
+        help='git for-each-ref patterns (default: refs/heads refs/remotes)',
+    )
+    args = parser.parse_args(argv)
+    logging.debug('args: %s', args)
+
+    try:
+        report = audit_refnames(iter_refnames(*args.patterns))
+    except RuntimeError as e:
+        echo(f'[red]{e}[/red]')
+        return Status.FAILURE.value
+
+    if report.offending:
+        echo(
+            escape(
+                '\n'.join(
+                    f'{refname}: {violation_names(violations)}'
+                    for refname, violations in report.offending
+                )
+            )
+        )
+    echo(f'{report.total} branches audited, {len(report.offending)} rejected.')
+    return Status.FAILURE.value if report.offending else Status.SUCCESS.value
+
+
+@logging_call(logging.INFO, 'Reporting hook latency.')
+def hooks_stats_cli(argv: Sequence[str] | None = None) -> int:
+    """Report percentiles per hook from the local timing history.
+
+    Args:
+        argv: Arguments values sequence.
+
+    Returns:
+        int: 0 to SUCCESS or 1 to FAILURE
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--file',
+        default=None,
+        type=Path,
+        help='Timing history (default: .git/incolume-timings.jsonl)',
+    )
+    parser.add_argument(
+        '--recent',
+        default=RECENT,
+        type=int,
+        help='Newest calls compared with the older ones.',
+    )
+    parser.add_argument(
+        '--threshold',
+        default=THRESHOLD,
+        type=float,
+        help='Ratio of the medians flagged as a regression.',
+    )
+    args = parser.parse_args(argv)
+    logging.debug('args: %s', args)
+    if args.recent < 1:
+        parser.error('--recent must be at least 1')
+
+    path = args.file or history_path()
+    stats = hook_stats(
+        read_history(path) if path else (), args.recent, args.threshold
+    )
+    if not stats:
+        echo('No timing history, record it with INCOLUME_TIMING=history.')
+        return Status.SUCCESS.value
+
+    echo(render_stats(stats))
+    regressions = [x.hook for x in stats if x.regression]
+    if regressions:
+        echo(f'[red]Regressions: {", ".join(regressions)}[/red]')
+    return Status.SUCCESS.value
+
+
 @logging_call(logging.INFO, 'Checking pre-commit installation.')
 def pre_commit_installed_cli(argv: Sequence[str] | None = None) -> int:
     """Run pre-commit-installed hook.
@@ -496,7 +945,7 @@ def pre_commit_installed_cli(argv: Sequence[str] | None = None) -> int:
         help='Não executar hook.',
     )
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('pre_commit_installed_cli')
     logging.debug('msgfile: %s', args)
 
     if args.nonexequi:
@@ -504,9 +953,9 @@ def pre_commit_installed_cli(argv: Sequence[str] | None = None) -> int:
 
     result = Status.SUCCESS
     files = list(Path.cwd().glob('.pre-commit-config.yaml'))
-    ic(files)
+    debug.log('files: %s', files)
     if not files:
-        rich.print(
+        echo(
             '\n\n[red]`pre-commit` configuration detected,'
             ' but `pre-commit install` was never ran.[/red]\n',
         )
@@ -536,19 +985,27 @@ def get_msg_cli(argv: Sequence[str] | None = None) -> int:
     )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('get_msg_cli')
     logging.debug('msgfile: %s', args)
-    ic(args)
+    debug.log('args: %s', args)
 
     if not args.nonexequi:
-        rich.print(get_msg(fixed=args.fixed))
+        echo(get_msg(fixed=args.fixed))
 
     return Status.SUCCESS.value
 
 
 @logging_call(logging.INFO, 'Inserting git diff into commit message.')
-def insert_diff_cli(argv: Sequence[str] | None = None) -> int:
-    """CLI for module gitdiff."""
+def insert_diff_cli(
+    argv: Sequence[str] | None = None, context: GitContext | None = None
+) -> int:
+    """CLI for module gitdiff.
+
+    Args:
+        argv: Arguments values sequence.
+        context: Shared git context, default is the process-scoped one.
+
+    """
     parser = argparse.ArgumentParser(
         description='Processa mensagens de commit'
         ' como no hook original em Perl.'
@@ -568,16 +1025,31 @@ def insert_diff_cli(argv: Sequence[str] | None = None) -> int:
         action='store_false',
         help='Não executar hook.',
     )
+    parser.add_argument(
+        '--summary',
+        action='store_true',
+        help='Resumir alterações por diretório em vez de listar todas.',
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=TOP_PATHS,
+        help=f'Diretórios e arquivos listados no resumo (padrão {TOP_PATHS}).',
+    )
 
     args = parser.parse_args(argv)
-    logging.info(inspect.stack()[0][3])
+    logging.info('insert_diff_cli')
     logging.debug('msgfile: %s', args)
-    ic(args)
+    debug.log('args: %s', args)
 
     if not args.nonexequi:
         return Status.SUCCESS.value
 
-    diff_output = get_git_diff()
+    if args.summary:
+        diff_output = summarize_git_diff(iter_staged_changes(), args.top)
+    else:
+        context = (context or get_git_context()).prefetch(*MESSAGE_FACTS)
+        diff_output = context.git_diff
     insert_git_diff(args.commit_msg_file, diff_output)
 
     return Status.SUCCESS.value
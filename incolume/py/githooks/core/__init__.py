@@ -4,86 +4,266 @@
 
 from __future__ import annotations
 
-import logging
+import contextlib
 import subprocess
+import zlib
+from functools import cache, cached_property
 from os import getenv
+from typing import TYPE_CHECKING
 
-from icecream import ic
+# First, to mark when the imports of the package begin.
+from incolume.py.githooks.core.tracing import span
 
+# isort: split
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.gitconfig import read_ident
+from incolume.py.githooks.core.gitindex import read_staged_changes
+from incolume.py.githooks.core.gitobjects import ObjectNotFoundError
+from incolume.py.githooks.core.gitrepo import (
+    find_git_dir,
+    read_head_branch,
+    resolve_ref,
+)
+from incolume.py.githooks.core.profiling import COLLAPSED_VAR, PROFILE_VAR
 from incolume.py.githooks.core.rules import Status as Status
+from incolume.py.githooks.core.staged import (
+    StagedChange,
+    format_name_status,
+    iter_staged_changes,
+)
 
-ic.disable()
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing import Self  # type: ignore[import]
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing_extensions import Self  # type: ignore[import]
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def debug_var_active() -> bool:
-    """Check environment variables for debug mode."""
-    debug: bool = any(
-        getenv(x, '').casefold() in {'1', 'true', 'on'}
-        for x in ('INCOLUME_DEBUG_MODE', 'DEBUG_MODE', 'DEBUG')
-    )
+    """Check environment variables for debug mode.
+
+    Hooks use `debug.ENABLED`, resolved once at startup, instead.
+    """
+    active = debug.from_env()
+    debug.log('Var Debug Mode: %s', active)
+    return active
 
-    logging.debug(ic(f'Var Debug Mode: {debug}'))
 
-    return debug
+def profile_var_active() -> tuple[str | None, bool]:
+    """Check environment variables for profiling hooks.
+
+    Returns:
+        tuple[str | None, bool]: Directory for `.prof` files, None when
+            profiling is off, and whether collapsed stacks are wanted.
+
+    """
+    directory = getenv(PROFILE_VAR) or None
+    collapsed = getenv(COLLAPSED_VAR, '').casefold() in {'1', 'true', 'on'}
+    debug.log('Var Profile: %s, collapsed: %s', directory, collapsed)
+    return directory, collapsed
 
 
 def debug_enable() -> bool:
-    """Enable debug mode."""
-    debug: bool = debug_var_active()
-    ic.disable()  # Disable by default
+    """Enable debug mode from the environment, see `debug.configure`.
 
-    if debug:
-        ic.enable()
-    logging.debug(ic(f'Debug mode {"enabled" if debug else "disabled"}.'))
-    return debug
+    Called by modules at import; calls read the resolved `debug.ENABLED`.
+    """
+    return debug.configure()
 
 
-def get_signed_off_by() -> str:
-    """Obtém a linha de assinatura 'Signed-off-by' do committer atual.
+@cache
+def get_committer_ident() -> str:
+    """Obtém a identidade `Nome <email>` do committer atual.
 
-    Usa `git var GIT_COMMITTER_IDENT` para extrair o nome e email do committer.
+    Resolvida uma única vez por processo, a partir das variáveis de ambiente
+    e da configuração do git; `git var GIT_COMMITTER_IDENT` é usado apenas
+    quando não for possível resolvê-la diretamente.
 
     Returns:
-        str: Linha formatada no padrão:
-             "Signed-off-by: Nome <email>"
+        str: Identidade no formato "Nome <email>".
 
     Raises:
         RuntimeError: Se a execução do comando git falhar.
 
     """
+    ident = read_ident('committer')
+    if ident is not None:
+        return ident
+
     try:
-        ident: str = subprocess.check_output(
-            ['git', 'var', 'GIT_COMMITTER_IDENT'], text=True
-        ).strip()
+        with span('git var', 'subprocess'):
+            ident = subprocess.check_output(
+                ['git', 'var', 'GIT_COMMITTER_IDENT'], text=True
+            ).strip()
     except (
         subprocess.CalledProcessError
     ) as e:  # pragma: no cover; noqa: S110 TODO cover in future
         msg = 'Falha ao obter GIT_COMMITTER_IDENT'
         raise RuntimeError(msg) from e
 
-    return f'Signed-off-by: {ident.split(">", maxsplit=1)[0]}>'
+    return f'{ident.split(">", maxsplit=1)[0]}>'
 
 
-def get_branchname() -> str:
-    """Get current branch name."""
-    branch = (
-        subprocess.check_output(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-        )
-        .strip()
-        .decode('utf-8')
-    )
-    logging.debug(ic(branch))
+def get_signed_off_by(context: GitContext | None = None) -> str:
+    """Obtém a linha de assinatura 'Signed-off-by' do committer atual.
+
+    Usa `get_committer_ident` para extrair o nome e email do committer.
+
+    Args:
+        context: Contexto git compartilhado, opcional.
+
+    Returns:
+        str: Linha formatada no padrão:
+             "Signed-off-by: Nome <email>"
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    ident = context.committer_ident if context else get_committer_ident()
+    return f'Signed-off-by: {ident}'
+
+
+def get_branchname(git_dir: Path | None = None) -> str:
+    """Get current branch name.
+
+    Reads `HEAD` directly from the git directory, falling back to
+    `git rev-parse --abbrev-ref HEAD` only when it can not be resolved.
+    """
+    branch = read_head_branch(git_dir)
+    if branch is None:
+        with span('git rev-parse', 'subprocess'):
+            branch = (
+                subprocess.check_output(
+                    ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+                )
+                .strip()
+                .decode('utf-8')
+            )
+    debug.log('branch: %s', branch)
     return branch
 
 
+def get_head_oid(git_dir: Path | None = None) -> str | None:
+    """Get the object id of HEAD, or None on an unborn branch."""
+    git_dir = git_dir or find_git_dir()
+    oid = resolve_ref(git_dir, 'HEAD') if git_dir else None
+    if oid is None:
+        with (
+            contextlib.suppress(subprocess.CalledProcessError),
+            span('git rev-parse', 'subprocess'),
+        ):
+            oid = (
+                subprocess.check_output(
+                    ['git', 'rev-parse', '--verify', '--quiet', 'HEAD'],
+                    text=True,
+                ).strip()
+                or None
+            )
+    return oid
+
+
 def get_git_diff() -> str:
-    """Retorna a saída de `git diff --cached --name-status -r`."""
-    try:
-        return subprocess.check_output(
-            ['git', 'diff', '--cached', '--name-status', '-r'],
-            text=True,
-        ).strip()
-    except subprocess.CalledProcessError as e:  # pragma: no cover
-        msg = 'Falha ao executar git diff'
-        raise RuntimeError(msg) from e
+    """Retorna a saída de `git diff --cached --name-status -r`.
+
+    A saída é lida em fluxo com `-z`, portanto nomes de arquivos com
+    espaços, tabulações ou quebras de linha não são citados nem quebrados.
+    """
+    return format_name_status(iter_staged_changes())
+
+
+def get_staged_changes(git_dir: Path | None = None) -> list[StagedChange]:
+    """Get staged changes, without renames detection.
+
+    Reads `.git/index` and HEAD's tree directly, falling back to
+    `git diff --cached --name-status -r --no-renames` for layouts only git
+    understands (split or sparse index, reftable, SHA-256, ...).
+    """
+    git_dir = git_dir or find_git_dir()
+    if git_dir is not None:
+        try:
+            return read_staged_changes(git_dir)
+        except (ObjectNotFoundError, OSError, ValueError, zlib.error) as e:
+            debug.log('Index fallback: %s', e)
+    return list(iter_staged_changes('--no-renames'))
+
+
+def get_staged_files(git_dir: Path | None = None) -> list[str]:
+    """Get paths of staged files, leaving deleted ones out."""
+    return [x.path for x in get_staged_changes(git_dir) if x.status != 'D']
+
+
+class GitContext:
+    """Repository facts computed lazily and memoized.
+
+    Hooks sharing one instance run each git query at most once. Facts may
+    be seeded on init, e.g. `GitContext(branchname='main')`.
+    """
+
+    def __init__(self, **facts: str | Path | list[str] | None) -> None:
+        """Init seeding known facts."""
+        self.__dict__.update(facts)
+
+    def __repr__(self) -> str:
+        """Represent with the facts already known."""
+        facts = ', '.join(f'{k}={v!r}' for k, v in self.__dict__.items())
+        return f'{type(self).__name__}({facts})'
+
+    @cached_property
+    def git_dir(self) -> Path | None:
+        """Git directory."""
+        return find_git_dir()
+
+    @cached_property
+    def branchname(self) -> str:
+        """Current branch name."""
+        return get_branchname(self.git_dir)
+
+    @cached_property
+    def committer_ident(self) -> str:
+        """Committer identity as `Name <email>`."""
+        return get_committer_ident()
+
+    @cached_property
+    def git_diff(self) -> str:
+        """Staged changes as `git diff --cached --name-status -r`."""
+        return get_git_diff()
+
+    @cached_property
+    def head_oid(self) -> str | None:
+        """Object id of HEAD."""
+        return get_head_oid(self.git_dir)
+
+    @cached_property
+    def staged_files(self) -> list[str]:
+        """Paths of staged files, deleted ones left out."""
+        return get_staged_files(self.git_dir)
+
+    def prefetch(self, *names: str) -> Self:
+        """Compute pending facts concurrently.
+
+        `asyncio` is imported here, so hooks that never prefetch do not pay
+        for it at startup.
+
+        Args:
+            names: Fact names among `GIT_QUERIES`, default is all of them.
+
+        """
+        from incolume.py.githooks.core.gitasync import (  # noqa: PLC0415
+            GIT_QUERIES,
+            gather_git_metadata,
+        )
+
+        pending = [x for x in names or GIT_QUERIES if x not in self.__dict__]
+        if pending:
+            self.__dict__.update(gather_git_metadata(*pending))
+        return self
+
+
+@cache
+def get_git_context() -> GitContext:
+    """Get the process-scoped git context shared by all hooks."""
+    return GitContext()
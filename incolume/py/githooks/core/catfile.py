@@ -0,0 +1,168 @@
+"""Module to read many git objects through a single cat-file process."""
+
+# ruff: noqa: S404 S603 S607
+
+from __future__ import annotations
+
+import os
+import subprocess
+from typing import IO, TYPE_CHECKING, Final, NamedTuple
+
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+BATCH_FORMAT: Final[str] = '%(objectname) %(objecttype) %(objectsize) %(rest)'
+MAX_BLOB_SIZE: Final[int] = 1 << 20
+OMITTED: Final[str] = 'omitted'
+"""Type of the blobs over the size limit, left for `iter_blob_chunks`."""
+
+
+class BatchObject(NamedTuple):
+    """Object as reported by `git cat-file --batch`."""
+
+    oid: str
+    type: str
+    data: bytes
+    path: str = ''
+
+
+def parse_batch(stream: IO[bytes]) -> Iterator[BatchObject]:
+    r"""Parse `git cat-file --batch` output in `BATCH_FORMAT`.
+
+    Missing objects are skipped; objects omitted by a `--filter`, listed
+    as `~<oid>` by `--filter-print-omitted`, come as `OMITTED`, no data.
+
+    Examples:
+        >>> import io
+        >>> list(parse_batch(io.BytesIO(b'a1 blob 2 x.py\nhi\nb2 missing\n')))
+        [BatchObject(oid='a1', type='blob', data=b'hi', path='x.py')]
+        >>> list(parse_batch(io.BytesIO(b'~c3 missing\n')))
+        [BatchObject(oid='c3', type='omitted', data=b'', path='')]
+
+    """
+    while header := stream.readline():
+        oid, kind, *rest = header.rstrip(b'\n').split(b' ', 3)
+        if oid.startswith(b'~'):
+            yield BatchObject(oid[1:].decode(), OMITTED, b'')
+            continue
+        if not rest:
+            continue
+        data = stream.read(int(rest[0]))
+        stream.read(1)
+        path = os.fsdecode(rest[1]) if len(rest) > 1 else ''
+        yield BatchObject(oid.decode(), kind.decode(), data, path)
+
+
+def iter_blobs(
+    *args: str, max_size: int = MAX_BLOB_SIZE
+) -> Iterator[BatchObject]:
+    """Stream blobs reachable from a revision range, with their paths.
+
+    `git rev-list --objects` is piped straight into one
+    `git cat-file --batch`, so the cost does not grow with forks per
+    object. Blobs larger than `max_size` are never loaded: they come as
+    `OMITTED`, with no data nor path, to be read by `iter_blob_chunks`.
+
+    Args:
+        args: Revisions, e.g. `<new> --not --all` on pre-receive.
+        max_size: Largest blob read at once, in bytes.
+
+    Yields:
+        BatchObject: Each blob, read or omitted.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with (
+        span('git rev-list | git cat-file', 'subprocess'),
+        subprocess.Popen(
+            [
+                'git',
+                'rev-list',
+                '--objects',
+                '--filter=object:type=blob',
+                f'--filter=blob:limit={max_size}',
+                '--filter-print-omitted',
+                *args,
+            ],
+            stdout=subprocess.PIPE,
+        ) as revlist,
+        subprocess.Popen(
+            ['git', 'cat-file', f'--batch={BATCH_FORMAT}'],
+            stdin=revlist.stdout,
+            stdout=subprocess.PIPE,
+        ) as catfile,
+    ):
+        revlist.stdout.close()
+        for obj in parse_batch(catfile.stdout):
+            if obj.type in {'blob', OMITTED}:
+                yield obj
+    if revlist.returncode or catfile.returncode:
+        msg = 'Falha ao executar git rev-list | git cat-file'
+        raise RuntimeError(msg)
+
+
+def iter_blob_chunks(
+    oid: str, chunk_size: int = MAX_BLOB_SIZE
+) -> Iterator[bytes]:
+    """Stream the content of a blob, never holding it whole.
+
+    Args:
+        oid: The blob.
+        chunk_size: Bytes per chunk.
+
+    Yields:
+        bytes: Each chunk.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with (
+        span('git cat-file blob', 'subprocess', oid=oid),
+        subprocess.Popen(
+            ['git', 'cat-file', 'blob', oid], stdout=subprocess.PIPE
+        ) as process,
+    ):
+        while chunk := process.stdout.read(chunk_size):
+            yield chunk
+    if process.returncode:
+        msg = f'Falha ao executar git cat-file blob {oid}'
+        raise RuntimeError(msg)
+
+
+def blob_paths(oids: Collection[str], *args: str) -> dict[str, str]:
+    """Find the paths of blobs in a revision range.
+
+    Only for reporting blobs read by `iter_blob_chunks`, which come with
+    no path: it walks the range once more.
+
+    Args:
+        oids: The blobs.
+        args: Revisions, as given to `iter_blobs`.
+
+    Returns:
+        dict[str, str]: Path of each blob found.
+
+    """
+    with span('git rev-list', 'subprocess'):
+        output = subprocess.run(
+            [
+                'git',
+                'rev-list',
+                '--objects',
+                '--filter=object:type=blob',
+                *args,
+            ],
+            capture_output=True,
+            check=False,
+        ).stdout
+    wanted, paths = set(oids), {}
+    for line in output.splitlines():
+        oid, _, path = line.partition(b' ')
+        if oid.decode() in wanted:
+            paths[oid.decode()] = os.fsdecode(path)
+    return paths
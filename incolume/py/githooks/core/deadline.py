@@ -0,0 +1,94 @@
+"""Module with cooperative deadlines, bounding the time of a hook.
+
+Scan loops check `deadline.expired()` between units of work, files or
+chunks of a file, and stop when the budget runs out. What was left is
+reported by `report_unscanned`: a failure by default (fail closed), or a
+warning with `fail_open`, so a commit is never blocked longer than the
+budget plus one unit of work.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from incolume.py.githooks.core.rules import Result, Status
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+@dataclass
+class Deadline:
+    """Time budget in seconds, from `start`; no budget never expires."""
+
+    budget: float | None = None
+    start: float = field(default_factory=time.monotonic)
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left, infinite without budget.
+
+        Examples:
+            >>> Deadline().remaining
+            inf
+            >>> Deadline(0).remaining
+            0.0
+
+        """
+        if self.budget is None:
+            return math.inf
+        return max(0.0, self.budget - (time.monotonic() - self.start))
+
+    def expired(self) -> bool:
+        """Check if the budget ran out.
+
+        Examples:
+            >>> Deadline().expired(), Deadline(0).expired()
+            (False, True)
+
+        """
+        return self.remaining <= 0
+
+
+def report_unscanned(
+    result: Result,
+    unscanned: Sequence[Path | str],
+    deadline: Deadline,
+    *,
+    fail_open: bool = False,
+) -> Result:
+    """Add the files left unscanned to the result.
+
+    Args:
+        result: Result of the files scanned.
+        unscanned: Files left when the budget ran out.
+        deadline: The deadline that ran out.
+        fail_open: Warn instead of failing.
+
+    Returns:
+        Result: The same result, updated.
+
+    Examples:
+        >>> report_unscanned(Result(), ['big.min.js'], Deadline(0.5)).code
+        <Status.FAILURE: 1>
+        >>> report_unscanned(
+        ...     Result(), ['big.min.js'], Deadline(0.5), fail_open=True
+        ... ).code
+        <Status.SUCCESS: 0>
+
+    """
+    if not unscanned:
+        return result
+    color = 'yellow' if fail_open else 'red'
+    result.message += (
+        f'[{color}]Time budget exceeded ({deadline.budget}s), '
+        f'{len(unscanned)} file(s) not scanned:[/{color}]\n'
+    )
+    result.message += ''.join(f'  {filename}\n' for filename in unscanned)
+    if not fail_open:
+        result.code |= Status.FAILURE
+    return result
@@ -0,0 +1,75 @@
+"""Module with the debug facade, resolved once at startup.
+
+Call sites use `debug.log('branch: %s', branch)`: with debugging off it is
+bound to a no-op, so the message is never formatted nor inspected.
+Arguments that are costly to build go under `if debug.ENABLED:`.
+`icecream` is imported only once debugging is on.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from os import getenv
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from icecream import IceCreamDebugger
+
+DEBUG_VARS: Final[tuple[str, ...]] = (
+    'INCOLUME_DEBUG_MODE',
+    'DEBUG_MODE',
+    'DEBUG',
+)
+TRUTHY: Final[frozenset[str]] = frozenset({'1', 'true', 'on'})
+
+
+def from_env() -> bool:
+    """Check environment variables for debug mode."""
+    return any(getenv(x, '').casefold() in TRUTHY for x in DEBUG_VARS)
+
+
+def _noop(*_args: object) -> None:
+    """Do nothing, debugging is off."""
+
+
+def get_ic() -> IceCreamDebugger:
+    """Get icecream's `ic`, imported on first use only."""
+    from icecream import ic  # noqa: PLC0415
+
+    return ic
+
+
+def _log(message: str, *args: object) -> None:
+    """Format `message % args`, log and echo it with icecream."""
+    logging.debug(get_ic()(message % args if args else message))
+
+
+ENABLED: bool = False
+"""Debug mode, as resolved by `configure`."""
+
+log: Callable[..., None] = _noop
+"""Lazy debug record, `%` formatted only while debugging."""
+
+
+def configure(*, enabled: bool | None = None) -> bool:
+    """Resolve debug mode, default from the environment.
+
+    Examples:
+        >>> configure(enabled=False), log is _noop
+        (False, True)
+
+    """
+    global ENABLED, log  # noqa: PLW0603
+    ENABLED = from_env() if enabled is None else enabled
+    log = _log if ENABLED else _noop
+    if ENABLED:
+        get_ic().enable()
+    elif 'icecream' in sys.modules:
+        get_ic().disable()
+    return ENABLED
+
+
+configure()
@@ -7,10 +7,16 @@ from functools import wraps
 from typing import TYPE_CHECKING
 
 from deprecated import deprecated
-from icecream import ic
 
-from . import debug_enable, debug_var_active
-from .rules import LoggingLevel
+from . import (
+    debug,
+    debug_enable,
+    profile_var_active,
+    timing,
+    tracing,
+)
+from .profiling import profiled
+from .rules import LoggingLevel, Status
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -25,10 +31,8 @@ def critical_log_call(func: Callable) -> Callable:
     @wraps(func)
     def wrapper(*args: str, **kwargs: dict) -> None:
         """Wrapp function to add logging critical."""
-        debug: bool = debug_var_active()
-
-        if debug:
-            ic.enable()
+        if debug.ENABLED:
+            ic = debug.get_ic()
             ic(f'Calling function: {func.__name__}')
             ic(f'Arguments: {args}, {kwargs}')
 
@@ -43,10 +47,53 @@ def critical_log_call(func: Callable) -> Callable:
     return wrapper
 
 
+def exit_code(value: object) -> int | None:
+    """Exit code of a hook outcome, a `Status` as its value.
+
+    Examples:
+        >>> exit_code(1), exit_code(Status.FAILURE), exit_code(None)
+        (1, 1, None)
+
+    """
+    if isinstance(value, Status):
+        return value.value
+    return value if isinstance(value, int) else None
+
+
+def timed(func: Callable) -> Callable:
+    """Time calls, emitting them to the sinks of `core.timing`.
+
+    The exit code is recorded whether returned or given to `sys.exit`,
+    mapped as the interpreter does. Costs one list check per call while no
+    sink is configured.
+    """
+
+    @wraps(func)
+    def wrapper(*args: str, **kwargs: dict) -> None:
+        """Wrapp function to measure it."""
+        if not timing.SINKS:
+            return func(*args, **kwargs)
+        with timing.measure(func.__name__) as record:
+            try:
+                result = func(*args, **kwargs)
+            except SystemExit as e:
+                code = exit_code(e.code)
+                record.code = int(e.code is not None) if code is None else code
+                raise
+            record.code = exit_code(result)
+        return result
+
+    return wrapper
+
+
 def logging_call(
     level: LoggingLevel = LoggingLevel.DEBUG, message: str = ''
 ) -> Callable:
-    """Decoratore to debug function calls.
+    """Decoratore to debug, time and, on demand, profile or trace calls.
+
+    Profiling and tracing are decided once, when decorating, from
+    `INCOLUME_PROFILE` and `INCOLUME_TRACE`; debug mode once per process,
+    see `core.debug`.
 
     Args:
       level::str: Level logging, default is debug;
@@ -60,27 +107,30 @@ def logging_call(
             level = LoggingLevel(level)
 
     message = message or 'Function **{}** called.'
+    record = getattr(logging, level.name.casefold())
 
     def inner(func: Callable) -> Callable:
         """Inner funtion to receive parameters."""
+        text = message.format(func.__name__)
 
         @wraps(func)
         def wrapper(*args: str, **kwargs: dict) -> None:
             """Wrapp function to add logging record."""
-            debug: bool = debug_var_active()
-
-            if debug:
-                ic.enable()
+            if debug.ENABLED:
+                ic = debug.get_ic()
                 ic(f'Calling function: {func.__name__}')
                 ic(f'Arguments: {args}, {kwargs}')
 
             result = func(*args, **kwargs)
 
-            getattr(logging, level.name.casefold())(
-                ic(message.format(func.__name__))
-            )
+            if debug.ENABLED:
+                debug.get_ic()(text)
+            record(text)
             return result
 
-        return wrapper
+        directory, collapsed = profile_var_active()
+        if directory:
+            wrapper = profiled(directory, collapsed=collapsed)(wrapper)
+        return timed(tracing.traced(wrapper))
 
     return inner
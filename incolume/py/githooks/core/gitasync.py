@@ -0,0 +1,143 @@
+"""Module to gather git metadata concurrently with asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+from asyncio.subprocess import PIPE
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.gitconfig import read_ident
+from incolume.py.githooks.core.gitrepo import read_head_branch
+from incolume.py.githooks.core.staged import (
+    format_name_status,
+    parse_name_status_z,
+)
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+GIT_QUERIES: Final[dict[str, tuple[str, ...]]] = {
+    'branchname': ('rev-parse', '--abbrev-ref', 'HEAD'),
+    'committer_ident': ('var', 'GIT_COMMITTER_IDENT'),
+    'git_diff': ('diff', '--cached', '--name-status', '-r', '-z'),
+}
+
+
+async def run_git(*args: str) -> str:
+    """Run a git command without blocking the event loop.
+
+    Args:
+        args: Git arguments, e.g. `('diff', '--cached')`.
+
+    Returns:
+        str: Stripped standard output.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with span(f'git {args[0]}', 'subprocess', tid=id(asyncio.current_task())):
+        process = await asyncio.create_subprocess_exec(
+            'git', *args, stdout=PIPE, stderr=PIPE
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode:
+        msg = f'Falha ao executar git {" ".join(args)}: {stderr.decode()}'
+        raise RuntimeError(msg)
+    return stdout.decode('utf-8').strip()
+
+
+@dataclass
+class AsyncGitContext:
+    """Git metadata gathered concurrently and cached for the invocation.
+
+    Each query is launched at most once: concurrent callers await the same
+    task, so total wall time is bound by the slowest query.
+    """
+
+    results: dict[str, str] = field(default_factory=dict)
+    tasks: dict[str, asyncio.Future] = field(default_factory=dict, repr=False)
+
+    async def _query(
+        self, name: str, factory: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Run a query once, sharing its task with concurrent callers."""
+        if name in self.results:
+            return self.results[name]
+        if name not in self.tasks:
+            self.tasks[name] = asyncio.ensure_future(factory())
+        try:
+            self.results[name] = await self.tasks[name]
+        finally:
+            self.tasks.pop(name, None)
+        return self.results[name]
+
+    async def branchname(self) -> str:
+        """Get current branch name, forking git only if needed."""
+
+        async def query() -> str:
+            branch = read_head_branch()
+            return branch or await run_git(*GIT_QUERIES['branchname'])
+
+        return await self._query('branchname', query)
+
+    async def committer_ident(self) -> str:
+        """Get committer `Name <email>`, forking git only if needed."""
+
+        async def query() -> str:
+            if ident := read_ident('committer'):
+                return ident
+            ident = await run_git(*GIT_QUERIES['committer_ident'])
+            return f'{ident.split(">", maxsplit=1)[0]}>'
+
+        return await self._query('committer_ident', query)
+
+    async def git_diff(self) -> str:
+        """Get output of `git diff --cached --name-status -r`."""
+
+        async def query() -> str:
+            fields = (await run_git(*GIT_QUERIES['git_diff'])).split('\0')
+            return format_name_status(
+                parse_name_status_z(filter(None, fields))
+            )
+
+        return await self._query('git_diff', query)
+
+    async def gather(self, *names: str) -> dict[str, str]:
+        """Run the queries concurrently.
+
+        Args:
+            names: Query names, default is all of `GIT_QUERIES`.
+
+        Returns:
+            dict[str, str]: Results by query name.
+
+        """
+        names = names or tuple(GIT_QUERIES)
+        results = await asyncio.gather(*(getattr(self, x)() for x in names))
+        metadata = dict(zip(names, results, strict=True))
+        debug.log('git metadata: %s', metadata)
+        return metadata
+
+
+def gather_git_metadata(
+    *names: str, context: AsyncGitContext | None = None
+) -> dict[str, str]:
+    """Gather git metadata concurrently from synchronous code.
+
+    Results are kept in `context`, so the rest of the invocation can reuse
+    them without running the same query again.
+
+    Args:
+        names: Query names, default is all of `GIT_QUERIES`.
+        context: Context to fill, default is a new one.
+
+    Returns:
+        dict[str, str]: Results by query name.
+
+    """
+    context = AsyncGitContext() if context is None else context
+    return asyncio.run(context.gather(*names))
@@ -0,0 +1,216 @@
+"""Module to read git configuration files without forking git."""
+
+from __future__ import annotations
+
+import re
+from os import getenv
+from pathlib import Path
+from typing import Final
+
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.gitrepo import find_git_dir, get_common_dir
+
+MAX_INCLUDE_DEPTH: Final[int] = 10
+REGEX_SECTION: Final[re.Pattern] = re.compile(
+    r'^\s*\[\s*([\w.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]'
+)
+REGEX_KEY: Final[re.Pattern] = re.compile(r'^\s*([A-Za-z][\w-]*)\s*(=?)')
+ESCAPES: Final[dict[str, str]] = {
+    'n': '\n',
+    't': '\t',
+    'b': '\b',
+    '\\': '\\',
+    '"': '"',
+}
+IDENT_CRUD: Final[str] = ''.join(map(chr, range(33))) + '.,:;<>"\\\''
+
+
+class UnsupportedConfigError(Exception):
+    """Configuration needs git itself to be evaluated."""
+
+
+def _parse_value(text: str, lines: list[str], idx: int) -> tuple[str, int]:
+    """Parse a config value, following backslash line continuations.
+
+    Returns:
+        tuple[str, int]: The value and the index of the last line consumed.
+
+    """
+    value: list[str] = []
+    pending_space = ''
+    quoted = False
+    chars = iter(text.lstrip())
+    while True:
+        for char in chars:
+            if char in {'#', ';'} and not quoted:
+                return ''.join(value), idx
+            if char == '"':
+                quoted = not quoted
+                value.append(pending_space)
+                pending_space = ''
+            elif char == '\\':
+                escaped = next(chars, '\n')
+                if escaped == '\n':
+                    break
+                value.extend((pending_space, ESCAPES.get(escaped, escaped)))
+                pending_space = ''
+            elif char.isspace() and not quoted:
+                pending_space += char
+            else:
+                value.extend((pending_space, char))
+                pending_space = ''
+        else:
+            return ''.join(value), idx
+
+        idx += 1
+        if idx >= len(lines):
+            return ''.join(value), idx
+        chars = iter(lines[idx])
+
+
+def _parse_section(name: str, subsection: str | None) -> str:
+    """Normalize `[name "subsection"]` and legacy `[name.subsection]`."""
+    name, _, legacy = name.lower().partition('.')
+    if subsection is not None:
+        subsection = re.sub(r'\\(.)', r'\1', subsection)
+    return '.'.join(x for x in (name, subsection or legacy) if x)
+
+
+def parse_config(
+    path: Path, config: dict[str, str] | None = None, depth: int = 0
+) -> dict[str, str]:
+    """Parse a git config file into `section[.subsection].key` values.
+
+    Later values override earlier ones, and `include.path` files are read
+    in place, like git does.
+
+    Args:
+        path: Config file.
+        config: Mapping to be updated, default is a new one.
+        depth: Current include depth.
+
+    Returns:
+        dict[str, str]: Flattened configuration.
+
+    Raises:
+        UnsupportedConfigError: For `includeIf` sections or too deep includes.
+
+    """
+    config = {} if config is None else config
+    if depth > MAX_INCLUDE_DEPTH:
+        msg = f'Include depth exceeded: {path}'
+        raise UnsupportedConfigError(msg)
+
+    try:
+        lines = path.expanduser().read_text(encoding='utf-8').splitlines()
+    except (OSError, UnicodeDecodeError):
+        return config
+
+    section = ''
+    idx = 0
+    while idx < len(lines):
+        line = lines[idx]
+        if match := REGEX_SECTION.match(line):
+            section = _parse_section(*match.groups())
+            if section.startswith('includeif.'):
+                msg = f'Conditional include not supported: {path}'
+                raise UnsupportedConfigError(msg)
+            line = lines[idx] = line[match.end() :]
+
+        if match := REGEX_KEY.match(line):
+            key = f'{section}.{match.group(1).lower()}'
+            value = 'true'
+            if match.group(2):
+                value, idx = _parse_value(line[match.end() :], lines, idx)
+            config[key] = value
+            if key == 'include.path':
+                include = Path(value).expanduser()
+                if not include.is_absolute():
+                    include = path.expanduser().parent / include
+                parse_config(include, config, depth + 1)
+        idx += 1
+    return config
+
+
+def config_files(git_dir: Path | None = None) -> list[Path]:
+    """List config files in the system, global and local cascade."""
+    files: list[Path] = []
+    if not getenv('GIT_CONFIG_NOSYSTEM'):
+        files.append(Path(getenv('GIT_CONFIG_SYSTEM') or '/etc/gitconfig'))
+
+    if global_config := getenv('GIT_CONFIG_GLOBAL'):
+        files.append(Path(global_config))
+    else:
+        xdg = getenv('XDG_CONFIG_HOME') or Path('~', '.config')
+        files.extend((Path(xdg, 'git', 'config'), Path('~', '.gitconfig')))
+
+    if git_dir is not None:
+        files.append(get_common_dir(git_dir) / 'config')
+    return files
+
+
+def read_config(git_dir: Path | None = None) -> dict[str, str]:
+    """Read the whole configuration cascade.
+
+    Includes `GIT_CONFIG_COUNT`/`GIT_CONFIG_KEY_<n>`/`GIT_CONFIG_VALUE_<n>`
+    overrides.
+
+    Raises:
+        UnsupportedConfigError: When only git can evaluate the config,
+            e.g. `git -c` parameters or `includeIf` sections.
+
+    """
+    if getenv('GIT_CONFIG_PARAMETERS') or getenv('GIT_CONFIG'):
+        msg = 'Command line configuration is not supported.'
+        raise UnsupportedConfigError(msg)
+
+    config: dict[str, str] = {}
+    for file in config_files(git_dir):
+        parse_config(file, config)
+
+    for idx in range(int(getenv('GIT_CONFIG_COUNT') or 0)):
+        key = getenv(f'GIT_CONFIG_KEY_{idx}', '')
+        section, _, name = key.rpartition('.')
+        first, dot, middle = section.partition('.')
+        section = f'{first.lower()}{dot}{middle}'
+        config[f'{section}.{name.lower()}'] = getenv(
+            f'GIT_CONFIG_VALUE_{idx}', ''
+        )
+    return config
+
+
+def read_ident(role: str = 'committer') -> str | None:
+    """Resolve `Name <email>` of the committer or author without git.
+
+    Follows git precedence: `GIT_<ROLE>_NAME`/`GIT_<ROLE>_EMAIL`, then
+    `<role>.name`/`<role>.email`, `user.name`/`user.email` and `EMAIL`.
+
+    Args:
+        role: `committer` or `author`.
+
+    Returns:
+        str | None: The identity, or None when git must be asked.
+
+    """
+    name = getenv(f'GIT_{role.upper()}_NAME')
+    email = getenv(f'GIT_{role.upper()}_EMAIL')
+
+    if name is None or email is None:
+        try:
+            config = read_config(find_git_dir())
+        except (UnsupportedConfigError, ValueError) as e:
+            debug.log('Ident fallback: %s', e)
+            return None
+        name = name or config.get(f'{role}.name') or config.get('user.name')
+        email = (
+            email
+            or config.get(f'{role}.email')
+            or config.get('user.email')
+            or getenv('EMAIL')
+        )
+
+    name = (name or '').strip(IDENT_CRUD)
+    email = (email or '').strip(IDENT_CRUD)
+    if not name or not email:
+        return None
+    return f'{name} <{email}>'
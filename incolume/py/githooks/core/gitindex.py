@@ -0,0 +1,341 @@
+"""Module to read the git index and list staged changes without git."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from operator import itemgetter
+from os import getenv
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.gitobjects import (
+    OID_SIZE,
+    S_IFDIR,
+    S_IFMT,
+    ObjectStore,
+)
+from incolume.py.githooks.core.gitrepo import get_common_dir, resolve_ref
+from incolume.py.githooks.core.staged import StagedChange
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+INDEX_SIGNATURE: Final[bytes] = b'DIRC'
+S_IFGITLINK: Final[int] = 0o160000
+INDEX_VERSIONS: Final[frozenset[int]] = frozenset({2, 3, 4})
+ENTRY: Final[struct.Struct] = struct.Struct('>24xI12x20sH')
+EXTENDED_FLAGS: Final[struct.Struct] = struct.Struct('>H')
+FLAG_EXTENDED: Final[int] = 0x4000
+FLAG_INTENT_TO_ADD: Final[int] = 0x2000
+NAME_MASK: Final[int] = 0x0FFF
+TREE_EXTENSION: Final[bytes] = b'TREE'
+
+IndexEntry = tuple[bytes, int, bytes, int]
+"""Index entry as `(path, mode, oid, stage)`."""
+
+
+class UnsupportedIndexError(ValueError):
+    """Index layout needs git itself to be read."""
+
+
+def _varint(data: mmap.mmap | bytes, pos: int) -> tuple[int, int]:
+    """Decode the offset varint used by index v4 path compression."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def parse_cache_tree(data: bytes) -> dict[bytes, bytes]:
+    """Parse the `TREE` extension into valid `{dir/: tree oid}` entries.
+
+    The root directory is keyed by `b''`, others by their path with a
+    trailing slash. Invalidated directories are left out.
+    """
+    trees: dict[bytes, bytes] = {}
+    pos = 0
+
+    def walk(prefix: bytes) -> None:
+        nonlocal pos
+        nul = data.index(b'\0', pos)
+        name = data[pos:nul]
+        newline = data.index(b'\n', nul)
+        entry_count, subtrees = map(int, data[nul + 1 : newline].split())
+        pos = newline + 1
+        path = prefix + name + b'/' if name else prefix
+        if entry_count >= 0:
+            trees[path] = data[pos : pos + OID_SIZE]
+            pos += OID_SIZE
+        for _ in range(subtrees):
+            walk(path)
+
+    if data:
+        walk(b'')
+    return trees
+
+
+def _parse_entries(  # noqa: PLR0914
+    data: mmap.mmap | bytes, version: int, count: int
+) -> tuple[list[IndexEntry], int]:
+    """Parse `count` entries, returning them and where extensions start.
+
+    This is the hot loop for large indexes: constants are bound to locals
+    and paths are sliced straight from the mapped file.
+    """
+    entries: list[IndexEntry] = []
+    append = entries.append
+    unpack = ENTRY.unpack_from
+    find = data.find
+    size = ENTRY.size
+    extended_size = size + EXTENDED_FLAGS.size
+    compressed = version == 4  # noqa: PLR2004
+    pos = 12
+    path = b''
+    for _ in range(count):
+        mode, oid, flags = unpack(data, pos)
+        extended = 0
+        if flags & FLAG_EXTENDED:
+            (extended,) = EXTENDED_FLAGS.unpack_from(data, pos + size)
+            start = pos + extended_size
+        else:
+            start = pos + size
+
+        if compressed:
+            strip = data[start]
+            if strip & 0x80:
+                strip, start = _varint(data, start)
+            else:
+                start += 1
+            end = find(b'\0', start)
+            path = path[: len(path) - strip] + data[start:end]
+            pos = end + 1
+        else:
+            end = start + (flags & NAME_MASK)
+            if flags & NAME_MASK == NAME_MASK:
+                end = find(b'\0', start)
+            path = data[start:end]
+            pos += (end - pos + 8) & ~7
+
+        if mode & S_IFMT == S_IFDIR:
+            msg = 'Sparse index is not supported'
+            raise UnsupportedIndexError(msg)
+        if not extended & FLAG_INTENT_TO_ADD:
+            append((path, mode, oid, (flags >> 12) & 3))
+    return entries, pos
+
+
+def _parse_extensions(data: mmap.mmap | bytes, pos: int) -> dict[bytes, bytes]:
+    """Parse extensions, keeping only the cache tree."""
+    trees: dict[bytes, bytes] = {}
+    end = len(data) - OID_SIZE
+    while pos + 8 <= end:
+        signature, size = struct.unpack_from('>4sI', data, pos)
+        pos += 8
+        if pos + size > end:
+            msg = 'Truncated index'
+            raise ValueError(msg)
+        if signature == TREE_EXTENSION:
+            trees = parse_cache_tree(bytes(data[pos : pos + size]))
+        elif signature[:1].islower():
+            msg = f'Unsupported index extension: {signature!r}'
+            raise UnsupportedIndexError(msg)
+        pos += size
+    return trees
+
+
+def parse_index(
+    data: mmap.mmap | bytes,
+) -> tuple[list[IndexEntry], dict[bytes, bytes]]:
+    """Parse a git index, versions 2 to 4.
+
+    Entries flagged intent-to-add are skipped, as `git diff --cached`
+    does. Paths are kept as bytes, so only changed ones are ever decoded.
+
+    Args:
+        data: Index content, usually memory-mapped.
+
+    Returns:
+        tuple[list[IndexEntry], dict[bytes, bytes]]: Entries sorted by
+            path and the valid cache-tree directories.
+
+    Raises:
+        UnsupportedIndexError: For unknown versions, split or sparse
+            indexes.
+        ValueError: For a truncated index.
+
+    """
+    try:
+        signature, version, count = struct.unpack_from('>4sII', data)
+        if signature != INDEX_SIGNATURE or version not in INDEX_VERSIONS:
+            msg = f'Unsupported index version: {version}'
+            raise UnsupportedIndexError(msg)
+        entries, pos = _parse_entries(data, version, count)
+        return entries, _parse_extensions(data, pos)
+    except (IndexError, struct.error) as e:
+        msg = 'Truncated index'
+        raise ValueError(msg) from e
+
+
+def read_index(git_dir: Path) -> tuple[list[IndexEntry], dict[bytes, bytes]]:
+    """Read the index of `git_dir`, or `GIT_INDEX_FILE`, memory-mapped."""
+    path = Path(getenv('GIT_INDEX_FILE') or git_dir / 'index')
+    try:
+        file = path.open('rb')
+    except FileNotFoundError:
+        return [], {}
+    with file:
+        if not os.fstat(file.fileno()).st_size:
+            return [], {}
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return parse_index(data)
+
+
+def _status(
+    old: tuple[int, bytes] | None, mode: int, oid: bytes, stage: int
+) -> str | None:
+    """Status letter of a file against its `(mode, oid)` in the tree."""
+    if stage:
+        return 'U'
+    if old is None:
+        return 'A'
+    if old[0] & S_IFMT != mode & S_IFMT:
+        return 'T'
+    if old != (mode, oid):
+        return 'M'
+    return None
+
+
+class IndexDiff:
+    """Compare index entries with a tree, like `git diff --cached`.
+
+    Directories whose cache-tree entry matches the tree are skipped
+    without reading them, so unchanged subtrees cost nothing.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        entries: list[IndexEntry],
+        trees: dict[bytes, bytes] | None = None,
+    ) -> None:
+        """Init."""
+        self.store = store
+        self.entries = entries
+        self.trees = trees or {}
+
+    def deleted(
+        self, tree: bytes, prefix: bytes
+    ) -> Iterator[tuple[str, bytes]]:
+        """Report every file of a tree missing from the index."""
+        for path, _, _ in self.store.iter_tree(tree, prefix):
+            yield 'D', path
+
+    def diff(
+        self, tree: bytes | None, prefix: bytes, lo: int, hi: int
+    ) -> Iterator[tuple[str, bytes]]:
+        """Compare `tree` with entries `lo:hi`, all under `prefix`."""
+        if tree is not None and self.trees.get(prefix) == tree:
+            return
+        head = {
+            name: (mode, oid)
+            for name, mode, oid in (self.store.read_tree(tree) if tree else ())
+        }
+        entries = self.entries
+        i = lo
+        while i < hi:
+            path, mode, oid, stage = entries[i]
+            slash = path.find(b'/', len(prefix))
+            if slash >= 0:
+                j = bisect_left(
+                    entries, path[:slash] + b'0', i, hi, key=itemgetter(0)
+                )
+                old = head.pop(path[len(prefix) : slash], None)
+                if old is not None and old[0] != S_IFDIR:
+                    yield 'D', path[:slash]
+                    old = None
+                yield from self.diff(old and old[1], path[: slash + 1], i, j)
+                i = j
+                continue
+
+            i += 1
+            while stage and i < hi and entries[i][0] == path:
+                i += 1
+            old = head.pop(path[len(prefix) :], None)
+            if old is not None and old[0] == S_IFDIR:
+                yield from self.deleted(old[1], path + b'/')
+                old = None
+            if status := _status(old, mode, oid, stage):
+                yield status, path
+
+        for name, (mode, oid) in head.items():
+            if mode == S_IFDIR:
+                yield from self.deleted(oid, prefix + name + b'/')
+            else:
+                yield 'D', prefix + name
+
+
+def _resolve_head(git_dir: Path) -> str | None:
+    """Resolve HEAD, refusing repositories only git can read."""
+    if (get_common_dir(git_dir) / 'reftable').is_dir():
+        msg = 'Reftable backend is not supported'
+        raise UnsupportedIndexError(msg)
+
+    head = resolve_ref(git_dir, 'HEAD')
+    if head is not None and len(head) != OID_SIZE * 2:
+        msg = 'Only SHA-1 repositories are supported'
+        raise UnsupportedIndexError(msg)
+    return head
+
+
+def read_staged_oids(git_dir: Path) -> dict[str, bytes]:
+    """Map the path of each staged file to its blob, as it will be committed.
+
+    Unmerged entries and submodules are left out.
+
+    Raises:
+        UnsupportedIndexError: When only git can answer, e.g. reftable.
+
+    """
+    _resolve_head(git_dir)
+    entries, _ = read_index(git_dir)
+    return {
+        os.fsdecode(path): oid
+        for path, mode, oid, stage in entries
+        if not stage and mode & S_IFMT != S_IFGITLINK
+    }
+
+
+def read_staged_changes(git_dir: Path) -> list[StagedChange]:
+    """List staged changes reading `.git/index` and objects directly.
+
+    Matches `git diff --cached --name-status -r --no-renames`.
+
+    Args:
+        git_dir: The git directory.
+
+    Returns:
+        list[StagedChange]: Changes sorted by path.
+
+    Raises:
+        UnsupportedIndexError: When only git can answer, e.g. reftable.
+        ObjectNotFoundError: When HEAD's objects cannot be read.
+
+    """
+    head = _resolve_head(git_dir)
+    entries, trees = read_index(git_dir)
+    store = ObjectStore(git_dir)
+    diff = IndexDiff(store, entries, trees)
+    tree = store.commit_tree(bytes.fromhex(head)) if head else None
+    changes = sorted(diff.diff(tree, b'', 0, len(entries)), key=itemgetter(1))
+    debug.log('index entries: %s, changes: %s', len(entries), len(changes))
+    return [
+        StagedChange(status, os.fsdecode(path)) for status, path in changes
+    ]
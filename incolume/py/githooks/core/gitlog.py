@@ -0,0 +1,104 @@
+"""Module to stream commit messages from git log."""
+
+# ruff: noqa: S404 S603 S607
+
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core.staged import iter_nul_fields
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+MESSAGE_FIELDS: Final[tuple[str, ...]] = ('%H', '%B')
+
+
+def log_format(placeholders: Sequence[str]) -> str:
+    """Build a `--format` of NUL terminated fields.
+
+    Examples:
+        >>> log_format(['%H', '%B'])
+        '--format=%H%x00%B%x00'
+
+    """
+    return f'--format={"".join(f"{x}%x00" for x in placeholders)}'
+
+
+LOG_FORMAT: Final[str] = log_format(MESSAGE_FIELDS)
+
+
+def parse_records(
+    fields: Iterable[str], size: int
+) -> Iterator[tuple[str, ...]]:
+    r"""Group the fields of a `log_format` output by commit.
+
+    Examples:
+        >>> list(parse_records(['a1', 'x', 'y', '\nb2', 'z', 'w', '\n'], 3))
+        [('a1', 'x', 'y'), ('b2', 'z', 'w')]
+
+    """
+    fields = iter(fields)
+    for first, *rest in zip(*[fields] * size, strict=False):
+        yield (first.lstrip('\n'), *rest)
+
+
+def parse_log(fields: Iterable[str]) -> Iterator[tuple[str, str]]:
+    r"""Pair the fields of `git log --format=%H%x00%B%x00`.
+
+    Examples:
+        >>> list(parse_log(['a1', 'feat: x\n', '\nb2', 'fix: y\n', '\n']))
+        [('a1', 'feat: x\n'), ('b2', 'fix: y\n')]
+
+    """
+    return parse_records(fields, len(MESSAGE_FIELDS))
+
+
+def iter_log(
+    placeholders: Sequence[str], *args: str
+) -> Iterator[tuple[str, ...]]:
+    """Stream one tuple of fields per commit, without buffering the log.
+
+    Args:
+        placeholders: `git log` format placeholders, e.g. `%H`, `%aN`.
+        args: Revision range and other `git log` arguments.
+
+    Yields:
+        tuple[str, ...]: Fields of each commit.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with (
+        span('git log', 'subprocess'),
+        subprocess.Popen(
+            ['git', 'log', log_format(placeholders), *args],
+            stdout=subprocess.PIPE,
+        ) as process,
+    ):
+        yield from parse_records(
+            iter_nul_fields(process.stdout), len(placeholders)
+        )
+    if process.returncode:
+        msg = f'Falha ao executar git log {" ".join(args)}'
+        raise RuntimeError(msg)
+
+
+def iter_commit_messages(*args: str) -> Iterator[tuple[str, str]]:
+    """Stream `(oid, message)` of commits, without buffering the log.
+
+    Args:
+        args: Revision range and other `git log` arguments, e.g.
+            `origin/main..HEAD`.
+
+    Yields:
+        tuple[str, str]: Commit id and raw message.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    yield from iter_log(MESSAGE_FIELDS, *args)
@@ -0,0 +1,300 @@
+"""Module to read git objects without forking git."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from os import getenv
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core.gitrepo import get_common_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+OID_SIZE: Final[int] = 20
+CHUNK_SIZE: Final[int] = 1 << 16
+S_IFMT: Final[int] = 0o170000
+S_IFDIR: Final[int] = 0o040000
+OBJECT_TYPES: Final[dict[int, bytes]] = {
+    1: b'commit',
+    2: b'tree',
+    3: b'blob',
+    4: b'tag',
+}
+TYPE_IDS: Final[dict[bytes, int]] = {v: k for k, v in OBJECT_TYPES.items()}
+OFS_DELTA: Final[int] = 6
+REF_DELTA: Final[int] = 7
+PACK_IDX_SIGNATURE: Final[bytes] = b'\377tOc'
+MAX_CACHED_OBJECTS: Final[int] = 256
+
+TreeEntry = tuple[bytes, int, bytes]
+"""Tree entry as `(name, mode, oid)`."""
+
+
+class ObjectNotFoundError(LookupError):
+    """Object is missing or stored where only git can read it."""
+
+
+def _map(path: Path) -> mmap.mmap:
+    """Memory-map a file read-only."""
+    with path.open('rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _inflate(data: mmap.mmap, pos: int) -> bytes:
+    """Inflate a zlib stream starting at `pos`, reading it in chunks."""
+    decompressor = zlib.decompressobj()
+    output = []
+    while not decompressor.eof:
+        chunk = data[pos : pos + CHUNK_SIZE]
+        if not chunk:
+            msg = 'Truncated object'
+            raise ObjectNotFoundError(msg)
+        output.append(decompressor.decompress(chunk))
+        pos += CHUNK_SIZE
+    return b''.join(output)
+
+
+def _delta_size(delta: bytes, pos: int) -> tuple[int, int]:
+    """Decode a little-endian base-128 size from a delta header."""
+    size = shift = 0
+    while True:
+        byte = delta[pos]
+        pos += 1
+        size |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    r"""Rebuild an object from its base and a git delta.
+
+    Examples:
+        >>> apply_delta(b'hello world', b'\x0b\x09\x90\x05\x04 git')
+        b'hello git'
+
+    """
+    _, pos = _delta_size(delta, 0)
+    _, pos = _delta_size(delta, pos)
+    output = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if not opcode & 0x80:
+            output += delta[pos : pos + opcode]
+            pos += opcode
+            continue
+        offset = size = 0
+        for bit in range(7):
+            if opcode & (1 << bit):
+                value = delta[pos]
+                pos += 1
+                if bit < 4:  # noqa: PLR2004
+                    offset |= value << (8 * bit)
+                else:
+                    size |= value << (8 * (bit - 4))
+        output += base[offset : offset + (size or 0x10000)]
+    return bytes(output)
+
+
+class PackIndex:
+    """Version 2 pack index, memory-mapped."""
+
+    def __init__(self, path: Path) -> None:
+        """Init mapping `path` and its pack."""
+        self.data = _map(path)
+        if self.data[:8] != PACK_IDX_SIGNATURE + b'\0\0\0\2':
+            msg = f'Unsupported pack index: {path}'
+            raise ObjectNotFoundError(msg)
+        self.fanout = struct.unpack_from('>256I', self.data, 8)
+        count = self.fanout[255]
+        self.names = 8 + 256 * 4
+        self.offsets = self.names + count * (OID_SIZE + 4)
+        self.large_offsets = self.offsets + count * 4
+        self.pack = _map(path.with_suffix('.pack'))
+
+    def find(self, oid: bytes) -> int | None:
+        """Offset of `oid` in the pack, or None when absent."""
+        lo = self.fanout[oid[0] - 1] if oid[0] else 0
+        hi = self.fanout[oid[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.names + mid * OID_SIZE
+            name = self.data[start : start + OID_SIZE]
+            if name < oid:
+                lo = mid + 1
+            elif name > oid:
+                hi = mid
+            else:
+                (offset,) = struct.unpack_from(
+                    '>I', self.data, self.offsets + mid * 4
+                )
+                if offset & 0x80000000:
+                    (offset,) = struct.unpack_from(
+                        '>Q',
+                        self.data,
+                        self.large_offsets + (offset & 0x7FFFFFFF) * 8,
+                    )
+                return offset
+        return None
+
+
+class ObjectStore:
+    """Read-only access to loose and packed objects.
+
+    Honors `GIT_OBJECT_DIRECTORY`, `GIT_ALTERNATE_OBJECT_DIRECTORIES` and
+    `objects/info/alternates`. Only SHA-1 repositories are supported.
+    """
+
+    def __init__(self, git_dir: Path) -> None:
+        """Init with the object directories of `git_dir`."""
+        primary = Path(
+            getenv('GIT_OBJECT_DIRECTORY')
+            or get_common_dir(git_dir) / 'objects'
+        )
+        self.directories = [primary]
+        extra = getenv('GIT_ALTERNATE_OBJECT_DIRECTORIES', '')
+        self.directories.extend(Path(x) for x in extra.split(os.pathsep) if x)
+        try:
+            alternates = (primary / 'info' / 'alternates').read_text('utf-8')
+        except OSError:
+            alternates = ''
+        self.directories.extend(
+            primary / line
+            for line in alternates.splitlines()
+            if line and not line.startswith('#')
+        )
+        self._packs: list[PackIndex] | None = None
+        self._cache: dict[bytes, tuple[int, bytes]] = {}
+
+    @property
+    def packs(self) -> list[PackIndex]:
+        """Pack indexes of all object directories, loaded once."""
+        if self._packs is None:
+            self._packs = [
+                PackIndex(idx)
+                for directory in self.directories
+                for idx in sorted((directory / 'pack').glob('pack-*.idx'))
+            ]
+        return self._packs
+
+    def _read_loose(self, oid: bytes) -> tuple[int, bytes] | None:
+        """Read a loose object, or None when absent."""
+        hexoid = oid.hex()
+        for directory in self.directories:
+            try:
+                raw = (directory / hexoid[:2] / hexoid[2:]).read_bytes()
+            except OSError:
+                continue
+            data = zlib.decompress(raw)
+            header, _, body = data.partition(b'\0')
+            return TYPE_IDS[header.split(b' ', 1)[0]], body
+        return None
+
+    def _read_packed(self, pack: PackIndex, offset: int) -> tuple[int, bytes]:
+        """Read an object from a pack, resolving its delta chain."""
+        deltas: list[bytes] = []
+        while True:
+            data = pack.pack
+            byte = data[offset]
+            kind = (byte >> 4) & 7
+            pos = offset + 1
+            while byte & 0x80:
+                byte = data[pos]
+                pos += 1
+
+            if kind == OFS_DELTA:
+                byte = data[pos]
+                pos += 1
+                distance = byte & 0x7F
+                while byte & 0x80:
+                    byte = data[pos]
+                    pos += 1
+                    distance = ((distance + 1) << 7) | (byte & 0x7F)
+                deltas.append(_inflate(data, pos))
+                offset -= distance
+            elif kind == REF_DELTA:
+                deltas.append(_inflate(data, pos + OID_SIZE))
+                kind, body = self.read(bytes(data[pos : pos + OID_SIZE]))
+                break
+            else:
+                body = _inflate(data, pos)
+                break
+
+        for delta in reversed(deltas):
+            body = apply_delta(body, delta)
+        return kind, body
+
+    def read(self, oid: bytes) -> tuple[int, bytes]:
+        """Read an object.
+
+        Args:
+            oid: Binary object id.
+
+        Returns:
+            tuple[int, bytes]: Object type (`OBJECT_TYPES` key) and content.
+
+        Raises:
+            ObjectNotFoundError: When the object cannot be found.
+
+        """
+        if oid in self._cache:
+            return self._cache[oid]
+        for pack in self.packs:
+            if (offset := pack.find(oid)) is not None:
+                obj = self._read_packed(pack, offset)
+                break
+        else:
+            obj = self._read_loose(oid)
+        if obj is None:
+            msg = f'Object not found: {oid.hex()}'
+            raise ObjectNotFoundError(msg)
+        if len(self._cache) >= MAX_CACHED_OBJECTS:
+            self._cache.clear()
+        self._cache[oid] = obj
+        return obj
+
+    def read_tree(self, oid: bytes) -> list[TreeEntry]:
+        """Parse a tree object into `(name, mode, oid)` entries."""
+        kind, data = self.read(oid)
+        if OBJECT_TYPES.get(kind) != b'tree':
+            msg = f'Not a tree: {oid.hex()}'
+            raise ObjectNotFoundError(msg)
+        entries = []
+        pos = 0
+        while pos < len(data):
+            space = data.index(b' ', pos)
+            nul = data.index(b'\0', space)
+            entries.append((
+                data[space + 1 : nul],
+                int(data[pos:space], 8),
+                data[nul + 1 : nul + 1 + OID_SIZE],
+            ))
+            pos = nul + 1 + OID_SIZE
+        return entries
+
+    def iter_tree(
+        self, oid: bytes, prefix: bytes = b''
+    ) -> Iterator[TreeEntry]:
+        """Walk a tree recursively, yielding `(path, mode, oid)` of files."""
+        for name, mode, entry_oid in self.read_tree(oid):
+            if mode & S_IFMT == S_IFDIR:
+                yield from self.iter_tree(entry_oid, prefix + name + b'/')
+            else:
+                yield prefix + name, mode, entry_oid
+
+    def commit_tree(self, oid: bytes) -> bytes:
+        """Get the binary tree id of a commit."""
+        kind, data = self.read(oid)
+        if OBJECT_TYPES.get(kind) != b'commit' or not data.startswith(
+            b'tree '
+        ):
+            msg = f'Not a commit: {oid.hex()}'
+            raise ObjectNotFoundError(msg)
+        return bytes.fromhex(data[5 : 5 + OID_SIZE * 2].decode())
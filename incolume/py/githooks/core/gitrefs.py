@@ -0,0 +1,71 @@
+"""Module to stream refnames from git for-each-ref."""
+
+# ruff: noqa: S404 S603 S607
+
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+BRANCH_REFS: Final[tuple[str, ...]] = ('refs/heads', 'refs/remotes')
+REF_FORMAT: Final[str] = (
+    '--format=%(if)%(symref)%(then)%(else)%(refname)%(end)'
+)
+"""Full refname, or an empty line for symbolic refs like `origin/HEAD`."""
+
+
+def branch_of(refname: str) -> str | None:
+    """Branch name of a local or remote-tracking ref.
+
+    Remote names are taken as a single path component.
+
+    Examples:
+        >>> branch_of('refs/heads/feat/issue#1')
+        'feat/issue#1'
+        >>> branch_of('refs/remotes/origin/123-abc')
+        '123-abc'
+        >>> branch_of('refs/tags/v1.0.0') is None
+        True
+
+    """
+    kind, _, rest = refname.removeprefix('refs/').partition('/')
+    if kind == 'heads':
+        return rest or None
+    if kind == 'remotes':
+        return rest.partition('/')[2] or None
+    return None
+
+
+def iter_refnames(*patterns: str) -> Iterator[str]:
+    """Stream full refnames, without buffering the output of git.
+
+    Args:
+        patterns: `git for-each-ref` patterns, default is `BRANCH_REFS`.
+
+    Yields:
+        str: Refnames, symbolic refs excluded.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with (
+        span('git for-each-ref', 'subprocess'),
+        subprocess.Popen(
+            ['git', 'for-each-ref', REF_FORMAT, *(patterns or BRANCH_REFS)],
+            stdout=subprocess.PIPE,
+            encoding='utf-8',
+            errors='surrogateescape',
+        ) as process,
+    ):
+        for line in process.stdout:
+            if refname := line.rstrip('\n'):
+                yield refname
+    if process.returncode:
+        msg = f'Falha ao executar git for-each-ref {" ".join(patterns)}'
+        raise RuntimeError(msg)
@@ -0,0 +1,168 @@
+"""Module to read git repository metadata without forking git."""
+
+from __future__ import annotations
+
+import re
+from os import getenv
+from pathlib import Path
+from typing import Final
+
+from incolume.py.githooks.core import debug
+
+REGEX_OID: Final[re.Pattern] = re.compile(r'^([0-9a-f]{40}|[0-9a-f]{64})$')
+SYMREF_PREFIX: Final[str] = 'ref: '
+MAX_SYMREF_DEPTH: Final[int] = 5
+
+
+def find_git_dir(start: Path | str | None = None) -> Path | None:
+    """Locate the git directory for the current work tree.
+
+    Honors `GIT_DIR`, plain `.git` directories and `.git` files with a
+    `gitdir:` pointer (worktrees and submodules).
+
+    Args:
+        start: Directory where the search begins, default is current one.
+
+    Returns:
+        Path | None: The git directory, or None when not found.
+
+    """
+    if git_dir := getenv('GIT_DIR'):
+        return Path(git_dir).absolute()
+
+    current = Path(start or Path.cwd()).absolute()
+    for directory in (current, *current.parents):
+        candidate = directory / '.git'
+        if candidate.is_dir():
+            return candidate
+        if candidate.is_file():
+            return _read_gitdir_file(candidate)
+    return None
+
+
+def _read_gitdir_file(dotgit: Path) -> Path | None:
+    """Follow the `gitdir: <path>` pointer of a `.git` file."""
+    try:
+        content = dotgit.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    if not content.startswith('gitdir:'):
+        return None
+    git_dir = Path(content.removeprefix('gitdir:').strip())
+    if not git_dir.is_absolute():
+        git_dir = dotgit.parent / git_dir
+    return git_dir
+
+
+def get_common_dir(git_dir: Path) -> Path:
+    """Get the common directory shared by all worktrees.
+
+    Args:
+        git_dir: The (possibly per-worktree) git directory.
+
+    Returns:
+        Path: Directory holding shared refs, `packed-refs` and `config`.
+
+    """
+    try:
+        common = (git_dir / 'commondir').read_text(encoding='utf-8').strip()
+    except OSError:
+        return git_dir
+    common_dir = Path(common)
+    if not common_dir.is_absolute():
+        common_dir = git_dir / common_dir
+    return common_dir
+
+
+def read_packed_refs(common_dir: Path) -> dict[str, str]:
+    """Parse `packed-refs` into a mapping of refname to object id."""
+    refs: dict[str, str] = {}
+    try:
+        content = (common_dir / 'packed-refs').read_text(encoding='utf-8')
+    except OSError:
+        return refs
+
+    for line in content.splitlines():
+        if not line or line.startswith(('#', '^')):
+            continue
+        oid, _, refname = line.partition(' ')
+        refs[refname.strip()] = oid
+    return refs
+
+
+def resolve_ref(git_dir: Path, refname: str) -> str | None:
+    """Resolve a refname to its object id.
+
+    Loose refs are looked up in the worktree git directory first, then in
+    the common directory and finally in `packed-refs`.
+
+    Args:
+        git_dir: The git directory.
+        refname: Full refname, e.g. `refs/heads/main` or `HEAD`.
+
+    Returns:
+        str | None: The object id, or None if the ref does not exist.
+
+    """
+    common_dir = get_common_dir(git_dir)
+    packed: dict[str, str] | None = None
+
+    for _ in range(MAX_SYMREF_DEPTH):
+        content = None
+        for base in dict.fromkeys((git_dir, common_dir)):
+            try:
+                content = (base / refname).read_text(encoding='utf-8')
+                break
+            except OSError:
+                continue
+
+        if content is None:
+            if packed is None:
+                packed = read_packed_refs(common_dir)
+            return packed.get(refname)
+
+        content = content.strip()
+        if not content.startswith(SYMREF_PREFIX):
+            return content if REGEX_OID.match(content) else None
+        refname = content.removeprefix(SYMREF_PREFIX).strip()
+    return None
+
+
+def read_head_branch(git_dir: Path | None = None) -> str | None:
+    """Read the current branch name straight from `HEAD`.
+
+    Mirrors `git rev-parse --abbrev-ref HEAD`: returns the short branch
+    name, or `HEAD` when detached. Unborn branches and unknown layouts
+    (e.g. the reftable backend) return None so callers can fall back to
+    git itself.
+
+    Args:
+        git_dir: The git directory, default is discovered from cwd.
+
+    Returns:
+        str | None: Branch name, `HEAD` if detached, or None if unsure.
+
+    """
+    git_dir = git_dir or find_git_dir()
+    if git_dir is None:
+        return None
+
+    try:
+        head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+    if REGEX_OID.match(head):
+        return 'HEAD'
+
+    refname = head.removeprefix(SYMREF_PREFIX).strip()
+    if (
+        not head.startswith(SYMREF_PREFIX)
+        or not refname.startswith('refs/heads/')
+        or resolve_ref(git_dir, refname) is None
+    ):
+        return None
+
+    branch = refname.removeprefix('refs/heads/')
+    debug.log('branch: %s', branch)
+    return branch
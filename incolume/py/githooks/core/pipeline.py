@@ -0,0 +1,196 @@
+"""Module to rewrite commit messages with a single atomic write."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from functools import reduce
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.rules import Backup
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing import Self  # type: ignore[import]
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing_extensions import Self  # type: ignore[import]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    Transform = Callable[[str], str]
+
+
+BACKUP_SUFFIX: Final[str] = '.bak'
+
+
+def backup_path(path: Path) -> Path:
+    """Path of the backup of a commit message, e.g. `MSG.bak`."""
+    return path.with_suffix(path.suffix + BACKUP_SUFFIX)
+
+
+def make_backup(path: Path, backup: Backup = Backup.LINK) -> Path | None:
+    """Keep the current content of `path` as its `.bak`.
+
+    `Backup.LINK` hard-links the current inode, so no byte is copied: the
+    following `os.replace` leaves the old content only under the backup.
+    It falls back to a copy where hard links are not supported.
+
+    Args:
+        path: Commit message file.
+        backup: Backup mode.
+
+    Returns:
+        Path | None: The backup, or None when not made.
+
+    """
+    if backup is Backup.NONE or not path.exists():
+        return None
+    target = backup_path(path)
+    target.unlink(missing_ok=True)
+    if backup is Backup.LINK:
+        try:
+            os.link(path, target)
+        except OSError as e:
+            debug.log('Backup by copy: %s', e)
+        else:
+            return target
+    shutil.copy2(path, target)
+    return target
+
+
+class AtomicFile:
+    """Text file written aside and moved over `path` on success.
+
+    Readers see either the old or the new content, never a partial one.
+    Lines may be streamed in, so memory use does not depend on file size.
+
+    Examples:
+        >>> with AtomicFile(Path(tempfile.mkdtemp(), 'MSG')) as file:
+        ...     file.write('feat: x')
+        7
+
+    """
+
+    def __init__(self, path: Path, backup: Backup = Backup.NONE) -> None:
+        """Init.
+
+        Args:
+            path: Target file.
+            backup: Backup mode of the old content, applied on success.
+
+        """
+        self.path = path
+        self.backup = backup
+        self.discarded = False
+        fd, name = tempfile.mkstemp(
+            dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp'
+        )
+        self.tmp = Path(name)
+        try:
+            self.file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+        except BaseException:
+            os.close(fd)
+            self.tmp.unlink()
+            raise
+
+    def __enter__(self) -> Self:
+        """Enter."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, *_: object
+    ) -> None:
+        """Move the written file over `path`, unless failed or discarded."""
+        try:
+            self.file.close()
+            if exc_type is None and not self.discarded:
+                with contextlib.suppress(OSError):
+                    shutil.copymode(self.path, self.tmp)
+                make_backup(self.path, self.backup)
+                self.tmp.replace(self.path)
+        finally:
+            self.tmp.unlink(missing_ok=True)
+
+    def write(self, text: str) -> int:
+        """Write text, as is (no newline translation)."""
+        return self.file.write(text)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Write lines, as is."""
+        self.file.writelines(lines)
+
+    def discard(self) -> None:
+        """Keep `path` untouched on exit."""
+        self.discarded = True
+
+
+def write_atomic(
+    path: Path, content: str, backup: Backup = Backup.NONE
+) -> None:
+    """Write `content` to a temporary file and move it over `path`.
+
+    Args:
+        path: Commit message file.
+        content: New content, written as is (no newline translation).
+        backup: Backup mode of the old content.
+
+    """
+    with AtomicFile(path, backup) as file:
+        file.write(content)
+
+
+@dataclass
+class MessagePipeline:
+    r"""Ordered transformations of a commit message, written once.
+
+    The message is read once, every transformation runs over the
+    in-memory text and the result is written with `write_atomic` only if
+    it changed.
+
+    Examples:
+        >>> pipeline = MessagePipeline(Path('MSG')).pipe(str.strip, str.title)
+        >>> pipeline.apply('  fix: typo\n')
+        'Fix: Typo'
+
+    """
+
+    path: Path
+    transforms: list[Transform] = field(default_factory=list)
+    backup: Backup = Backup.NONE
+
+    def pipe(self, *transforms: Transform) -> Self:
+        """Append transformations, in order."""
+        self.transforms.extend(transforms)
+        return self
+
+    def apply(self, content: str) -> str:
+        """Run the transformations over `content`."""
+        return reduce(lambda text, func: func(text), self.transforms, content)
+
+    def run(self) -> bool:
+        """Read, transform and write back the message.
+
+        Returns:
+            bool: True if the file was rewritten.
+
+        """
+        with self.path.open(encoding='utf-8', newline='') as file:
+            content = file.read()
+        result = self.apply(content)
+        changed = result != content
+        debug.log(
+            'pipeline %s: %s transforms, changed: %s',
+            self.path,
+            len(self.transforms),
+            changed,
+        )
+        if not changed:
+            return False
+        write_atomic(self.path, result, self.backup)
+        return True
@@ -0,0 +1,123 @@
+"""Module to profile hook calls with cProfile, on demand."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+import time
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+PROFILE_VAR: Final[str] = 'INCOLUME_PROFILE'
+COLLAPSED_VAR: Final[str] = 'INCOLUME_PROFILE_COLLAPSED'
+MIN_WEIGHT: Final[int] = 1
+"""Branches under this many microseconds are left out of the stacks."""
+
+Function = tuple[str, int, str]
+"""Function key of `pstats`: `(filename, line, name)`."""
+
+
+def profile_path(directory: Path | str, hook: str) -> Path:
+    """Build a `.prof` path unique per hook, timestamp and process.
+
+    Examples:
+        >>> profile_path('/tmp', 'x_cli').name.startswith('x_cli-')
+        True
+
+    """
+    stamp = time.strftime('%Y%m%dT%H%M%S')
+    return Path(directory) / f'{hook}-{stamp}-{os.getpid()}.prof'
+
+
+def frame_name(function: Function) -> str:
+    """Name a function for a collapsed stack.
+
+    Examples:
+        >>> frame_name(('/a/b/mod.py', 12, 'run'))
+        'run (mod.py:12)'
+        >>> frame_name(('~', 0, '<built-in method time.sleep>'))
+        '<built-in method time.sleep>'
+
+    """
+    filename, line, name = function
+    if filename == '~':
+        return name
+    return f'{name} ({Path(filename).name}:{line})'
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Iterator[str]:
+    """Rebuild collapsed stacks, `a;b;c <us>`, from a cProfile call graph.
+
+    cProfile keeps caller to callee edges only, so the cumulative time of
+    a function is split among its callees in proportion to each edge, as
+    flameprof does. Recursion is cut at the first repeated frame.
+    """
+    entries = stats.stats  # type: ignore[attr-defined]
+    callees: dict[Function, dict[Function, float]] = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+
+    def walk(
+        function: Function, stack: tuple[str, ...], budget: float
+    ) -> Iterator[str]:
+        _, _, own, cumulative, _ = entries[function]
+        scale = budget / cumulative if cumulative else 0.0
+        stack = (*stack, frame_name(function))
+        if (weight := round(own * scale * 1e6)) >= MIN_WEIGHT:
+            yield f'{";".join(stack)} {weight}'
+        for callee, edge in callees.get(function, {}).items():
+            share = edge * scale
+            if (
+                callee in entries
+                and frame_name(callee) not in stack
+                and (share * 1e6 >= MIN_WEIGHT)
+            ):
+                yield from walk(callee, stack, share)
+
+    for function, (_, _, _, cumulative, callers) in entries.items():
+        if not callers:
+            yield from walk(function, (), cumulative)
+
+
+def profiled(directory: Path | str, *, collapsed: bool = False) -> Callable:
+    """Profile each call, writing a `.prof` file into `directory`.
+
+    Args:
+        directory: Where profiles are written, created when missing.
+        collapsed: Also write the `.collapsed` stacks, for flamegraphs.
+
+    """
+
+    def inner(func: Callable) -> Callable:
+        """Inner funtion to receive parameters."""
+
+        @wraps(func)
+        def wrapper(*args: str, **kwargs: dict) -> None:
+            """Wrapp function to profile it."""
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                path = profile_path(directory, func.__name__)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+                if collapsed:
+                    path.with_suffix('.collapsed').write_text(
+                        ''.join(
+                            f'{x}\n'
+                            for x in collapsed_stacks(pstats.Stats(profiler))
+                        ),
+                        encoding='utf-8',
+                    )
+                logging.info('Profile written: %s', path)
+
+        return wrapper
+
+    return inner
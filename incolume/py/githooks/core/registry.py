@@ -0,0 +1,191 @@
+"""Module with the registry of compiled rules of incolume githooks."""
+
+from __future__ import annotations
+
+import contextlib
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Final
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing import Self  # type: ignore[import]
+
+with contextlib.suppress(ImportError, ModuleNotFoundError):
+    from typing_extensions import Self  # type: ignore[import]
+
+
+from incolume.py.githooks.core.rules import (
+    REGEX_SEMVER,
+    RULE_BRANCHNAME,
+    RULE_BRANCHNAME_REFUSED,
+    RULE_COMMITFORMAT,
+    SNAKE_CASE,
+    TypeCommit,
+)
+
+TYPES_PATTERN: Final[str] = '|'.join(sorted(TypeCommit.to_set()))
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Regular expression compiled on first use, once per process."""
+
+    name: str
+    pattern: str
+    flags: int = 0
+    description: str = field(default='', compare=False)
+
+    @cached_property
+    def regex(self) -> re.Pattern[str]:
+        """Compiled pattern."""
+        return re.compile(self.pattern, self.flags)
+
+    @property
+    def compiled(self) -> bool:
+        """Check if the pattern was already compiled."""
+        return 'regex' in self.__dict__
+
+    def match(self, text: str) -> re.Match[str] | None:
+        """Match `text` from its start."""
+        return self.regex.match(text)
+
+    def __getstate__(self) -> dict[str, str | int]:
+        """Pickle the source only, workers compile on their own use."""
+        return {
+            'name': self.name,
+            'pattern': self.pattern,
+            'flags': self.flags,
+            'description': self.description,
+        }
+
+    def __setstate__(self, state: dict[str, str | int]) -> None:
+        """Restore from `__getstate__`."""
+        self.__dict__.update(state)
+
+
+class RuleRegistry(Mapping[str, Rule]):
+    r"""Read-only registry of rules by name.
+
+    Examples:
+        >>> registry = RuleRegistry([Rule('digits', r'\d+')])
+        >>> bool(registry.match('digits', '42')), registry['digits'].compiled
+        (True, True)
+        >>> RuleRegistry.fromdict(registry.asdict()) == registry
+        True
+
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        """Init."""
+        self._rules: Mapping[str, Rule] = MappingProxyType({
+            rule.name: rule for rule in rules
+        })
+
+    def __getitem__(self, name: str) -> Rule:
+        """Get a rule by name."""
+        return self._rules[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over rule names."""
+        return iter(self._rules)
+
+    def __len__(self) -> int:
+        """Count rules."""
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        """Represent."""
+        return f'{type(self).__name__}({list(self._rules.values())!r})'
+
+    def match(self, name: str, text: str) -> re.Match[str] | None:
+        """Match `text` against the rule `name`."""
+        return self._rules[name].regex.match(text)
+
+    def asdict(self) -> dict[str, dict[str, str | int]]:
+        """Serialize the sources, e.g. to JSON, without compiled state."""
+        return {
+            name: {
+                'pattern': rule.pattern,
+                'flags': rule.flags,
+                'description': rule.description,
+            }
+            for name, rule in self._rules.items()
+        }
+
+    @classmethod
+    def fromdict(cls, data: Mapping[str, Mapping[str, str | int]]) -> Self:
+        """Rebuild a registry from `asdict`."""
+        return cls(Rule(name, **values) for name, values in data.items())
+
+
+RULES: Final[RuleRegistry] = RuleRegistry([
+    Rule(
+        'commit_format',
+        RULE_COMMITFORMAT,
+        re.IGNORECASE,
+        'Conventional commit subject with issue id.',
+    ),
+    Rule(
+        'type_commit',
+        rf'^({TYPES_PATTERN})(\([\w\W\s]+\))?:',
+        description='Commit message starting with a type.',
+    ),
+    Rule('branchname', RULE_BRANCHNAME, description='Allowed branch names.'),
+    Rule(
+        'branchname_refused',
+        RULE_BRANCHNAME_REFUSED,
+        re.IGNORECASE,
+        'Refused branch names, e.g. WIP.',
+    ),
+    Rule(
+        'branchname_classifier',
+        rf'(?:(?=(?P<refused>(?i:{RULE_BRANCHNAME_REFUSED})))|)'
+        rf'(?:(?=(?P<allowed>{RULE_BRANCHNAME}))|)',
+        description='Refused and allowed branch names, in a single match.',
+    ),
+    Rule(
+        'branchname_length',
+        r'^[\w\d_-]{3,255}$',
+        description='Branch name between 3 and 255 characters.',
+    ),
+    Rule(
+        'branchname_github',
+        r'^\d+(-[\w_]{3,})+',
+        description='GitHub branch: <issue-id>-description.',
+    ),
+    Rule(
+        'branchname_enhancement',
+        r'^enhancement-\d{1,11}$',
+        description='Branch enhancement-<epoch-timestamp>.',
+    ),
+    Rule(
+        'branchname_incolume',
+        rf'^({TYPES_PATTERN})/(epoch|issue)#([0-9]+)$',
+        description='Branch <type>/(epoch|issue)#<id>.',
+    ),
+    Rule(
+        'branchname_issue',
+        r'(feature|hotfix)\/(\w+-\d+)',
+        description='Branch prefixing the commit message with its issue.',
+    ),
+    Rule('snake_case', SNAKE_CASE, description='Snake case name.'),
+    Rule('semver', REGEX_SEMVER, description='Semantic version.'),
+])
+"""Rules of incolume githooks, each compiled at most once per process."""
+
+TYPE_ALIASES: Final[Mapping[str, TypeCommit]] = TypeCommit._lookup_
+"""Type names and aliases, casefolded, resolving to the canonical type."""
+
+
+def resolve_type(name: str) -> TypeCommit | None:
+    """Resolve a type or alias in O(1), or None when unknown.
+
+    Examples:
+        >>> resolve_type(' BugFix '), resolve_type('xpto')
+        (<TypeCommit.FIX: 'fix'>, None)
+
+    """
+    return TYPE_ALIASES.get(name.strip().casefold())
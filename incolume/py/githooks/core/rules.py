@@ -6,13 +6,13 @@ from __future__ import annotations
 
 import contextlib
 import logging
-from collections import ChainMap
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import Final
+from enum import Enum, EnumMeta, auto
+from types import MappingProxyType
+from typing import Any, Final
 
-from icecream import ic
+from incolume.py.githooks.core import debug
 
 with contextlib.suppress(ImportError, ModuleNotFoundError):
     from typing import Self  # type: ignore[import]
@@ -21,9 +21,6 @@ with contextlib.suppress(ImportError, ModuleNotFoundError):
     from typing_extensions import Self  # type: ignore[import]
 
 
-ic.disable()
-
-
 def add_class_method_decorator(
     method: Callable, method_modo: Callable | None = classmethod
 ) -> Self:
@@ -42,40 +39,66 @@ def add_class_method_decorator(
     return wrapper
 
 
-def _missing_(cls: Self, value: str) -> Self | None:
-    """Get self instance."""
-    value = value.upper().strip()
-    if value.isdigit():
-        value = int(value)
+def _fold(key: Any) -> Any:  # noqa: ANN401
+    """Normalize a lookup key: case-folded text, digits as int."""
+    if isinstance(key, str):
+        key = key.strip().casefold()
+        if key.isdigit():
+            key = int(key)
+    return key
+
+
+class LookupEnumMeta(EnumMeta):
+    """Enum metaclass precomputing the lookup tables of each class.
+
+    Names and values, case-folded, are merged once into `_lookup_` when
+    the class is created, so parsing a member is a single dict lookup.
+    """
+
+    def __new__(mcs, *args: Any, **kwargs: Any) -> LookupEnumMeta:  # noqa: ANN401
+        """Create the enum class and its lookup tables."""
+        cls = super().__new__(mcs, *args, **kwargs)
+        values = cls._value2member_map_
+        cls._lookup_ = MappingProxyType({
+            **{_fold(value): member for value, member in values.items()},
+            **{name.casefold(): m for name, m in cls._member_map_.items()},
+        })
+        cls._values_ = frozenset(values)
+        cls._sorted_values_ = tuple(sorted(values))
+        return cls
 
-    member = ChainMap(cls._member_map_, cls._value2member_map_).get(value)
-    logging.debug(ic(f'{member=}'))
-    return member
+
+def _missing_(cls: Self, value: str) -> Self | None:
+    """Get self instance by name or value, case insensitive."""
+    try:
+        return cls._lookup_.get(_fold(value))
+    except TypeError:
+        return None
 
 
 def _generate_next_value_(
     name: str, start: any, count: any, last_values: any
 ) -> str:
     """Gernerate next value."""
-    logging.debug(ic(name, start, count, last_values))
+    debug.log('next value: %s %s %s %s', name, start, count, last_values)
     return name.casefold()
 
 
-def to_set(cls: Self) -> set[str]:
+def to_set(cls: Self) -> frozenset[str]:
     """Enum to set."""
-    return set(cls._value2member_map_)
+    return cls._values_
 
 
-def to_list(cls: Self) -> list[str]:
-    """Enum to list."""
-    return sorted(cls._value2member_map_)
+def to_list(cls: Self) -> tuple[str, ...]:
+    """Enum to sorted tuple."""
+    return cls._sorted_values_
 
 
 @add_class_method_decorator(_generate_next_value_, method_modo=staticmethod)
 @add_class_method_decorator(_missing_)
 @add_class_method_decorator(to_set)
 @add_class_method_decorator(to_list)
-class AutoName(Enum):
+class AutoName(Enum, metaclass=LookupEnumMeta):
     """Rule for next value."""
 
 
@@ -118,8 +141,16 @@ class RefusedBranchName(AutoName):
     WIP: str = auto()
 
 
+class Backup(AutoName):
+    """Backup mode of a commit message before rewriting it."""
+
+    NONE: str = auto()
+    LINK: str = auto()
+    COPY: str = auto()
+
+
 @add_class_method_decorator(_missing_)
-class Status(Enum):
+class Status(Enum, metaclass=LookupEnumMeta):
     """Status result for CLI."""
 
     SUCCESS: int = 0
@@ -127,9 +158,8 @@ class Status(Enum):
 
     def __or__(self, obj: Self | int) -> Status:
         """Override the | operator to combine Status values."""
-        if isinstance(obj, int):
-            obj = Status(obj)
-        return Status(self.value | obj.value)
+        value = self.value | (obj if isinstance(obj, int) else obj.value)
+        return self._lookup_.get(value) or Status(value)
 
     def __ror__(self, value: Self | int) -> Status:
         """Override the | operator to combine Status values."""
@@ -137,7 +167,7 @@ class Status(Enum):
 
 
 @add_class_method_decorator(_missing_)
-class LoggingLevel(Enum):
+class LoggingLevel(Enum, metaclass=LookupEnumMeta):
     """The textual or numeric representation of logging level package."""
 
     CRITICAL = 50
@@ -0,0 +1,101 @@
+"""Module to stream staged changes from git."""
+
+# ruff: noqa: S404 S603 S607
+
+from __future__ import annotations
+
+import os
+import subprocess
+from typing import IO, TYPE_CHECKING, Final, NamedTuple
+
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+CHUNK_SIZE: Final[int] = 1 << 16
+COPY_OR_RENAME: Final[frozenset[str]] = frozenset('CR')
+
+
+class StagedChange(NamedTuple):
+    """Staged change as reported by `git diff --name-status`."""
+
+    status: str
+    path: str
+    old_path: str | None = None
+
+    def __str__(self) -> str:
+        """Render like `git diff --name-status` does."""
+        if self.old_path is None:
+            return f'{self.status}\t{self.path}'
+        return f'{self.status}\t{self.old_path}\t{self.path}'
+
+
+def iter_nul_fields(
+    stream: IO[bytes], chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Split a binary stream on NUL bytes, reading it in chunks.
+
+    Args:
+        stream: Binary stream, e.g. a process stdout.
+        chunk_size: Bytes read at once.
+
+    Yields:
+        str: Each field, decoded as file system paths.
+
+    """
+    pending = b''
+    while chunk := stream.read(chunk_size):
+        *fields, pending = (pending + chunk).split(b'\0')
+        yield from map(os.fsdecode, fields)
+    if pending:
+        yield os.fsdecode(pending)
+
+
+def parse_name_status_z(fields: Iterable[str]) -> Iterator[StagedChange]:
+    """Parse fields of `git diff --name-status -z`.
+
+    Examples:
+        >>> list(parse_name_status_z(['M', 'a.py', 'R100', 'b.py', 'c.py']))
+        [StagedChange(status='M', path='a.py', old_path=None), \
+StagedChange(status='R100', path='c.py', old_path='b.py')]
+
+    """
+    fields = iter(fields)
+    for status in fields:
+        path = next(fields, '')
+        if status[:1] in COPY_OR_RENAME:
+            yield StagedChange(status, next(fields, ''), path)
+        else:
+            yield StagedChange(status, path)
+
+
+def iter_staged_changes(*args: str) -> Iterator[StagedChange]:
+    """Stream staged changes without holding git output in memory.
+
+    Args:
+        args: Extra arguments to `git diff --cached --name-status -r -z`.
+
+    Yields:
+        StagedChange: Each staged change.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    with (
+        span('git diff', 'subprocess'),
+        subprocess.Popen(
+            ['git', 'diff', '--cached', '--name-status', '-r', '-z', *args],
+            stdout=subprocess.PIPE,
+        ) as process,
+    ):
+        yield from parse_name_status_z(iter_nul_fields(process.stdout))
+    if process.returncode:
+        msg = 'Falha ao executar git diff'
+        raise RuntimeError(msg)
+
+
+def format_name_status(changes: Iterable[StagedChange]) -> str:
+    """Render changes like `git diff --name-status`."""
+    return '\n'.join(map(str, changes))
@@ -0,0 +1,244 @@
+"""Module to time hook calls and emit the records to pluggable sinks."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from os import getenv
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from incolume.py.githooks.core import debug
+from incolume.py.githooks.core.gitrepo import find_git_dir, get_common_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+TIMING_VAR: Final[str] = 'INCOLUME_TIMING'
+MEMORY_VAR: Final[str] = 'INCOLUME_TIMING_MEMORY'
+JSON_FILE: Final[str] = 'timings.jsonl'
+HISTORY_FILE: Final[str] = 'incolume-timings.jsonl'
+MAX_HISTORY_SIZE: Final[int] = 1 << 20
+
+
+@dataclass
+class Timing:
+    """Measurements of one hook call."""
+
+    hook: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak: int | None = None
+    code: int | None = None
+    files: int | None = None
+    scanned: int | None = None
+    timestamp: float = 0.0
+
+    def summary(self) -> str:
+        """One line summary.
+
+        Examples:
+            >>> Timing('detect_private_key_cli', 0.0125, 0.01, 2048).summary()
+            'detect_private_key_cli: wall 12.5ms, cpu 10.0ms, peak 2.0KiB'
+
+        """
+        text = (
+            f'{self.hook}: wall {self.wall * 1e3:.1f}ms, '
+            f'cpu {self.cpu * 1e3:.1f}ms'
+        )
+        if self.peak is not None:
+            text += f', peak {self.peak / 1024:.1f}KiB'
+        return text
+
+
+Sink = Callable[[Timing], None]
+
+
+def log_sink(timing: Timing) -> None:
+    """Emit a timing as an info log record."""
+    logging.info(timing.summary())
+
+
+def stderr_sink(timing: Timing) -> None:
+    """Emit a timing summary on stderr, keeping stdout for the hook."""
+    print(timing.summary(), file=sys.stderr)  # noqa: T201
+
+
+class JsonLinesSink:
+    """Append timings as JSON lines to a file."""
+
+    def __init__(self, path: Path | str = '') -> None:
+        """Init."""
+        self.path = Path(path or JSON_FILE)
+
+    def __repr__(self) -> str:
+        """Represent with the target file."""
+        return f'{type(self).__name__}({self.path.as_posix()!r})'
+
+    def __call__(self, timing: Timing) -> None:
+        """Append one record, in a single write."""
+        line = json.dumps(asdict(timing), separators=(',', ':')) + '\n'
+        with self.path.open('a', encoding='utf-8') as file:
+            file.write(line)
+
+
+def history_path(git_dir: Path | None = None) -> Path | None:
+    """Get the timing history of the repository, shared by worktrees."""
+    git_dir = git_dir or find_git_dir()
+    return get_common_dir(git_dir) / HISTORY_FILE if git_dir else None
+
+
+class HistorySink:
+    """Buffer timings, appending them to the history once, at exit.
+
+    Hooks pay only a list append, the file is written after the measured
+    call. The history is trimmed to its newest half past
+    `MAX_HISTORY_SIZE`.
+    """
+
+    def __init__(self, path: Path | str = '') -> None:
+        """Init, default path is `history_path()`."""
+        self.path = Path(path) if path else None
+        self.buffer: list[Timing] = []
+        atexit.register(self.flush)
+
+    def __repr__(self) -> str:
+        """Represent with the target file."""
+        path = self.path and self.path.as_posix()
+        return f'{type(self).__name__}({path!r})'
+
+    def __call__(self, timing: Timing) -> None:
+        """Buffer one record."""
+        self.buffer.append(timing)
+
+    def flush(self) -> None:
+        """Append the buffered records to the history."""
+        buffer, self.buffer = self.buffer, []
+        path = self.path or history_path()
+        if not buffer or path is None:
+            return
+        with path.open('a', encoding='utf-8') as file:
+            file.writelines(
+                json.dumps(asdict(x), separators=(',', ':')) + '\n'
+                for x in buffer
+            )
+            size = file.tell()
+        if size > MAX_HISTORY_SIZE:
+            lines = path.read_text('utf-8').splitlines(keepends=True)
+            path.write_text(''.join(lines[len(lines) // 2 :]), 'utf-8')
+
+
+SINK_FACTORIES: Final[dict[str, Callable[[str], Sink]]] = {
+    'log': lambda _: log_sink,
+    'stderr': lambda _: stderr_sink,
+    'json': JsonLinesSink,
+    'history': HistorySink,
+}
+"""Sink names for `INCOLUME_TIMING`, file sinks take a path: `json=t.jsonl`."""
+
+
+def parse_sinks(spec: str) -> list[Sink]:
+    """Build the sinks of a comma separated spec.
+
+    Unknown names are skipped with a warning: a typo in the environment
+    must never break a hook.
+
+    Examples:
+        >>> parse_sinks('stderr,json=timings.jsonl')  # doctest: +ELLIPSIS
+        [<function stderr_sink ...>, JsonLinesSink('timings.jsonl')]
+        >>> parse_sinks('')
+        []
+
+    """
+    sinks = []
+    for item in filter(None, map(str.strip, spec.split(','))):
+        name, _, arg = item.partition('=')
+        if name not in SINK_FACTORIES:
+            logging.warning('Sink de timing desconhecido: %s', name)
+            continue
+        sinks.append(SINK_FACTORIES[name](arg))
+    return sinks
+
+
+SINKS: Final[list[Sink]] = []
+"""Active sinks, timing is off while empty."""
+
+TRACE_MEMORY: bool = False
+
+CURRENT: Final[ContextVar[Timing | None]] = ContextVar('timing', default=None)
+"""Record of the call being measured, if any."""
+
+
+def configure(spec: str | None = None, *, memory: bool | None = None) -> None:
+    """Replace the active sinks, default from the environment.
+
+    Args:
+        spec: Comma separated sink names, default is `INCOLUME_TIMING`.
+        memory: Record the `tracemalloc` peak, default is
+            `INCOLUME_TIMING_MEMORY`.
+
+    """
+    global TRACE_MEMORY  # noqa: PLW0603
+    SINKS[:] = parse_sinks(getenv(TIMING_VAR, '') if spec is None else spec)
+    if memory is None:
+        memory = getenv(MEMORY_VAR, '').casefold() in {'1', 'true', 'on'}
+    TRACE_MEMORY = memory
+    debug.log('timing sinks: %s, memory: %s', SINKS, TRACE_MEMORY)
+
+
+def emit(timing: Timing) -> None:
+    """Send a timing to every active sink, a failing sink never fails."""
+    for sink in SINKS:
+        try:
+            sink(timing)
+        except Exception:  # noqa: BLE001, PERF203
+            logging.warning('Timing sink %r failed.', sink, exc_info=True)
+
+
+def annotate(**fields: int) -> None:
+    """Add facts to the call being measured, e.g. `files` or `scanned`.
+
+    Does nothing while timing is off.
+    """
+    if (timing := CURRENT.get()) is not None:
+        for name, value in fields.items():
+            setattr(timing, name, value)
+
+
+@contextmanager
+def measure(hook: str) -> Iterator[Timing]:
+    """Measure the block, then emit it to the active sinks.
+
+    The record is yielded so the block can fill in the outcome, e.g. its
+    exit `code`. It is emitted even when the block raises.
+    """
+    timing = Timing(hook, timestamp=time.time())
+    token = CURRENT.set(timing)
+    tracing = TRACE_MEMORY and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    elif TRACE_MEMORY:
+        tracemalloc.reset_peak()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield timing
+    finally:
+        timing.wall = time.perf_counter() - wall
+        timing.cpu = time.process_time() - cpu
+        if TRACE_MEMORY:
+            timing.peak = tracemalloc.get_traced_memory()[1]
+        if tracing:
+            tracemalloc.stop()
+        CURRENT.reset(token)
+        emit(timing)
+
+
+configure()
@@ -0,0 +1,192 @@
+"""Module to record spans as Chrome trace events, on demand.
+
+With `INCOLUME_TRACE=<file>`, every hook process appends its spans to the
+same file, so all hooks of a `git commit` show up in one timeline of
+`chrome://tracing` or https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+TRACE_VAR: Final[str] = 'INCOLUME_TRACE'
+EPOCH_OFFSET_NS: Final[int] = time.time_ns() - time.perf_counter_ns()
+IMPORTED_NS: Final[int] = time.perf_counter_ns()
+NULL_SPAN: Final[nullcontext] = nullcontext()
+
+TRACE_PATH: Path | None = None
+EVENTS: Final[list[dict[str, Any]]] = []
+_hooked = False
+
+
+def _micros(perf_ns: int) -> float:
+    """Convert a `perf_counter_ns` to epoch microseconds, for all processes."""
+    return (perf_ns + EPOCH_OFFSET_NS) / 1000
+
+
+def process_start_ns() -> int | None:
+    """Get when this process started, in `perf_counter_ns` terms.
+
+    Linux only, with the resolution of a clock tick; None elsewhere.
+    """
+    with contextlib.suppress(AttributeError, IndexError, OSError, ValueError):
+        stat = Path('/proc/self/stat').read_text(encoding='utf-8')
+        ticks = int(stat.rsplit(')', 1)[1].split()[19])
+        uptime = time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+        elapsed = uptime - ticks * 10**9 // os.sysconf('SC_CLK_TCK')
+        return time.perf_counter_ns() - elapsed
+    return None
+
+
+def add_event(
+    name: str,
+    cat: str,
+    start_ns: int,
+    end_ns: int,
+    tid: int | None = None,
+    **args: Any,  # noqa: ANN401
+) -> None:
+    """Buffer a complete event, `start_ns` and `end_ns` from perf_counter."""
+    EVENTS.append({
+        'name': name,
+        'cat': cat,
+        'ph': 'X',
+        'ts': _micros(start_ns),
+        'dur': (end_ns - start_ns) / 1000,
+        'pid': os.getpid(),
+        'tid': threading.get_ident() if tid is None else tid,
+        'args': args,
+    })
+
+
+@contextmanager
+def _span(
+    name: str,
+    cat: str,
+    tid: int | None,
+    args: dict[str, Any],
+) -> Iterator[None]:
+    """Record the block as a complete event."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        add_event(name, cat, start, time.perf_counter_ns(), tid, **args)
+
+
+def span(
+    name: str,
+    cat: str = 'hook',
+    *,
+    tid: int | None = None,
+    **args: Any,  # noqa: ANN401
+) -> contextlib.AbstractContextManager:
+    """Record a block as a span, e.g. a git call or reading a file.
+
+    Returns a shared no-op context while tracing is off.
+
+    Args:
+        name: Event name.
+        cat: Category: `hook`, `subprocess`, `io`, `output`...
+        tid: Track, default is the current thread. Concurrent spans of one
+            thread, e.g. asyncio tasks, need one track each.
+        args: Shown with the event in the trace viewer.
+
+    """
+    if TRACE_PATH is None:
+        return NULL_SPAN
+    return _span(name, cat, tid, args)
+
+
+def mark_hook_start() -> None:
+    """Record startup and imports, once, when the first hook begins.
+
+    `startup` runs from the process start, launchers like a pyenv shim
+    included, until this package began to import; `imports` from then
+    until the hook is called.
+    """
+    global _hooked  # noqa: PLW0603
+    if _hooked:
+        return
+    _hooked = True
+    now = time.perf_counter_ns()
+    if (started := process_start_ns()) is not None and started < IMPORTED_NS:
+        add_event('startup', 'startup', started, IMPORTED_NS)
+    add_event('imports', 'import', IMPORTED_NS, now)
+
+
+def traced(func: Callable, cat: str = 'hook') -> Callable:
+    """Wrap `func` in a span named after it, or return it while off.
+
+    Decided once, when wrapping, so an unset `INCOLUME_TRACE` costs
+    nothing per call.
+    """
+    if TRACE_PATH is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Wrapp function to trace it."""
+        if cat == 'hook':
+            mark_hook_start()
+        with _span(func.__name__, cat, None, {}):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def flush() -> None:
+    """Append the buffered events to the trace file in a single write.
+
+    The process that creates the file writes the opening `[` through the
+    same handle, in the same write as its events; the closing
+    one is optional in the trace-event format, so any number of processes
+    may append.
+    """
+    if TRACE_PATH is None or not EVENTS:
+        return
+    EVENTS.append({
+        'name': 'process_name',
+        'ph': 'M',
+        'pid': os.getpid(),
+        'args': {'name': Path(sys.argv[0]).name},
+    })
+    data = ''.join(
+        json.dumps(x, separators=(',', ':')) + ',\n' for x in EVENTS
+    )
+    EVENTS.clear()
+    TRACE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    flags = os.O_WRONLY | os.O_APPEND
+    try:
+        fd = os.open(TRACE_PATH, flags | os.O_CREAT | os.O_EXCL)
+        data = '[\n' + data
+    except FileExistsError:
+        fd = os.open(TRACE_PATH, flags)
+    try:
+        os.write(fd, data.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def configure(path: Path | str | None = None) -> None:
+    """Set the trace file, default is `INCOLUME_TRACE`; empty turns off."""
+    global TRACE_PATH  # noqa: PLW0603
+    path = os.getenv(TRACE_VAR) if path is None else path
+    TRACE_PATH = Path(path) if path else None
+
+
+configure()
+atexit.register(flush)
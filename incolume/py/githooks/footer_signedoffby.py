@@ -1,87 +1,388 @@
 """Module trailers hook."""
 
-# ruff: noqa: S404 S607
 from __future__ import annotations
 
+import contextlib
 import re
-import shutil
-import subprocess
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
 
 from incolume.py.githooks.core import get_signed_off_by
+from incolume.py.githooks.core.pipeline import (
+    AtomicFile,
+    MessagePipeline,
+    backup_path,
+)
+from incolume.py.githooks.core.rules import Backup
+from incolume.py.githooks.core.tracing import span
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
     from pathlib import Path
 
+    from incolume.py.githooks.core import GitContext
 
-def clean_commit_msg(path: Path) -> bool:
-    """Remove linhas do arquivo de commit.
+COMMENT_CHAR: Final[str] = '#'
+SEPARATORS: Final[str] = ':'
+ARG_SEPARATORS: Final[str] = ':='
+WHITESPACE: Final[str] = ' \t\n\v\f\r'
+CUT_LINE: Final[str] = (
+    f'{COMMENT_CHAR} ------------------------ >8 ------------------------\n'
+)
+HELP_PREFIX: Final[str] = 'Please enter the commit message'
+GIT_GENERATED_PREFIXES: Final[tuple[str, ...]] = (
+    'Signed-off-by: ',
+    '(cherry picked from commit ',
+)
+
+
+@dataclass
+class CommitHelpScanner:
+    r"""Remove o texto de ajuda do template de commit, linha a linha.
 
     Entre:
 
     - A linha que começa com 'Please enter the commit message'
     - Até a linha contendo apenas '#'
 
-    Cria um backup `.bak` antes de sobrescrever.
+    Examples:
+        >>> scanner = CommitHelpScanner()
+        >>> list(scanner(['x\n', 'Please enter the commit message\n', '#\n']))
+        ['x\n']
+        >>> scanner.removed
+        2
+
+    """
+
+    skipping: bool = False
+    removed: int = 0
+
+    def __call__(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield the lines to keep, consuming `lines` lazily."""
+        for line in lines:
+            if self.skipping:
+                self.skipping = line.strip() != COMMENT_CHAR
+            elif line.lstrip().startswith(HELP_PREFIX):
+                self.skipping = True
+            else:
+                yield line
+                continue
+            self.removed += 1
+
+
+def strip_commit_help(message: str) -> str:
+    """Remove o texto de ajuda do template de commit.
+
+    Args:
+        message: Mensagem de commit.
+
+    Returns:
+        str: Mensagem sem o texto de ajuda.
+
+    """
+    return ''.join(CommitHelpScanner()(message.splitlines(keepends=True)))
+
+
+def _tee(lines: Iterable[str], copy: AtomicFile) -> Iterator[str]:
+    """Yield `lines`, writing each one to `copy` too."""
+    for line in lines:
+        copy.write(line)
+        yield line
+
+
+def clean_commit_msg(path: Path, backup: Backup = Backup.LINK) -> bool:
+    """Remove o texto de ajuda do arquivo de commit.
+
+    O arquivo é lido e gravado linha a linha, em uma única passagem e com
+    memória constante. Se houver alteração, o conteúdo anterior é mantido
+    em `.bak`: por link (sem cópia) ou copiado na mesma passagem.
 
     Args:
         path (Path): Caminho para o arquivo de mensagem de commit.
+        backup (Backup): Modo do backup `.bak`.
 
     Returns:
         True, se o arquivo foi modificado; caso contrário, False.
 
     """
-    backup: Path = path.with_suffix(path.suffix + '.bak')
-    shutil.copy(path, backup)
+    scanner = CommitHelpScanner()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(span('rewrite', 'io', path=str(path)))
+        lines = stack.enter_context(path.open(encoding='utf-8', newline=''))
+        target = stack.enter_context(
+            AtomicFile(path, Backup.NONE if backup is Backup.COPY else backup)
+        )
+        writers = [target]
+        if backup is Backup.COPY:
+            writers.append(stack.enter_context(AtomicFile(backup_path(path))))
+            lines = _tee(lines, writers[-1])
+        target.writelines(scanner(lines))
+        if not scanner.removed:
+            for writer in writers:
+                writer.discard()
+    return bool(scanner.removed)
+
+
+def _next_line(buf: str, pos: int) -> int:
+    """Get the position of the line after `pos`."""
+    idx = buf.find('\n', pos)
+    return len(buf) if idx < 0 else idx + 1
+
+
+def _last_line(buf: str, length: int) -> int:
+    """Get the start of the last line in `buf[:length]`, or -1 if empty."""
+    if length <= 1:
+        return length - 1
+    return buf.rfind('\n', 0, length - 1) + 1
 
-    result: list[str] = []
-    skipping: bool = False
-    changed: bool = False
 
-    for line in path.read_text(encoding='utf-8').splitlines(keepends=True):
-        if not skipping and line.lstrip().startswith(
-            'Please enter the commit message'
+def _is_blank_line(buf: str, pos: int) -> bool:
+    """Check if the line starting at `pos` has only whitespaces."""
+    return not buf[pos : _next_line(buf, pos)].strip(WHITESPACE)
+
+
+def _find_separator(line: str, separators: str = SEPARATORS) -> int:
+    """Get the separator position of `token: value`, or -1 if not a trailer."""
+    whitespace_found = False
+    for idx, char in enumerate(line):
+        if char in separators:
+            return idx
+        if not whitespace_found and (
+            (char.isascii() and char.isalnum()) or char == '-'
         ):
-            skipping = True
-            changed = True
             continue
-        if skipping and line.strip() == '#':
-            skipping = False
+        if idx and char in {' ', '\t'}:
+            whitespace_found = True
             continue
-        if not skipping:
-            result.append(line)
+        break
+    return -1
+
+
+def _ignored_bytes(buf: str, length: int) -> int:
+    """Count trailing comments, blank lines and scissors in `buf[:length]`."""
+    cutoff = length
+    if buf.startswith(CUT_LINE):
+        cutoff = 0
+    elif (idx := buf.find(f'\n{CUT_LINE}', 0, length)) >= 0:
+        cutoff = idx + 1
+
+    boc = bol = 0
+    in_conflicts = False
+    while bol < cutoff:
+        if buf.startswith((COMMENT_CHAR, '\n'), bol):
+            boc = boc or bol
+        elif buf.startswith('Conflicts:\n', bol):
+            in_conflicts = True
+            boc = boc or bol
+        elif not (in_conflicts and buf.startswith('\t', bol)):
+            boc = 0
+            in_conflicts = False
+        bol = min(_next_line(buf, bol), cutoff)
+    return length - boc if boc else length - cutoff
 
-    if changed:
-        path.write_text(''.join(result), encoding='utf-8')
-    return changed
 
+def find_end_of_log_message(message: str) -> int:
+    """Get the end of the log message, as `git interpret-trailers` does.
 
-def add_signed_off_by(path: Path, sob: str | None = None) -> None:
+    The patch part (a `---` line and below), the scissors line and below,
+    and trailing comments or blank lines are not part of it.
+    """
+    end = len(message)
+    bol = 0
+    while bol < len(message):
+        if (
+            message.startswith('---', bol)
+            and (message[bol + 3 : bol + 4] or '\0') in WHITESPACE
+        ):
+            end = bol
+            break
+        bol = _next_line(message, bol)
+    return end - _ignored_bytes(message, end)
+
+
+def _find_end_of_title(message: str, length: int) -> int:
+    """Get the end of the first paragraph, which can not be trailers."""
+    bol = 0
+    while bol < length:
+        if not message.startswith(COMMENT_CHAR, bol) and _is_blank_line(
+            message, bol
+        ):
+            break
+        bol = _next_line(message, bol)
+    return bol
+
+
+def find_trailer_block_start(message: str, length: int) -> int:
+    """Get the start of the trailer block, or `length` if there is none.
+
+    The trailer block is the last paragraph, not being the title, made
+    only of trailers, or with at least one git generated trailer and at
+    least 25% of trailers.
+    """
+    end_of_title = _find_end_of_title(message, length)
+    only_spaces, recognized_prefix = True, False
+    trailer_lines = non_trailer_lines = continuation_lines = 0
+
+    bol = _last_line(message, length)
+    while bol >= end_of_title:
+        line = message[bol : _next_line(message, bol)]
+        if line.startswith(COMMENT_CHAR):
+            non_trailer_lines += continuation_lines
+            continuation_lines = 0
+        elif _is_blank_line(message, bol):
+            if not only_spaces:
+                non_trailer_lines += continuation_lines
+                if (
+                    recognized_prefix
+                    and trailer_lines * 3 >= non_trailer_lines
+                ) or (trailer_lines and not non_trailer_lines):
+                    return bol + len(line)
+                return length
+        else:
+            only_spaces = False
+            if line.startswith(GIT_GENERATED_PREFIXES):
+                trailer_lines += 1
+                continuation_lines = 0
+                recognized_prefix = True
+            elif _find_separator(line) >= 1 and line[0] not in WHITESPACE:
+                trailer_lines += 1
+                continuation_lines = 0
+            elif line[0] in WHITESPACE:
+                continuation_lines += 1
+            else:
+                non_trailer_lines += 1 + continuation_lines
+                continuation_lines = 0
+        bol = _last_line(message, bol)
+    return length
+
+
+def parse_trailer(
+    line: str, separators: str = SEPARATORS
+) -> tuple[str | None, str]:
+    """Split a trailer line into token and value.
+
+    Returns:
+        tuple[str | None, str]: Token (None for non trailer lines) and value.
+
+    """
+    pos = _find_separator(line, separators)
+    if pos < 1:
+        return None, line.removesuffix('\n')
+    return line[:pos].strip(WHITESPACE), line[pos + 1 :].strip(WHITESPACE)
+
+
+def _same_token(token: str | None, other: str) -> bool:
+    """Compare tokens case insensitively up to the shortest one."""
+    if token is None:
+        return False
+    size = min(len(token), len(other))
+    return token[:size].casefold() == other[:size].casefold()
+
+
+def interpret_trailers(message: str, *trailers: str) -> str:
+    r"""Add trailers to a commit message natively.
+
+    Follows `git interpret-trailers --if-exists addIfDifferent`: the trailer
+    block is detected with git rules, and a trailer is appended to its end
+    unless an identical one (same token and value) is already there.
+
+    Args:
+        message: The commit message.
+        trailers: Trailers to add, e.g. `Signed-off-by: Name <email>`.
+
+    Returns:
+        str: The message with trailers.
+
+    Examples:
+        >>> interpret_trailers('feat: #1 x\n', 'Signed-off-by: A <a@b>')
+        'feat: #1 x\n\nSigned-off-by: A <a@b>\n'
+
+    """
+    end = find_end_of_log_message(message)
+    start = find_trailer_block_start(message, end)
+
+    items: list[tuple[str | None, str]] = []
+    lines: list[str] = []
+    for line in message[start:end].splitlines(keepends=True):
+        if lines and line[0] in WHITESPACE and _find_separator(lines[-1]) >= 1:
+            lines[-1] += line
+        else:
+            lines.append(line)
+    items.extend(
+        parse_trailer(line)
+        for line in lines
+        if not line.startswith(COMMENT_CHAR)
+    )
+
+    for trailer in trailers:
+        token, value = parse_trailer(trailer, ARG_SEPARATORS)
+        if token is None:
+            token, value = value, ''
+        if not any(
+            _same_token(tok, token) and val.casefold() == value.casefold()
+            for tok, val in items
+        ):
+            items.append((token, value))
+
+    blank_line = _last_line(message, start) >= 0 and _is_blank_line(
+        message, _last_line(message, start)
+    )
+    block = ''.join(
+        f'{value}\n' if token is None else f'{token}{SEPARATORS[0]} {value}\n'
+        for token, value in items
+    )
+    return ''.join((
+        message[:start],
+        '' if blank_line else '\n',
+        block,
+        message[end:],
+    ))
+
+
+def signing_off(sob: str) -> Callable[[str], str]:
+    """Transformação que adiciona o trailer `sob` à mensagem."""
+    return lambda message: interpret_trailers(message, sob)
+
+
+def add_signed_off_by(
+    path: Path, sob: str | None = None, context: GitContext | None = None
+) -> None:
     """Adiciona a linha 'Signed-off-by' ao arquivo de commit.
 
-    Usa `git interpret-trailers` para inserir o trailer corretamente.
+    Usa `interpret_trailers` para inserir o trailer corretamente, com as
+    mesmas regras do `git interpret-trailers --if-exists addIfDifferent`,
+    sem executar o git.
 
     Args:
         path (Path): Caminho para o arquivo de mensagem de commit.
         sob (Optional[str]): Linha de assinatura customizada. Se não informado,
                              será gerada com `get_signed_off_by()`.
+        context (Optional[GitContext]): Contexto git compartilhado.
 
     Returns:
         None
 
     """
-    sob = sob or get_signed_off_by()
-    subprocess.run(  # noqa: S603
-        [
-            'git',
-            'interpret-trailers',
-            '--in-place',
-            '--trailer',
-            sob,
-            path.as_posix(),
-        ],
-        check=True,
-    )
+    sob = sob or get_signed_off_by(context)
+    MessagePipeline(path, [signing_off(sob)]).run()
+
+
+def prepend_blank_line(message: str, commit_source: str = '') -> str:
+    r"""Insere uma linha em branco no topo da mensagem.
+
+    caso `commit_source` seja vazio e a mensagem seja uma única linha que
+    não começa em branco.
+
+    Examples:
+        >>> prepend_blank_line('blue')
+        '\nblue'
+        >>> prepend_blank_line('blue', 'message')
+        'blue'
+
+    """
+    if not commit_source and re.fullmatch(r'[^\n].+', message):
+        return f'\n{message}'
+    return message
 
 
 def add_blank_line_if_needed(path: Path, commit_source: str = '') -> None:
@@ -100,7 +401,4 @@ def add_blank_line_if_needed(path: Path, commit_source: str = '') -> None:
     """
     if commit_source:
         return
-
-    content: str = path.read_text(encoding='utf-8')
-    if re.fullmatch(r'[^\n].+', content):
-        path.write_text(f'\n{content}', encoding='utf-8')
+    MessagePipeline(path, [prepend_blank_line]).run()
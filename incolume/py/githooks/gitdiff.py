@@ -2,28 +2,85 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections import Counter
+from functools import partial
+from itertools import islice
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Final
 
 from incolume.py.githooks.core import debug_enable
+from incolume.py.githooks.core.pipeline import MessagePipeline
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
 
+    from incolume.py.githooks.core.staged import StagedChange
+
 debug_enable()
 
+TOP_PATHS: Final[int] = 10
 
-def insert_git_diff(commit_msg_file: Path, diff_output: str) -> None:
-    """Insere a saída do git diff.
 
-    na primeira linha que começa com '#'
-    dentro do arquivo de mensagem de commit.
+def summarize_git_diff(
+    changes: Iterable[StagedChange], top: int = TOP_PATHS
+) -> str:
+    r"""Resume as alterações preparadas em uma saída de tamanho limitado.
+
+    As alterações são consumidas em fluxo: apenas as contagens por
+    diretório e os primeiros `top` caminhos são mantidos em memória.
+
+    Args:
+        changes: Alterações preparadas, e.g. `iter_staged_changes()`.
+        top: Quantidade máxima de diretórios e de caminhos listados.
+
+    Returns:
+        str: Resumo com contagens por diretório e os primeiros caminhos.
+
+    Examples:
+        >>> from incolume.py.githooks.core.staged import StagedChange
+        >>> summarize_git_diff(
+        ...     [StagedChange('M', 'a/x.py'), StagedChange('A', 'a/y.py'),
+        ...      StagedChange('D', 'README.md')], top=1
+        ... ).splitlines()  # doctest: +NORMALIZE_WHITESPACE
+        ['3 arquivos alterados em 2 diretórios', '2\ta/',
+         '... mais 1 diretórios', 'M\ta/x.py', '... mais 2 arquivos']
+
     """
-    if not diff_output:
-        return  # nada a inserir
+    directories: Counter[str] = Counter()
+    paths: list[str] = []
+    total = 0
+    for change in changes:
+        total += 1
+        directories[PurePosixPath(change.path).parent.as_posix()] += 1
+        if len(paths) < top:
+            paths.append(str(change))
+
+    if not total:
+        return ''
 
-    lines = commit_msg_file.read_text(encoding='utf-8').splitlines(
-        keepends=True
+    lines = [f'{total} arquivos alterados em {len(directories)} diretórios']
+    lines.extend(
+        f'{count}\t{name}/'
+        for name, count in islice(directories.most_common(), top)
     )
+    if len(directories) > top:
+        lines.append(f'... mais {len(directories) - top} diretórios')
+    lines.extend(paths)
+    if total > len(paths):
+        lines.append(f'... mais {total - len(paths)} arquivos')
+    return '\n'.join(lines)
+
+
+def insert_diff(message: str, diff_output: str) -> str:
+    """Insere a saída do git diff na mensagem.
+
+    na primeira linha que começa com '#'.
+    """
+    if not diff_output:
+        return message  # nada a inserir
+
+    lines = message.splitlines(keepends=True)
     result = []
 
     for idx, line in enumerate(lines):
@@ -36,5 +93,17 @@ def insert_git_diff(commit_msg_file: Path, diff_output: str) -> None:
     else:
         # caso não exista linha começando com "#"
         result.extend(lines)
+    return ''.join(result)
+
+
+def insert_git_diff(commit_msg_file: Path, diff_output: str) -> None:
+    """Insere a saída do git diff.
 
-    commit_msg_file.write_text(''.join(result), encoding='utf-8')
+    na primeira linha que começa com '#'
+    dentro do arquivo de mensagem de commit.
+    """
+    if not diff_output:
+        return  # nada a inserir
+    MessagePipeline(
+        commit_msg_file, [partial(insert_diff, diff_output=diff_output)]
+    ).run()
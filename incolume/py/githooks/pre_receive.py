@@ -0,0 +1,184 @@
+"""Module to enforce the hook rules server-side, on pre-receive."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from incolume.py.githooks.core import GitContext, debug, debug_enable
+from incolume.py.githooks.core.catfile import (
+    MAX_BLOB_SIZE,
+    OMITTED,
+    blob_paths,
+    iter_blob_chunks,
+    iter_blobs,
+)
+from incolume.py.githooks.core.rules import Result, Status
+from incolume.py.githooks.detect_private_key import (
+    contains_private_key,
+    scan_chunks,
+)
+from incolume.py.githooks.prepare_commit_msg import validate_commit_range
+from incolume.py.githooks.validate_branchname import (
+    PROTECTED,
+    ValidateBranchname,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from incolume.py.githooks.prepare_commit_msg import MessageCheck
+
+debug_enable()
+
+BRANCH_PREFIX: Final[str] = 'refs/heads/'
+NEW_OBJECTS: Final[tuple[str, ...]] = ('--not', '--all')
+NO_MERGES: Final[tuple[str, ...]] = ('--no-merges',)
+
+
+class RefUpdate(NamedTuple):
+    """Ref update as given to pre-receive: `<old> <new> <ref>`."""
+
+    old: str
+    new: str
+    ref: str
+
+    @property
+    def created(self) -> bool:
+        """Ref did not exist before the push."""
+        return not self.old.strip('0')
+
+    @property
+    def deleted(self) -> bool:
+        """Ref is removed by the push."""
+        return not self.new.strip('0')
+
+    @property
+    def branchname(self) -> str | None:
+        """Branch name, or None when the ref is not a branch."""
+        if self.ref.startswith(BRANCH_PREFIX):
+            return self.ref.removeprefix(BRANCH_PREFIX)
+        return None
+
+
+def parse_ref_updates(lines: Iterable[str]) -> Iterator[RefUpdate]:
+    """Parse pre-receive stdin.
+
+    Examples:
+        >>> line = f'{"0" * 40} {"a" * 40} refs/heads/x'
+        >>> [u.branchname for u in parse_ref_updates([line])]
+        ['x']
+
+    """
+    for line in lines:
+        if line.strip():
+            yield RefUpdate(*line.split(maxsplit=2))
+
+
+def check_ref_names(updates: Iterable[RefUpdate]) -> Result:
+    """Validate names of branches created by the push.
+
+    Protected branches are legitimate targets server-side, and existing
+    branches were already accepted when created.
+    """
+    result = Result()
+    validator = ValidateBranchname(context=GitContext())
+    for update in updates:
+        name = update.branchname
+        if not update.created or name is None or name in PROTECTED:
+            continue
+        outcome = validator.validate(name, protected_main=False)
+        if outcome.code is Status.FAILURE:
+            result.code |= Status.FAILURE
+            result.message += (
+                f'\nRejected branch name: {update.ref}{outcome.message}'
+            )
+    return result
+
+
+def check_new_commits(
+    revisions: Iterable[str],
+    checks: Mapping[str, MessageCheck] | None = None,
+    *,
+    merges: bool = False,
+) -> Result:
+    """Validate messages of all commits new to the repository at once.
+
+    Merge commits, whose messages git writes, are left out unless `merges`.
+    """
+    result = Result()
+    options = () if merges else NO_MERGES
+    for oid, outcome in validate_commit_range(
+        *options, *revisions, *NEW_OBJECTS, checks=checks
+    ):
+        debug.log('%s: %s', oid, outcome.code)
+        if outcome.code is Status.FAILURE:
+            result.code |= Status.FAILURE
+            result.message += f'\n{outcome.message}'
+    return result
+
+
+def check_new_blobs(
+    revisions: Iterable[str], max_size: int = MAX_BLOB_SIZE
+) -> Result:
+    """Scan blobs new to the repository for private keys.
+
+    Blobs over `max_size` are streamed by chunks rather than skipped.
+    """
+    result = Result()
+    args = (*revisions, *NEW_OBJECTS)
+    large = []
+    for blob in iter_blobs(*args, max_size=max_size):
+        if blob.type == OMITTED:
+            found, _ = scan_chunks(iter_blob_chunks(blob.oid, max_size))
+            if found:
+                large.append(blob.oid)
+        elif contains_private_key(blob.data):
+            result.code |= Status.FAILURE
+            result.message += (
+                f'\nPrivate key found: {blob.path or blob.oid} ({blob.oid})'
+            )
+    if large:
+        paths = blob_paths(large, *args)
+        result.code |= Status.FAILURE
+        for oid in large:
+            result.message += (
+                f'\nPrivate key found: {paths.get(oid, oid)} ({oid})'
+            )
+    return result
+
+
+def pre_receive(
+    lines: Iterable[str],
+    checks: Mapping[str, MessageCheck] | None = None,
+    max_size: int = MAX_BLOB_SIZE,
+    *,
+    merges: bool = False,
+) -> Result:
+    """Enforce branch name, commit message and private key rules on a push.
+
+    Meant for bare repositories: objects are read from git, never from a
+    working tree. All refs of a push share one `git log` and one
+    `git rev-list | git cat-file --batch` pipeline, so the number of
+    processes does not grow with the number of refs or commits.
+
+    Args:
+        lines: Lines `<old> <new> <ref>` read from stdin.
+        checks: Commit message validators, default is `message_checks()`.
+        max_size: Largest blob read at once, larger ones by chunks.
+        merges: Validate messages of merge commits too.
+
+    Returns:
+        Result: Combined result, the push is rejected on failure.
+
+    """
+    updates = list(parse_ref_updates(lines))
+    revisions = [u.new for u in updates if not u.deleted]
+    result = check_ref_names(updates)
+    if revisions:
+        for outcome in (
+            check_new_commits(revisions, checks, merges=merges),
+            check_new_blobs(revisions, max_size),
+        ):
+            result.code |= outcome.code
+            result.message += outcome.message
+    return result
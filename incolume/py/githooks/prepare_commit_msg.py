@@ -1,21 +1,28 @@
 """Module for validate commit message."""
 
-# ruff: noqa: E501
+# ruff: noqa: E501 S404 S607
 from __future__ import annotations
 
 import logging
-import re
+import subprocess
+from collections.abc import Callable
+from functools import partial
+from os import getenv
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from icecream import ic
+from rich.markup import RE_TAGS, escape
 
-from incolume.py.githooks.core import debug_enable, get_branchname
-from incolume.py.githooks.core.rules import (
-    RULE_COMMITFORMAT,
-    Result,
-    Status,
-    TypeCommit,
-)
+from incolume.py.githooks.core import debug, debug_enable, get_git_context
+from incolume.py.githooks.core.gitlog import iter_commit_messages
+from incolume.py.githooks.core.registry import RULES
+from incolume.py.githooks.core.rules import Result, Status
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from incolume.py.githooks.core import GitContext
 
 debug_enable()
 
@@ -47,6 +54,19 @@ MESSAGERROR = """[red]
     [yellow] >>> More details on docs/user_guide/CONVENTIONAL_COMMITS.md or https://www.conventionalcommits.org/pt-br/v1.0.0/[/yellow]
     [/red]"""
 
+MessageCheck = Callable[[str], Result]
+"""Validator of a commit message text."""
+
+
+def validate_format_message(message: str) -> Result:
+    """Validate the text of a commit message according to current rules."""
+    result = Result(Status.SUCCESS, MESSAGESUCCESS)
+    content = message.strip()
+    debug.log('message: %s', content)
+    if not RULES.match('commit_format', content):
+        result = Result(Status.FAILURE, MESSAGERROR)
+    return result
+
 
 def validate_format_commit_msg(msgfile: Path | str = '') -> Result:
     """Validate the text of commit message according to current rules.
@@ -55,33 +75,23 @@ def validate_format_commit_msg(msgfile: Path | str = '') -> Result:
       - prepare_commit_msg
     """
     msgfile = Path(msgfile)
-    result = Result(Status.SUCCESS, MESSAGESUCCESS)
-    regex = re.compile(RULE_COMMITFORMAT, flags=re.IGNORECASE)
-    logging.debug('%s', regex.pattern)
+    logging.debug('%s', RULES['commit_format'].pattern)
 
     try:
-        with msgfile.open('rb') as f:
-            content = f.read().strip().decode()
-            logging.debug('%s', ic(content))
-
-        if not regex.match(content):
-            raise AssertionError  # noqa: TRY301
-    except (AssertionError, FileNotFoundError, FileExistsError):
-        result = Result(Status.FAILURE, MESSAGERROR)
+        with span('read', 'io', path=str(msgfile)), msgfile.open('rb') as f:
+            content = f.read().decode()
+    except (FileNotFoundError, FileExistsError):
+        return Result(Status.FAILURE, MESSAGERROR)
 
-    return result
+    return validate_format_message(content)
 
 
-def check_type_commit_msg(commit_msg_filepath: Path | str = '') -> Result:
-    """Check type commit messagem."""
-    regex = re.compile(rf'^({"|".join(TypeCommit.to_set())})(\([\w\W\s]+\))?:')
-    commit_msg_filepath = Path(commit_msg_filepath)
+def check_type_message(message: str) -> Result:
+    """Check type of a commit message."""
     result = Result(Status.SUCCESS, MESSAGESUCCESS)
-    with Path(commit_msg_filepath).open('rb') as f:
-        commit_message = f.read().decode().strip()
 
     # Example validation: Ensure message starts with a type (e.g., feat, fix, chore)
-    if not regex.match(commit_message):
+    if not RULES.match('type_commit', message.strip()):
         result = Result(
             code=Status.FAILURE,
             message='Error: Commit message must start with a type (e.g., feat:, fix:).',
@@ -89,25 +99,25 @@ def check_type_commit_msg(commit_msg_filepath: Path | str = '') -> Result:
     return result
 
 
-def check_min_len_first_line_commit_msg(
-    commit_msg_filepath: Path | str, len_line: int = 10
-) -> Result:
-    """Check len of first line from commit message.
+def check_type_commit_msg(commit_msg_filepath: Path | str = '') -> Result:
+    """Check type commit messagem."""
+    with (
+        span('read', 'io', path=str(commit_msg_filepath)),
+        Path(commit_msg_filepath).open('rb') as f,
+    ):
+        content = f.read().decode()
+    return check_type_message(content)
 
-    Returns:
-        bool:
 
-    """
-    commit_msg_filepath = Path(commit_msg_filepath)
+def check_min_len_first_line(message: str, len_line: int = 10) -> Result:
+    """Check minimum length of the first line of a commit message."""
     len_line = min(10, len_line)
     result = Result(
         Status.SUCCESS,
         '[green]Commit minimum length for message is validated [OK][/green]',
     )
 
-    commit_message = commit_msg_filepath.read_text(encoding='utf-8').strip()
-
-    # Example validation: Check subject line length (e.g., 50 character limit)
+    commit_message = message.strip()
     first_line = commit_message.split('\n')[0]
     if len(first_line) < len_line:
         result.code = Status.FAILURE
@@ -115,8 +125,8 @@ def check_min_len_first_line_commit_msg(
     return result
 
 
-def check_max_len_first_line_commit_msg(
-    commit_msg_filepath: Path | str, len_line: int = 50
+def check_min_len_first_line_commit_msg(
+    commit_msg_filepath: Path | str, len_line: int = 10
 ) -> Result:
     """Check len of first line from commit message.
 
@@ -124,40 +134,156 @@ def check_max_len_first_line_commit_msg(
         bool:
 
     """
-    commit_msg_filepath = Path(commit_msg_filepath)
+    with span('read', 'io', path=str(commit_msg_filepath)):
+        message = Path(commit_msg_filepath).read_text(encoding='utf-8')
+    return check_min_len_first_line(message, len_line)
+
+
+def check_max_len_first_line(message: str, len_line: int = 50) -> Result:
+    """Check maximum length of the first line of a commit message."""
     len_line = min(50, len_line)
     result = Result(
         Status.SUCCESS,
         '[green]Commit maximum length for message is validated [OK][/green]',
     )
 
-    commit_message = commit_msg_filepath.read_text(encoding='utf-8').strip()
-
     # Example validation: Check subject line length (e.g., 50 character limit)
-    first_line = commit_message.split('\n')[0]
+    first_line = message.strip().split('\n')[0]
     if len(first_line) > len_line:
         result.code = Status.FAILURE
         result.message = f'Error: Commit subject line exceeds {len_line} characters ({len(first_line)}).'
     return result
 
 
-def prefixing_commit_msg(commit_msg_filepath: Path | str) -> Result:
+def check_max_len_first_line_commit_msg(
+    commit_msg_filepath: Path | str, len_line: int = 50
+) -> Result:
+    """Check len of first line from commit message.
+
+    Returns:
+        bool:
+
+    """
+    with span('read', 'io', path=str(commit_msg_filepath)):
+        message = Path(commit_msg_filepath).read_text(encoding='utf-8')
+    return check_max_len_first_line(message, len_line)
+
+
+def message_checks(
+    min_len: int = 10, max_len: int = 50
+) -> dict[str, MessageCheck]:
+    """Build the validators applied to each commit of a range, by name."""
+    return {
+        'format': validate_format_message,
+        'type': check_type_message,
+        'min-len': partial(check_min_len_first_line, len_line=min_len),
+        'max-len': partial(check_max_len_first_line, len_line=max_len),
+    }
+
+
+def has_upstream() -> bool:
+    """Check if the current branch tracks an upstream branch."""
+    with span('git rev-parse', 'subprocess'):
+        return not subprocess.run(
+            ['git', 'rev-parse', '--verify', '--quiet', '@{upstream}'],
+            capture_output=True,
+            check=False,
+        ).returncode
+
+
+def default_commit_range() -> tuple[str, ...]:
+    """Range pushed, as given by pre-commit, or the unpushed commits.
+
+    Without upstream, e.g. on a new local branch, the unpushed commits are
+    those not on any remote-tracking branch.
+    """
+    from_ref = getenv('PRE_COMMIT_FROM_REF')
+    to_ref = getenv('PRE_COMMIT_TO_REF')
+    if from_ref and to_ref:
+        return (f'{from_ref}..{to_ref}',)
+    if has_upstream():
+        return ('@{upstream}..HEAD',)
+    return ('HEAD', '--not', '--remotes')
+
+
+def _summary(message: str) -> str:
+    """First non-blank line of a commit message."""
+    return next(
+        (line.strip() for line in message.splitlines() if line.strip()), ''
+    )
+
+
+def _reason(message: str) -> str:
+    r"""First line of a result message with text, its markup removed.
+
+    Examples:
+        >>> _reason('[red]\n  Your commit was [bold]rejected[/bold]...\n[/red]')
+        'Your commit was rejected...'
+
+    """
+    return _summary(RE_TAGS.sub('', message))
+
+
+def validate_commit_range(
+    *args: str, checks: Mapping[str, MessageCheck] | None = None
+) -> Iterator[tuple[str, Result]]:
+    """Validate every commit message of a range in a single process.
+
+    Messages are streamed from one `git log`, so no temporary files or
+    extra processes are needed per commit.
+
+    Args:
+        args: Revision range and other `git log` arguments.
+        checks: Validators by name, default is `message_checks()`.
+
+    Yields:
+        tuple[str, Result]: Commit id and its combined result.
+
+    Raises:
+        RuntimeError: Se a execução do comando git falhar.
+
+    """
+    checks = message_checks() if checks is None else checks
+    for oid, message in iter_commit_messages(*args):
+        result = Result()
+        reasons = []
+        for name, check in checks.items():
+            outcome = check(message)
+            if outcome.code is Status.FAILURE:
+                result.code |= outcome.code
+                reason = escape(_reason(outcome.message))
+                reasons.append(f'    - {name}: {reason}')
+        subject = escape(_summary(message))
+        label = '[red][FAIL][/red]' if reasons else '[green][OK][/green]'
+        result.message = '\n'.join([f'{label} {oid[:12]} {subject}', *reasons])
+        yield oid, result
+
+
+def prefixing_commit_msg(
+    commit_msg_filepath: Path | str, context: GitContext | None = None
+) -> Result:
     """Automatically prefixing git commit messages.
 
     Explanation:
       This will match branch names like, this `feature/ISSUE-123` or `hotfix/ISSUE-1234`
       and prefixing `[ISSUE-123]` on message git commit, except in master, main, dev or tags.
 
+    Args:
+      commit_msg_filepath: Commit message file.
+      context: Shared git context, default is the process-scoped one.
+
     """
     commit_msg_filepath = Path(commit_msg_filepath)
     result = Result()
 
-    branch = get_branchname()
+    branch = (context or get_git_context()).branchname
 
-    regex = r'(feature|hotfix)\/(\w+-\d+)'
-    if re.match(regex, branch):
-        issue = re.match(regex, branch).group(2)
-        with commit_msg_filepath.open('r+', encoding='utf-8') as fh:
+    if match := RULES.match('branchname_issue', branch):
+        issue = match.group(2)
+        with (
+            span('rewrite', 'io', path=str(commit_msg_filepath)),
+            commit_msg_filepath.open('r+', encoding='utf-8') as fh,
+        ):
             commit_msg = fh.read()
             fh.seek(0, 0)
             fh.write(f'[{issue}] {commit_msg}')
@@ -0,0 +1,155 @@
+"""Module to report hook latency from the local timing history."""
+
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Final
+
+from rich.table import Table
+
+from incolume.py.githooks.core import debug, debug_enable
+from incolume.py.githooks.core.timing import Timing
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+debug_enable()
+
+RECENT: Final[int] = 20
+THRESHOLD: Final[float] = 1.5
+MIN_BASELINE: Final[int] = 5
+TIMING_FIELDS: Final[frozenset[str]] = frozenset(
+    x.name for x in fields(Timing)
+)
+
+
+def read_history(path: Path) -> Iterator[Timing]:
+    """Read timings in the order they were recorded.
+
+    Lines that cannot be parsed, e.g. cut by a crash, are skipped.
+    """
+    try:
+        file = path.open(encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        for line in file:
+            try:
+                record = json.loads(line)
+                yield Timing(**{
+                    k: v for k, v in record.items() if k in TIMING_FIELDS
+                })
+            except (AttributeError, TypeError, ValueError):  # noqa: PERF203
+                debug.log('skipped: %s', line)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentile of sorted values, linearly interpolated.
+
+    Examples:
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 50)
+        2.5
+        >>> percentile([0.0, 4.0], 95)
+        3.8
+        >>> percentile([7.0], 95)
+        7.0
+
+    """
+    rank = (len(values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+@dataclass
+class HookStats:
+    """Latency of one hook, in seconds."""
+
+    hook: str
+    calls: int
+    failures: int
+    p50: float
+    p95: float
+    slowest: float
+    baseline: float | None = None
+    recent: float | None = None
+    threshold: float = THRESHOLD
+
+    @property
+    def regression(self) -> bool:
+        """Recent median is over `threshold` times the baseline one."""
+        return (
+            self.baseline is not None
+            and self.recent is not None
+            and self.recent > self.baseline * self.threshold
+        )
+
+
+def hook_stats(
+    timings: Iterable[Timing],
+    recent: int = RECENT,
+    threshold: float = THRESHOLD,
+) -> list[HookStats]:
+    """Summarize timings per hook, slowest median first.
+
+    The last `recent` calls of a hook are compared with the older ones,
+    given at least `MIN_BASELINE` of them.
+
+    Args:
+        timings: Timings in the order they were recorded.
+        recent: Number of newest calls compared with the baseline.
+        threshold: Ratio of the medians flagged as a regression.
+
+    Returns:
+        list[HookStats]: One entry per hook.
+
+    """
+    walls: dict[str, list[float]] = defaultdict(list)
+    failures: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        walls[timing.hook].append(timing.wall)
+        failures[timing.hook] += bool(timing.code)
+
+    stats = []
+    for hook, history in walls.items():
+        ordered = sorted(history)
+        item = HookStats(
+            hook,
+            len(history),
+            failures[hook],
+            percentile(ordered, 50),
+            percentile(ordered, 95),
+            ordered[-1],
+            threshold=threshold,
+        )
+        if recent > 0 and len(history) - recent >= MIN_BASELINE:
+            item.baseline = percentile(sorted(history[:-recent]), 50)
+            item.recent = percentile(sorted(history[-recent:]), 50)
+        stats.append(item)
+    return sorted(stats, key=lambda x: x.p50, reverse=True)
+
+
+def render_stats(stats: Iterable[HookStats]) -> Table:
+    """Render the latency table, regressions in red."""
+    table = Table(title='Hook latency (ms)')
+    for column in ('hook', 'calls', 'failures', 'p50', 'p95', 'max', 'trend'):
+        table.add_column(
+            column, justify='left' if column == 'hook' else 'right'
+        )
+    for item in stats:
+        trend = '-'
+        if item.recent is not None and item.baseline is not None:
+            trend = f'{item.baseline * 1e3:.1f} -> {item.recent * 1e3:.1f}'
+        table.add_row(
+            item.hook,
+            str(item.calls),
+            str(item.failures),
+            f'{item.p50 * 1e3:.1f}',
+            f'{item.p95 * 1e3:.1f}',
+            f'{item.slowest * 1e3:.1f}',
+            f'[red]{trend}[/red]' if item.regression else trend,
+        )
+    return table
@@ -3,26 +3,192 @@
 
 from __future__ import annotations
 
-import logging
-import re
 from dataclasses import dataclass, field
+from enum import IntFlag, auto
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Final
 
 import rich
-from icecream import ic
 from rich.console import Console
 
-from incolume.py.githooks.core import debug_enable, get_branchname
+from incolume.py.githooks.core import (
+    GitContext,
+    debug,
+    debug_enable,
+    get_git_context,
+)
+from incolume.py.githooks.core.gitrefs import branch_of
+from incolume.py.githooks.core.registry import RULES
 from incolume.py.githooks.core.rules import (
-    RULE_BRANCHNAME,
-    RULE_BRANCHNAME_REFUSED,
     ProtectedBranchName,
     Result,
     Status,
-    TypeCommit,
 )
+from incolume.py.githooks.core.tracing import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
 
 debug_enable()
 
+MSG_PROTECTED: Final[str] = '\n - Branch name "{}" is protected.'
+MSG_REFUSED: Final[str] = '\n - Can not be WIP (Work in Progress)'
+MSG_SYNTAXES: Final[str] = (
+    '\n\n:: These syntaxes are allowed for branchname:'
+    "\n - #1: 'enhancement-<epoch-timestamp>'; or"
+    "\n - #2: '<issue-id>-issue-description'; or"
+    "\n - #3: '<(feature|feat|bug|bugfix|fix)>/issue#<issue-id>'; or"
+    "\n - #4: '<(feature|feat|bug|bugfix|fix)>/epoch#<epoch-timestamp>'"
+)
+
+
+class BranchViolation(IntFlag):
+    """Violations of a branch name, as a bitmask."""
+
+    NONE = 0
+    PROTECTED_MAIN = auto()
+    PROTECTED_DEV = auto()
+    PROTECTED_TAGS = auto()
+    REFUSED = auto()
+    NOT_MATCHES_RULE = auto()
+
+
+PROTECTED: Final[Mapping[str, int]] = MappingProxyType({
+    ProtectedBranchName.MAIN.value: BranchViolation.PROTECTED_MAIN.value,
+    ProtectedBranchName.MASTER.value: BranchViolation.PROTECTED_MAIN.value,
+    ProtectedBranchName.DEV.value: BranchViolation.PROTECTED_DEV.value,
+    'development': BranchViolation.PROTECTED_DEV.value,
+    ProtectedBranchName.TAGS.value: BranchViolation.PROTECTED_TAGS.value,
+})
+"""Protected branch names and their violation bit."""
+
+_MAIN, _DEV, _TAGS, _REFUSED, _NOT_MATCHES = (
+    x.value for x in BranchViolation if x
+)
+_VIOLATIONS: Final[tuple[BranchViolation, ...]] = tuple(
+    map(BranchViolation, range(BranchViolation.NOT_MATCHES_RULE << 1))
+)
+"""Every combination, so the hot path does plain int arithmetic."""
+
+
+def classify_branchname(
+    branchname: str,
+    *,
+    protected_main: bool = True,
+    protected_dev: bool = False,
+    protected_tags: bool = False,
+) -> BranchViolation:
+    """Evaluate every branch name rule in a single pass.
+
+    A single regex answers both the refused and the allowed rules and a
+    dict lookup answers the protected ones, so no message is built here.
+
+    Examples:
+        >>> classify_branchname('123-nova-funcionalidade')
+        <BranchViolation.NONE: 0>
+        >>> classify_branchname('main') == (
+        ...     BranchViolation.PROTECTED_MAIN | BranchViolation.NOT_MATCHES_RULE
+        ... )
+        True
+
+    Returns:
+        BranchViolation: The violations found, `NONE` when valid.
+
+    """
+    enabled = (
+        protected_main * _MAIN | protected_dev * _DEV | protected_tags * _TAGS
+    )
+    refused, allowed = RULES.match('branchname_classifier', branchname).group(
+        'refused', 'allowed'
+    )
+    violations = PROTECTED.get(branchname, 0) & enabled
+    if refused is not None:
+        violations |= _REFUSED
+    if allowed is None:
+        violations |= _NOT_MATCHES
+    return _VIOLATIONS[violations]
+
+
+def render_violations(branchname: str, violations: BranchViolation) -> str:
+    """Render the messages of each violation, in rule order."""
+    msg = ''
+    if violations & (
+        BranchViolation.PROTECTED_MAIN
+        | BranchViolation.PROTECTED_DEV
+        | BranchViolation.PROTECTED_TAGS
+    ):
+        msg += MSG_PROTECTED.format(branchname)
+    if violations & BranchViolation.REFUSED:
+        msg += MSG_REFUSED
+    if violations & BranchViolation.NOT_MATCHES_RULE:
+        msg += MSG_SYNTAXES
+    return msg
+
+
+def violation_names(violations: BranchViolation) -> str:
+    """Names of the violations in a bitmask, comma separated.
+
+    Examples:
+        >>> violation_names(
+        ...     BranchViolation.REFUSED | BranchViolation.NOT_MATCHES_RULE
+        ... )
+        'refused, not_matches_rule'
+
+    """
+    return ', '.join(
+        x.name.lower() for x in BranchViolation if x and x in violations
+    )
+
+
+@dataclass
+class RefAudit:
+    """Outcome of a bulk ref name audit."""
+
+    total: int = 0
+    offending: list[tuple[str, BranchViolation]] = field(default_factory=list)
+
+
+def audit_refnames(refnames: Iterable[str]) -> RefAudit:
+    """Classify the branch of every ref, without printing anything.
+
+    Protected branches are legitimate refs and are skipped, as on
+    pre-receive. Refs other than branches are ignored, and a branch shared
+    by many remotes is classified once.
+
+    Examples:
+        >>> report = audit_refnames([
+        ...     'refs/heads/main',
+        ...     'refs/remotes/origin/wip',
+        ...     'refs/tags/v1.0.0',
+        ... ])
+        >>> report.total, [ref for ref, _ in report.offending]
+        (2, ['refs/remotes/origin/wip'])
+
+    Args:
+        refnames: Full refnames, e.g. from `iter_refnames()`.
+
+    Returns:
+        RefAudit: Number of branches audited and the offending refs.
+
+    """
+    report = RefAudit()
+    seen: dict[str, BranchViolation] = {}
+    for refname in refnames:
+        branchname = branch_of(refname)
+        if branchname is None:
+            continue
+        report.total += 1
+        if branchname in PROTECTED:
+            continue
+        violations = seen.get(branchname)
+        if violations is None:
+            violations = seen[branchname] = classify_branchname(
+                branchname, protected_main=False
+            )
+        if violations:
+            report.offending.append((refname, violations))
+    return report
+
 
 @dataclass
 class ValidateBranchname:
@@ -34,165 +200,80 @@ class ValidateBranchname:
         'incompatible with rules.'
         '{}[/red]'
     )
-    violation_text: str = ''
-    result: Result = field(default_factory=Result)
-    branchname: str = field(default_factory=get_branchname)
+    branchname: str = ''
+    context: GitContext = field(default_factory=get_git_context, repr=False)
 
     def asdict(self) -> dict:
         """Self dict."""
         return self.__dict__
 
-    def __is_length_valid(self, branchname: str = '') -> bool:
-        """Check if the branch name length is valid."""
-        branchname = branchname or self.branchname
-        regex: str = r'^[\w\d_-]{3,255}$'
-        result = re.match(regex, branchname)
+    def validate(self, branchname: str = '', **kwargs: bool) -> Result:
+        """Validate branch name, without touching the instance.
 
-        if result:
-            return True
+        Reentrant: a single instance may be shared by threads and batch
+        loops, every call returns a fresh `Result`.
 
-        self.violation_text = (
-            f'\n - Branch name "{branchname}" length is invalid.'
-            ' Min 3 and Max 255 characters.'
-        )
-        return bool(result)
-
-    def __is_branch_dev(self, branchname: str = '') -> bool:
-        """Check if the branch name is a default branch."""
-        branchname = branchname or self.branchname
-        result = branchname in {ProtectedBranchName.DEV.value, 'development'}
-        if result:
-            self.violation_text = (
-                f'\n - Branch name "{branchname}" is protected.'
-            )
-        return result
-
-    def __is_branch_tags(self, branchname: str = '') -> bool:
-        """Check if the branch name is a default branch."""
-        branchname = branchname or self.branchname
-        result = branchname == ProtectedBranchName.TAGS.value
-        if result:
-            self.violation_text = (
-                f'\n - Branch name "{branchname}" is protected.'
-            )
-        return result
-
-    def __is_branch_main(self, branchname: str = '') -> bool:
-        """Check if the branch name is main branch."""
-        branchname = branchname or self.branchname
-        result = branchname in {
-            ProtectedBranchName.MAIN.value,
-            ProtectedBranchName.MASTER.value,
-        }
-        if result:
-            self.violation_text = (
-                f'\n - Branch name "{branchname}" is protected.'
-            )
-        return result
-
-    def __is_refused(self, branchname: str = '') -> bool:
-        """Check if the branch name is refused."""
-        branchname = branchname or self.branchname
-        regex: str = RULE_BRANCHNAME_REFUSED
-        result = re.match(regex, branchname, flags=re.IGNORECASE)
-        ic(result)
-        if result:
-            self.violation_text = '\n - Can not be WIP (Work in Progress)'
-        return bool(result)
-
-    def __is_github_branch(self, branchname: str = '') -> bool:
-        """Check if the branchname is a GitHub rule."""
-        branchname = branchname or self.branchname
-        regex_github = r'^\d+(-[\w_]{3,})+'
-
-        return bool(re.match(regex_github, branchname))
-
-    def __is_enhancement_epoch(self, branchname: str = '') -> bool:
-        """Check if the branchname is enhancement-<epoch-timestamp>."""
-        branchname = branchname or self.branchname
-        regex_enhancement = r'^enhancement-\d{1,11}$'
-
-        return bool(re.match(regex_enhancement, branchname))
-
-    def __is_incolume_branch_rule(self, branchname: str = '') -> bool:
-        """Check if the branchname is incolume rule."""
-        branchname = branchname or self.branchname
-        regex_incolume = (
-            rf'^({"|".join(TypeCommit.to_set())})/(epoch|issue)#([0-9]+)$'
+        Args:
+          branchname (str, Active branch): Branch name to validate.
+
+          kwargs:
+            protected_dev (bool, False): Consider dev as protected branch.
+            protected_tags (bool, False): Consider tags as protected branch.
+            protected_main (bool, True): Consider main/master as protected branch.
+
+        Returns:
+            Result: Status and the message to be shown.
+
+        Examples:
+            >>> from incolume.py.githooks.core import GitContext
+            >>> v = ValidateBranchname(context=GitContext(branchname='x'))
+            >>> v.validate('wip').code, v.validate('123-abc').code
+            (<Status.FAILURE: 1>, <Status.SUCCESS: 0>)
+
+        """
+        branchname = (
+            branchname
+            or kwargs.get('branchname')
+            or self.branchname
+            or self.context.branchname
         )
+        debug.log('detected: %s', branchname)
 
-        return bool(re.match(regex_incolume, branchname))
-
-    def __is_not_matches_rule(self, branchname: str = '') -> bool:
-        """Check if the branch name matches the rule."""
-        branchname = branchname or self.branchname
-        if not bool(re.match(RULE_BRANCHNAME, branchname)):
-            self.violation_text = (
-                '\n\n:: These syntaxes are allowed for branchname:'
-                "\n - #1: 'enhancement-<epoch-timestamp>'; or"
-                "\n - #2: '<issue-id>-issue-description'; or"
-                "\n - #3: '<(feature|feat|bug|bugfix|fix)>/issue#<issue-id>'; or"
-                "\n - #4: '<(feature|feat|bug|bugfix|fix)>/epoch#<epoch-timestamp>'"
+        violations = classify_branchname(
+            branchname,
+            protected_main=kwargs.get('protected_main', True),
+            protected_dev=kwargs.get('protected_dev', False),
+            protected_tags=kwargs.get('protected_tags', False),
+        )
+        debug.log('violations: %s', violations)
+        if violations:
+            return Result(
+                Status.FAILURE,
+                self.msg_refused.format(
+                    render_violations(branchname, violations)
+                ),
             )
-            return True
-        return False
+        return Result(Status.SUCCESS, self.msg_ok)
 
-    def is_valid(self, branchname: str = '', **kwargs: str) -> int:
-        """Validate branch name.
+    def is_valid(self, branchname: str = '', **kwargs: bool) -> int:
+        """Validate branch name and print the outcome.
 
         Args:
           branchname (str, Active branch): Branch name to validate.
 
-          kwargs:
-            protected_dev (bool, False): Consider dev as protected branch.
-            protected_tags (bool, False): Consider tags as protected branch.
-            protected_main (bool, True): Consider main/master as protected branch.
+          kwargs: Same as `validate`.
 
         Returns:
             int: Status code.
 
         """
-        branchname = branchname or kwargs.get('branchname') or self.branchname
-        protected_dev = kwargs.get('protected_dev', False)
-        protected_tags = kwargs.get('protected_tags', False)
-        protected_main = kwargs.get('protected_main', True)
-
-        console = Console()
-        logging.debug('detected: %s', ic(branchname))
-
-        ic(self.result)
-        msg: str = ''
-
-        if protected_main and self.__is_branch_main(branchname):
-            ic('is main protected branches')
-            self.result.code = Status.FAILURE
-            msg += self.violation_text
-
-        if protected_dev and self.__is_branch_dev(branchname):
-            ic('is dev protected branches')
-            self.result.code = Status.FAILURE
-            msg += self.violation_text
-
-        if protected_tags and self.__is_branch_tags(branchname):
-            ic('is tags protected branches')
-            self.result.code = Status.FAILURE
-            msg += self.violation_text
-
-        if self.__is_refused(branchname):
-            ic('is refused branch')
-            self.result.code = Status.FAILURE
-            msg += self.violation_text
-
-        if self.__is_not_matches_rule(branchname):
-            ic('is not matches rule')
-            self.result.code = Status.FAILURE
-            msg += self.violation_text
-
-        if self.result.code == Status.FAILURE:
-            rich.print(self.msg_refused.format(msg))
-        else:
-            console.print(self.msg_ok)
-        return self.result.code.value
+        result = self.validate(branchname, **kwargs)
+        with span('render', 'output'):
+            if result.code is Status.FAILURE:
+                rich.print(result.message)
+            else:
+                Console().print(result.message)
+        return result.code.value
 
 
 if __name__ == '__main__':
@@ -9,9 +9,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from string import ascii_lowercase, digits
 
-from icecream import ic
-
-from incolume.py.githooks.core import debug_enable
+from incolume.py.githooks.core import debug, debug_enable
 from incolume.py.githooks.core.rules import (
     SNAKE_CASE,
     Result,
@@ -52,7 +50,15 @@ class ValidateFilename:
         name = self.filename.stem
         regex = r'[^a-z0-9_]' if self.considers_underscore else r'[^a-z0-9]'
         refname = re.sub(regex, '', name)
-        ic(name, len(name), refname, len(refname), self.min_len, self.max_len)
+        debug.log(
+            'refname: %s (%s) -> %s (%s), limits: %s-%s',
+            name,
+            len(name),
+            refname,
+            len(refname),
+            self.min_len,
+            self.max_len,
+        )
         return refname
 
     def __is_python_file(self) -> bool:
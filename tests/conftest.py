@@ -1,8 +1,11 @@
 """Module to configure the test suite."""
 
+from collections.abc import Generator
+
 import pytest
 from click.testing import CliRunner
 
+from incolume.py.githooks.core import GitContext, get_git_context
 from incolume.py.githooks.core.rules import REGEX_SEMVER
 
 __author__ = '@britodfbr'  # pragma: no cover
@@ -18,3 +21,11 @@ def semver_regex() -> str:
 def cli_runner() -> CliRunner:
     """Fixture to CliRunner."""
     return CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def git_context() -> Generator[GitContext]:
+    """Fixture to a fresh process-scoped git context on each test."""
+    get_git_context.cache_clear()
+    yield get_git_context()
+    get_git_context.cache_clear()
@@ -0,0 +1,130 @@
+"""Test module for audit."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from incolume.py.githooks import audit as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+LOG = [
+    ('Ana', '2024-01', 'feat: #1 primeira funcionalidade\n\ncorpo\n'),
+    ('Ana', '2024-01', 'wip\n'),
+    ('Bia', '2024-02', 'fix(ui): #2 corrige botão\n'),
+    ('Bia', '2024-02', 'fix: sem issue\n'),
+    ('Bia', '2024-03', 'Merge branch main\n'),
+]
+
+
+class TestCaseAudit:
+    """Test case for the history audit."""
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('feat: #1 x', 'feat', marks=[]),
+            pytest.param('Feature(api)!: #1 x', 'feat', marks=[]),
+            pytest.param('bugfix: #1 x', 'fix', marks=[]),
+            pytest.param('xpto: #1 x', pkg.UNTYPED, marks=[]),
+            pytest.param('wip', pkg.UNTYPED, marks=[]),
+        ],
+    )
+    def test_commit_type(self, entrance: str, expected: str) -> None:
+        """Test aliases resolve to the canonical type."""
+        assert pkg.commit_type(entrance) == expected
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('feat: #1 x', True, marks=[]),
+            pytest.param('fix(ui): #2 x', True, marks=[]),
+            pytest.param('fix: x', False, marks=[]),
+            pytest.param('Merge branch main', False, marks=[]),
+        ],
+    )
+    def test_is_conforming(self, entrance: str, expected: bool) -> None:  # noqa: FBT001
+        """Test the format and type rules are both required."""
+        assert pkg.is_conforming(entrance) is expected
+
+    def test_audit_chunk(self) -> None:
+        """Test counts are aggregated by type, author and month."""
+        report = pkg.audit_chunk(
+            (a, m, s.partition('\n')[0]) for a, m, s in LOG
+        )
+        assert report.total == (2, 3)
+        assert report.rows('type') == [
+            ('-', 0, 2),
+            ('fix', 1, 1),
+            ('feat', 1, 0),
+        ]
+        assert report.rows('author') == [('Bia', 1, 2), ('Ana', 1, 1)]
+        assert sorted(report.rows('month')) == [
+            ('2024-01', 1, 1),
+            ('2024-02', 1, 1),
+            ('2024-03', 0, 1),
+        ]
+
+    @pytest.mark.parametrize(
+        ['jobs', 'chunk_size'],
+        [
+            pytest.param(1, 2, marks=[]),
+            pytest.param(2, 1, marks=[]),
+            pytest.param(2, 100, marks=[]),
+        ],
+    )
+    def test_audit_history(self, jobs: int, chunk_size: int) -> None:
+        """Test parallel audit matches the serial one."""
+        with patch.object(pkg, 'iter_log', return_value=iter(LOG)) as m:
+            report = pkg.audit_history(
+                '--all', jobs=jobs, chunk_size=chunk_size
+            )
+        m.assert_called_once_with(pkg.AUDIT_FIELDS, pkg.DATE_FORMAT, '--all')
+        assert report == pkg.audit_chunk(
+            (a, m, s.partition('\n')[0]) for a, m, s in LOG
+        )
+
+    def test_render_report(self) -> None:
+        """Test one table per dimension, limited to top rows."""
+        report = pkg.audit_chunk(
+            (a, m, s.partition('\n')[0]) for a, m, s in LOG
+        )
+        tables = pkg.render_report(report, top=2)
+        assert [t.row_count for t in tables] == [2, 2, 2]
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_audit_history_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test against real git."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv('GIT_AUTHOR_NAME', 'Ana')
+        git = ['git', '-c', 'user.name=Ana', '-c', 'user.email=a@b']
+        subprocess.run([*git, 'init', '-q'], check=True)  # noqa: S603
+        for _, month, message in LOG:
+            subprocess.run(  # noqa: S603
+                [
+                    *git,
+                    'commit',
+                    '-q',
+                    '--allow-empty',
+                    f'--date={month}-15T12:00:00',
+                    '-m',
+                    message,
+                ],
+                check=True,
+            )
+        report = pkg.audit_history('HEAD', jobs=1)
+        assert report.total == (2, 3)
+        assert report.rows('author') == [('Ana', 2, 3)]
+        assert [r[0] for r in sorted(report.rows('month'))] == [
+            '2024-01',
+            '2024-02',
+            '2024-03',
+        ]
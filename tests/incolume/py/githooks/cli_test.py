@@ -18,6 +18,8 @@ from incolume.py.githooks.detect_private_key import BLACKLIST
 from inspect import stack
 
 from incolume.py.githooks.prepare_commit_msg import MESSAGERROR
+from incolume.py.githooks.core import GitContext, pipeline
+from incolume.py.githooks.core.staged import StagedChange
 from incolume.py.githooks.core.rules import (
     MainEntrance,
     MESSAGES,
@@ -334,8 +336,16 @@ class TestCaseAllCLI:
         """Test check_valid_branchname function."""
         ic(f'{entrance=}, {exit_code=}, {message=}')
 
-        with patch.object(
-            subprocess, 'check_output', return_value=bytes(entrance, 'utf-8')
+        with (
+            patch(
+                'incolume.py.githooks.core.read_head_branch',
+                return_value=None,
+            ),
+            patch.object(
+                subprocess,
+                'check_output',
+                return_value=bytes(entrance, 'utf-8'),
+            ),
         ):
             result = cli.check_valid_branchname_cli(params)
             captured = capsys.readouterr()
@@ -429,6 +439,36 @@ class TestCaseAllCLI:
         if not args:
             assert f'Private key found: {test_file.as_posix()}' in captured.out
 
+    def test_detect_private_key_cli_staged(self, capsys) -> None:
+        """Test staged files come from the git context."""
+        with NamedTemporaryFile(dir=self.test_dir) as fl:
+            test_file = Path(fl.name)
+        test_file.write_bytes(b'----- ' + BLACKLIST[0] + b' -----\n')
+        context = GitContext(staged_files=[test_file.as_posix()])
+
+        assert cli.detect_private_key_cli(['--staged'], context) == 1
+        assert 'Private key found' in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        ['staged_files', 'expected'],
+        [
+            pytest.param(['incolume/ok_module.py'], Status.SUCCESS, marks=[]),
+            pytest.param(['incolume/Bad-Module.py'], Status.FAILURE, marks=[]),
+        ],
+    )
+    def test_check_valid_filenames_cli_staged(
+        self, staged_files, expected
+    ) -> None:
+        """Test staged files come from the git context."""
+        context = GitContext(staged_files=staged_files)
+        result = cli.check_valid_filenames_cli(['--staged'], context)
+        assert Status(result) == expected
+
+    def test_check_valid_filenames_cli_required(self) -> None:
+        """Test filenames are required without --staged."""
+        with pytest.raises(SystemExit):
+            cli.check_valid_filenames_cli([])
+
     @pytest.mark.parametrize(
         ['args', 'expected'],
         [
@@ -452,6 +492,47 @@ class TestCaseAllCLI:
         assert Status(result) == Status(expected)
         assert not captured.out
 
+    @pytest.mark.parametrize(
+        ['args', 'expected', 'backup'],
+        [
+            pytest.param(
+                [],
+                'feat: x\n\nSigned-off-by: A <a@b>\n',
+                True,
+                marks=[],
+            ),
+            pytest.param(
+                ['--backup', 'none'],
+                'feat: x\n\nSigned-off-by: A <a@b>\n',
+                False,
+                marks=[],
+            ),
+            pytest.param(
+                ['--nonexequi', '--backup=copy'], 'feat: x\n', True, marks=[]
+            ),
+        ],
+    )
+    def test_footer_signedoffby_cli_single_write(
+        self, tmp_path, mocker, args, expected, backup
+    ) -> None:
+        """Test the whole flow rewrites the message once."""
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_text(
+            'feat: x\nPlease enter the commit message\n# help\n#\n',
+            encoding='utf-8',
+        )
+        write = mocker.spy(pipeline, 'write_atomic')
+        context = GitContext(committer_ident='A <a@b>')
+
+        result = cli.footer_signedoffby_cli(
+            [test_file.as_posix(), '', '', *args], context
+        )
+
+        assert result == Status.SUCCESS.value
+        write.assert_called_once()
+        assert test_file.read_text(encoding='utf-8') == expected
+        assert pipeline.backup_path(test_file).exists() is backup
+
     @pytest.mark.parametrize(
         ['entrance', 'expected'],
         [
@@ -661,8 +742,11 @@ class TestCaseAllCLI:
     ) -> None:
         """Test CLI function."""
         mocker.patch(
-            'subprocess.check_output',
-            return_value=entrance.diff_output,
+            'incolume.py.githooks.core.gitasync.gather_git_metadata',
+            return_value={
+                'committer_ident': 'test <test@example.com>',
+                'git_diff': entrance.diff_output,
+            },
         )
         with NamedTemporaryFile() as tf:
             test_file = Path(tf.name)
@@ -676,3 +760,296 @@ class TestCaseAllCLI:
 
         assert cli.insert_diff_cli(entries) == expected.code.value
         assert test_file.read_text(encoding='utf-8') == expected.message
+
+    @pytest.mark.parametrize(
+        ['args', 'expected'],
+        [
+            pytest.param(
+                ['--summary', '--top=1'],
+                'feat: x\n\n\n3 arquivos alterados em 2 diretórios\n'
+                '2\tsrc/\n... mais 1 diretórios\nM\tsrc/a.py\n'
+                '... mais 2 arquivos\n#',
+                marks=[],
+            ),
+            pytest.param(
+                ['--summary'],
+                'feat: x\n\n\n3 arquivos alterados em 2 diretórios\n'
+                '2\tsrc/\n1\t./\nM\tsrc/a.py\nA\tsrc/b.py\nD\tREADME.md\n#',
+                marks=[],
+            ),
+        ],
+    )
+    def test_insert_diff_cli_summary(self, mocker, args, expected) -> None:
+        """Test summarizing mode does not build the full listing."""
+        changes = [
+            StagedChange('M', 'src/a.py'),
+            StagedChange('A', 'src/b.py'),
+            StagedChange('D', 'README.md'),
+        ]
+        mocker.patch.object(
+            cli, 'iter_staged_changes', return_value=iter(changes)
+        )
+        full = mocker.patch('incolume.py.githooks.core.get_git_diff')
+        with NamedTemporaryFile() as tf:
+            test_file = Path(tf.name)
+        test_file.write_text('feat: x\n\n#', encoding='utf-8')
+
+        assert cli.insert_diff_cli([test_file.as_posix(), '', '', *args]) == 0
+        assert test_file.read_text(encoding='utf-8') == expected
+        full.assert_not_called()
+
+
+class TestCaseTimeBudgetCLI:
+    """Test cases for the time budget of the CLI."""
+
+    @pytest.mark.parametrize(
+        ['args', 'expected'],
+        [
+            pytest.param(['--time-budget=0'], 1, marks=[]),
+            pytest.param(['--time-budget=0', '--fail-open'], 0, marks=[]),
+            pytest.param(['--time-budget=60'], 1, marks=[]),
+        ],
+    )
+    def test_detect_private_key_cli_time_budget(
+        self, tmp_path, capsys, args, expected
+    ) -> None:
+        """Test files left by the budget fail closed or warn."""
+        test_file = tmp_path / 'bundle.min.js'
+        test_file.write_bytes(b'----- ' + BLACKLIST[0] + b' -----\n')
+
+        assert cli.detect_private_key_cli([test_file.as_posix(), *args]) == (
+            expected
+        )
+        output = capsys.readouterr().out
+        if args == ['--time-budget=60']:
+            assert 'Private key found' in output
+        else:
+            assert 'not scanned' in output
+            assert test_file.as_posix() in output
+
+    @pytest.mark.parametrize(
+        ['args', 'expected'],
+        [
+            pytest.param(['--time-budget=0'], Status.FAILURE, marks=[]),
+            pytest.param(
+                ['--time-budget=0', '--fail-open'], Status.SUCCESS, marks=[]
+            ),
+            pytest.param(['--time-budget=60'], Status.SUCCESS, marks=[]),
+        ],
+    )
+    def test_check_valid_filenames_cli_time_budget(
+        self, capsys, args, expected
+    ) -> None:
+        """Test filenames left by the budget fail closed or warn."""
+        result = cli.check_valid_filenames_cli(['ok_module.py', *args])
+        assert Status(result) == expected
+        assert ('not scanned' in capsys.readouterr().out) is (
+            args != ['--time-budget=60']
+        )
+
+
+class TestCaseCommitRangeCLI:
+    """Test cases for the CLI validating many commits."""
+
+    @pytest.mark.parametrize(
+        ['args', 'expected'],
+        [
+            pytest.param([], 1, marks=[]),
+            pytest.param(
+                ['--skip=format', '--skip=type', '--skip=min-len'], 0, marks=[]
+            ),
+            pytest.param(['--min-first-line=3', '--skip=format'], 1, marks=[]),
+            pytest.param(['--merges'], 1, marks=[]),
+            pytest.param(['--nonexequi'], 0, marks=[]),
+        ],
+    )
+    def test_validate_commit_range_cli(self, args, expected, capsys) -> None:
+        """Test every commit of the range is reported at once."""
+        messages = [('a' * 40, 'feat: #1 first commit\n'), ('b' * 40, 'wip')]
+        with patch(
+            'incolume.py.githooks.prepare_commit_msg.iter_commit_messages',
+            return_value=iter(messages),
+        ) as m:
+            assert cli.validate_commit_range_cli(['main..HEAD', *args]) == (
+                expected
+            )
+        if '--nonexequi' in args:
+            m.assert_not_called()
+            return
+        options = [] if '--merges' in args else ['--no-merges']
+        m.assert_called_once_with(*options, 'main..HEAD')
+        output = capsys.readouterr().out
+        assert '2 commits validated' in output
+        assert ('- format: Your commit was rejected' in output) is (
+            '--skip=format' not in args
+        )
+
+    def test_validate_commit_range_cli_git_error(self) -> None:
+        """Test a failing git log rejects the push."""
+        with patch(
+            'incolume.py.githooks.prepare_commit_msg.iter_commit_messages',
+            side_effect=RuntimeError('Falha ao executar git log'),
+        ):
+            assert cli.validate_commit_range_cli(['x..y']) == 1
+
+    @pytest.mark.parametrize(
+        ['args', 'expected'],
+        [
+            pytest.param([], ('--no-merges', 'HEAD'), marks=[]),
+            pytest.param(['--merges', '--all'], ('--all', 'HEAD'), marks=[]),
+            pytest.param(
+                ['main', '--since=2024-01-01'],
+                ('--since=2024-01-01', '--no-merges', 'main'),
+                marks=[],
+            ),
+        ],
+    )
+    def test_audit_commits_cli(self, args, expected, capsys) -> None:
+        """Test the audit report and the git log arguments."""
+        records = [('Ana', '2024-01', 'feat: #1 x\n'), ('Ana', '2024-01', 'x')]
+        with patch(
+            'incolume.py.githooks.audit.iter_log', return_value=iter(records)
+        ) as m:
+            assert cli.audit_commits_cli(['-j', '1', *args]) == 0
+        assert m.call_args.args[2:] == expected
+        assert '2 commits audited, 1 conforming.' in capsys.readouterr().out
+
+
+class TestCaseAuditBranchnamesCLI:
+    """Test cases for the CLI auditing branch names."""
+
+    @pytest.mark.parametrize(
+        ['refnames', 'expected', 'output'],
+        [
+            pytest.param(
+                ['refs/heads/main', 'refs/remotes/origin/123-abc'],
+                0,
+                '2 branches audited, 0 rejected.',
+                marks=[],
+            ),
+            pytest.param(
+                ['refs/heads/123-abc', 'refs/remotes/origin/[wip]'],
+                1,
+                'refs/remotes/origin/[wip]: refused, not_matches_rule',
+                marks=[],
+            ),
+        ],
+    )
+    def test_audit_branchnames_cli(
+        self, refnames, expected, output, capsys
+    ) -> None:
+        """Test offending refs and the summary are reported."""
+        with patch(
+            'incolume.py.githooks.cli.iter_refnames',
+            return_value=iter(refnames),
+        ) as m:
+            result = cli.audit_branchnames_cli(['refs/heads', 'refs/remotes'])
+        assert result == expected
+        m.assert_called_once_with('refs/heads', 'refs/remotes')
+        assert output in capsys.readouterr().out
+
+    def test_audit_branchnames_cli_git_error(self) -> None:
+        """Test a failing git for-each-ref is reported."""
+        with patch(
+            'incolume.py.githooks.cli.iter_refnames',
+            side_effect=RuntimeError('Falha ao executar git for-each-ref'),
+        ):
+            assert cli.audit_branchnames_cli([]) == 1
+
+
+class TestCaseHooksStatsCLI:
+    """Test cases for the CLI reporting hook timings."""
+
+    def test_hooks_stats_cli(self, tmp_path, capsys) -> None:
+        """Test latency percentiles and regressions are reported."""
+        path = tmp_path / 'timings.jsonl'
+        path.write_text(
+            ''.join(
+                f'{{"hook":"detect_private_key_cli","wall":{wall}}}\n'
+                for wall in [0.01] * 10 + [0.05] * 2
+            ),
+            encoding='utf-8',
+        )
+        assert cli.hooks_stats_cli([f'--file={path}', '--recent=2']) == 0
+        output = capsys.readouterr().out
+        assert 'detect_private_key_cli' in output
+        assert 'Regressions: detect_private_key_cli' in output
+
+    def test_hooks_stats_cli_empty(self, tmp_path, capsys) -> None:
+        """Test a missing history is explained."""
+        assert cli.hooks_stats_cli([f'--file={tmp_path / "x.jsonl"}']) == 0
+        assert 'No timing history' in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        'recent',
+        [
+            pytest.param('0', marks=[]),
+            pytest.param('-1', marks=[]),
+        ],
+    )
+    def test_hooks_stats_cli_recent(self, tmp_path, capsys, recent) -> None:
+        """Test --recent below 1 is rejected."""
+        with pytest.raises(SystemExit, match='2'):
+            cli.hooks_stats_cli([
+                f'--file={tmp_path / "x.jsonl"}',
+                f'--recent={recent}',
+            ])
+        assert '--recent must be at least 1' in capsys.readouterr().err
+
+
+class TestCaseMessageHooksCLI:
+    """Test cases for the prepare-commit-msg hooks sharing a context."""
+
+    def test_prefetch_once(self, tmp_path) -> None:
+        """Test both hooks are served by a single concurrent gathering."""
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_text('feat: #1 x\n\n#', encoding='utf-8')
+        context = GitContext()
+        with patch(
+            'incolume.py.githooks.core.gitasync.gather_git_metadata',
+            return_value={
+                'committer_ident': 'Ana <ana@example.com>',
+                'git_diff': 'M\tx.py',
+            },
+        ) as m:
+            argv = [test_file.as_posix(), '', '']
+            assert cli.footer_signedoffby_cli(argv, context) == 0
+            assert cli.insert_diff_cli(argv, context) == 0
+        m.assert_called_once_with(*cli.MESSAGE_FACTS)
+        message = test_file.read_text(encoding='utf-8')
+        assert 'Signed-off-by: Ana <ana@example.com>' in message
+        assert 'M\tx.py' in message
+
+
+class TestCaseStagedCLI:
+    """Test cases for the CLI reading files from the git index."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Repository with files staged then removed, run from a subdir."""
+        monkeypatch.setenv('GIT_CONFIG_GLOBAL', '/dev/null')
+        monkeypatch.delenv('GIT_DIR', raising=False)
+        monkeypatch.delenv('GIT_INDEX_FILE', raising=False)
+        subprocess.run(['git', 'init', '-q', tmp_path], check=True)  # noqa: S603 S607
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'a.txt').write_bytes(
+            b'----- ' + BLACKLIST[0] + b' -----\n'
+        )
+        (tmp_path / 'sub' / 'Bad-Module.py').write_text('x = 1\n', 'utf-8')
+        subprocess.run(['git', 'add', '.'], cwd=tmp_path, check=True)  # noqa: S607
+        (tmp_path / 'a.txt').unlink()
+        (tmp_path / 'sub' / 'Bad-Module.py').unlink()
+        monkeypatch.chdir(tmp_path / 'sub')
+        return tmp_path
+
+    @pytest.mark.usefixtures('repo')
+    def test_detect_private_key_cli_removed(self, capsys) -> None:
+        """Test a staged key is found once removed from the work tree."""
+        assert cli.detect_private_key_cli(['--staged'], GitContext()) == 1
+        assert 'Private key found: a.txt' in capsys.readouterr().out
+
+    @pytest.mark.usefixtures('repo')
+    def test_check_valid_filenames_cli_subdir(self, capsys) -> None:
+        """Test staged names are checked from a subdirectory."""
+        assert cli.check_valid_filenames_cli(['--staged'], GitContext()) == 1
+        assert 'sub/Bad-Module.py' in capsys.readouterr().out
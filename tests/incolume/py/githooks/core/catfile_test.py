@@ -0,0 +1,88 @@
+"""Tests for catfile module."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+
+import pytest
+
+from incolume.py.githooks.core import catfile as pkg
+from incolume.py.githooks.core.catfile import BatchObject
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+BATCH = (
+    b'c1 commit 4 \ntree\n'
+    b'b1 blob 5 dir/a b.py\nx\ny\nz\n'
+    b'b2 missing\n'
+    b'b3 blob 0 empty\n\n'
+    b'~b4 missing\n'
+)
+
+
+class TestCaseCatFile:
+    """Test case for the batched object reader."""
+
+    def test_parse_batch(self) -> None:
+        """Test contents with newlines and missing objects."""
+        assert list(pkg.parse_batch(io.BytesIO(BATCH))) == [
+            BatchObject('c1', 'commit', b'tree', ''),
+            BatchObject('b1', 'blob', b'x\ny\nz', 'dir/a b.py'),
+            BatchObject('b3', 'blob', b'', 'empty'),
+            BatchObject('b4', pkg.OMITTED, b'', ''),
+        ]
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_blobs_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test only new blobs are listed, the large ones left unread."""
+        monkeypatch.chdir(tmp_path)
+        git = ['git', '-c', 'user.name=A', '-c', 'user.email=a@b']
+        subprocess.run([*git, 'init', '-q'], check=True)  # noqa: S603
+        (tmp_path / 'old.txt').write_text('old', encoding='utf-8')
+        subprocess.run([*git, 'add', '.'], check=True)  # noqa: S603
+        subprocess.run([*git, 'commit', '-qm', 'one'], check=True)  # noqa: S603
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'sub' / 'new.txt').write_text('new', encoding='utf-8')
+        (tmp_path / 'big.bin').write_bytes(b'0' * 64)
+        subprocess.run([*git, 'add', '.'], check=True)  # noqa: S603
+        subprocess.run([*git, 'commit', '-qm', 'two'], check=True)  # noqa: S603
+
+        args = ('HEAD', '--not', 'HEAD~')
+        blobs = list(pkg.iter_blobs(*args, max_size=32))
+        assert [(b.type, b.path, b.data) for b in blobs] == [
+            ('blob', 'sub/new.txt', b'new'),
+            (pkg.OMITTED, '', b''),
+        ]
+        large = blobs[-1].oid
+        assert list(pkg.iter_blob_chunks(large, 24)) == [
+            b'0' * 24,
+            b'0' * 24,
+            b'0' * 16,
+        ]
+        assert pkg.blob_paths([large], *args) == {large: 'big.bin'}
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_blob_chunks_failure(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a missing blob raises RuntimeError."""
+        monkeypatch.chdir(tmp_path)
+        subprocess.run(['git', 'init', '-q'], check=True)  # noqa: S607
+        with pytest.raises(RuntimeError, match='cat-file blob'):
+            list(pkg.iter_blob_chunks('0' * 40))
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_blobs_failure(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test git failure raises RuntimeError."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv('GIT_DIR', str(tmp_path / 'nowhere'))
+        with pytest.raises(RuntimeError, match='rev-list'):
+            list(pkg.iter_blobs('HEAD'))
@@ -2,7 +2,9 @@
 
 import pytest
 from incolume.py.githooks import core
+from incolume.py.githooks.core import gitasync
 from incolume.py.githooks.core.rules import TypeCommit
+from incolume.py.githooks.core.staged import StagedChange
 from unittest import mock
 import os
 from icecream import ic
@@ -62,13 +64,27 @@ class TestCaseUtilsModule:
     """Testcase for utils module."""
 
     @pytest.mark.parametrize(
-        'entrance',
-        [pytest.param('A\tincolume/py/githooks/module_xpto.py', marks=[])],
+        ['entrance', 'expected'],
+        [
+            pytest.param(
+                [StagedChange('A', 'incolume/py/githooks/module_xpto.py')],
+                'A\tincolume/py/githooks/module_xpto.py',
+                marks=[],
+            ),
+            pytest.param(
+                [StagedChange('M', 'a.py'), StagedChange('R100', 'c', 'b')],
+                'M\ta.py\nR100\tb\tc',
+                marks=[],
+            ),
+            pytest.param([], '', marks=[]),
+        ],
     )
-    def test_get_diff(self, entrance, mocker) -> None:
+    def test_get_diff(self, entrance, expected, mocker) -> None:
         """Test get_diff_files function."""
-        mocker.patch('subprocess.check_output', return_value=entrance)
-        assert core.get_git_diff() == entrance
+        mocker.patch.object(
+            core, 'iter_staged_changes', return_value=iter(entrance)
+        )
+        assert core.get_git_diff() == expected
 
     @pytest.mark.parametrize(
         ['entrance', 'expected'],
@@ -130,7 +146,99 @@ class TestCaseUtilsModule:
     )
     def test_get_branchname(self, entrance: str) -> None:
         """Test for get branch names."""
-        with patch.object(
-            core.subprocess, 'check_output', return_value=entrance.encode()
+        with (
+            patch.object(core, 'read_head_branch', return_value=None),
+            patch.object(
+                core.subprocess,
+                'check_output',
+                return_value=entrance.encode(),
+            ),
         ):
             assert core.get_branchname() == entrance.strip()
+
+    def test_get_branchname_without_subprocess(self) -> None:
+        """Test get_branchname reads HEAD without forking git."""
+        with (
+            patch.object(core, 'read_head_branch', return_value='80-fatora'),
+            patch.object(core.subprocess, 'check_output') as m,
+        ):
+            assert core.get_branchname() == '80-fatora'
+            m.assert_not_called()
+
+
+class TestCaseGitContext:
+    """Testcase for GitContext."""
+
+    def test_memoized(self, tmp_path) -> None:
+        """Test each fact is computed at most once."""
+        context = core.GitContext(git_dir=tmp_path)
+        with (
+            patch.object(core, 'read_head_branch', return_value='80-x') as b,
+            patch.object(
+                core, 'get_committer_ident', return_value='A <a>'
+            ) as c,
+            patch.object(core, 'get_git_diff', return_value='M\tx.py') as d,
+        ):
+            for _ in range(3):
+                assert context.branchname == '80-x'
+                assert context.committer_ident == 'A <a>'
+                assert context.git_diff == 'M\tx.py'
+                assert (
+                    core.get_signed_off_by(context) == 'Signed-off-by: A <a>'
+                )
+        b.assert_called_once_with(tmp_path)
+        c.assert_called_once_with()
+        d.assert_called_once_with()
+        assert repr(context).startswith(f'GitContext(git_dir={tmp_path!r}')
+
+    def test_git_dir(self, tmp_path) -> None:
+        """Test git_dir discovery."""
+        with patch.object(core, 'find_git_dir', return_value=tmp_path) as m:
+            context = core.GitContext()
+            assert context.git_dir == context.git_dir == tmp_path
+        m.assert_called_once_with()
+
+    def test_prefetch(self) -> None:
+        """Test prefetch only gathers pending facts."""
+        context = core.GitContext(branchname='main')
+        with patch.object(
+            gitasync,
+            'gather_git_metadata',
+            return_value={'committer_ident': 'A <a>', 'git_diff': ''},
+        ) as m:
+            assert context.prefetch() is context
+            assert context.prefetch('git_diff') is context
+        m.assert_called_once_with('committer_ident', 'git_diff')
+        assert context.committer_ident == 'A <a>'
+
+    @pytest.mark.parametrize(
+        ['resolved', 'output', 'expected'],
+        [
+            pytest.param('a' * 40, '', 'a' * 40, marks=[]),
+            pytest.param(None, 'b' * 40 + '\n', 'b' * 40, marks=[]),
+            pytest.param(None, '', None, marks=[]),
+        ],
+    )
+    def test_head_oid(self, tmp_path, resolved, output, expected) -> None:
+        """Test head_oid with fallback to git."""
+        with (
+            patch.object(core, 'resolve_ref', return_value=resolved),
+            patch.object(core.subprocess, 'check_output', return_value=output),
+        ):
+            assert core.GitContext(git_dir=tmp_path).head_oid == expected
+
+    def test_head_oid_unborn(self) -> None:
+        """Test head_oid outside of a repository."""
+        with (
+            patch.object(core, 'find_git_dir', return_value=None),
+            patch.object(
+                core.subprocess,
+                'check_output',
+                side_effect=core.subprocess.CalledProcessError(1, 'git'),
+            ),
+        ):
+            assert core.get_head_oid() is None
+
+    def test_get_git_context(self) -> None:
+        """Test the process-scoped context is shared."""
+        assert core.get_git_context() is core.get_git_context()
@@ -0,0 +1,64 @@
+"""Tests for deadline module."""
+
+from __future__ import annotations
+
+import math
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import deadline as pkg
+from incolume.py.githooks.core.rules import Result, Status
+
+
+class TestCaseDeadline:
+    """Test case for cooperative deadlines."""
+
+    @pytest.mark.parametrize(
+        ['budget', 'elapsed', 'expected'],
+        [
+            pytest.param(None, 1e6, math.inf, marks=[]),
+            pytest.param(2.0, 0.5, 1.5, marks=[]),
+            pytest.param(2.0, 3.0, 0.0, marks=[]),
+        ],
+    )
+    def test_remaining(
+        self, budget: float | None, elapsed: float, expected: float
+    ) -> None:
+        """Test the seconds left, from the start."""
+        deadline = pkg.Deadline(budget, start=100.0)
+        with mock.patch.object(
+            pkg.time, 'monotonic', return_value=100.0 + elapsed
+        ):
+            assert deadline.remaining == expected
+            assert deadline.expired() is (expected == 0)
+
+    @pytest.mark.parametrize(
+        ['fail_open', 'expected'],
+        [
+            pytest.param(False, Status.FAILURE, marks=[]),
+            pytest.param(True, Status.SUCCESS, marks=[]),
+        ],
+    )
+    def test_report_unscanned(
+        self,
+        fail_open: bool,  # noqa: FBT001
+        expected: Status,
+    ) -> None:
+        """Test unscanned files are listed, failing closed by default."""
+        result = pkg.report_unscanned(
+            Result(),
+            ['a.min.js', 'b.min.js'],
+            pkg.Deadline(0.5),
+            fail_open=fail_open,
+        )
+        assert result.code is expected
+        assert 'Time budget exceeded (0.5s), 2 file(s)' in result.message
+        assert '  a.min.js\n  b.min.js\n' in result.message
+
+    def test_report_nothing_unscanned(self) -> None:
+        """Test the result is kept when everything was scanned."""
+        result = Result(Status.FAILURE, 'Private key found: x\n')
+        assert pkg.report_unscanned(result, [], pkg.Deadline(0)) == Result(
+            Status.FAILURE, 'Private key found: x\n'
+        )
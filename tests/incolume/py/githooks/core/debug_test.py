@@ -0,0 +1,108 @@
+"""Tests for debug module."""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess  # noqa: S404
+import sys
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import debug as pkg
+from incolume.py.githooks.core.decorators import logging_call
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Unprintable:
+    """Fail when formatted."""
+
+    def __str__(self) -> str:
+        """Fail."""
+        raise AssertionError
+
+
+@pytest.fixture
+def restore() -> Iterator[None]:
+    """Restore the debug mode of the environment."""
+    yield
+    pkg.configure()
+
+
+class TestCaseDebug:
+    """Test case for the debug facade."""
+
+    @pytest.mark.parametrize(
+        ['enabled', 'expected'],
+        [
+            pytest.param(False, pkg._noop, marks=[]),  # noqa: SLF001
+            pytest.param(True, pkg._log, marks=[]),  # noqa: SLF001
+        ],
+    )
+    def test_configure(
+        self,
+        enabled: bool,  # noqa: FBT001
+        expected: object,
+        restore: None,  # noqa: ARG002
+    ) -> None:
+        """Test `log` is bound once, when resolved."""
+        assert pkg.configure(enabled=enabled) is enabled
+        assert pkg.ENABLED is enabled
+        assert pkg.log is expected
+
+    def test_off_is_lazy(self, restore: None) -> None:  # noqa: ARG002
+        """Test arguments are never formatted while off."""
+        pkg.configure(enabled=False)
+        pkg.log('value: %s', Unprintable())
+
+    def test_on(
+        self,
+        caplog: pytest.LogCaptureFixture,
+        restore: None,  # noqa: ARG002
+    ) -> None:
+        """Test records are formatted while on."""
+        pkg.configure(enabled=True)
+        with caplog.at_level(logging.DEBUG):
+            pkg.log('branch: %s', 'main')
+        assert 'branch: main' in caplog.messages
+
+    def test_env_read_once(self, restore: None) -> None:  # noqa: ARG002
+        """Test decorated calls do not read the environment."""
+        pkg.configure(enabled=False)
+
+        @logging_call()
+        def hook_cli() -> int:
+            return 0
+
+        with mock.patch.object(pkg, 'getenv') as getenv:
+            assert hook_cli() == 0
+        getenv.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ['value', 'expected'],
+        [
+            pytest.param('', 'False', marks=[]),
+            pytest.param('1', 'True', marks=[]),
+        ],
+    )
+    def test_icecream_lazy(self, value: str, expected: str) -> None:
+        """Test icecream is imported only while debugging."""
+        env = {k: v for k, v in os.environ.items() if k not in pkg.DEBUG_VARS}
+        env['INCOLUME_DEBUG_MODE'] = value
+        output = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                '-c',
+                'import sys, incolume.py.githooks.cli;'
+                'print("icecream" in sys.modules)',
+            ],
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        assert output.splitlines()[-1] == expected
@@ -0,0 +1,111 @@
+"""Tests for gitasync module."""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import time
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitasync as pkg
+
+DELAY = 0.2
+
+
+class FakeProcess:
+    """Fake asyncio process answering after a delay."""
+
+    def __init__(self, stdout: bytes, returncode: int = 0) -> None:
+        """Init."""
+        self.stdout = stdout
+        self.returncode = returncode
+
+    async def communicate(self) -> tuple[bytes, bytes]:
+        """Answer after a delay."""
+        await asyncio.sleep(DELAY)
+        return self.stdout, b'fatal: error'
+
+
+def fake_exec(outputs: dict[str, bytes], returncode: int = 0) -> mock.Mock:
+    """Fake create_subprocess_exec by git subcommand."""
+
+    async def create(_git: str, command: str, *_: str, **__: int) -> object:
+        await asyncio.sleep(0)
+        return FakeProcess(outputs[command], returncode)
+
+    return mock.Mock(side_effect=create)
+
+
+OUTPUTS = {
+    'rev-parse': b'123-branch\n',
+    'var': b'John Doe <john@example.com> 1700000000 -0300\n',
+    'diff': b'A\x00incolume/x.py\x00M\x00README.md\x00',
+}
+
+
+class TestCaseGitAsync:
+    """Test case for concurrent git metadata gathering."""
+
+    def test_gather_concurrently(self) -> None:
+        """Test wall time is the slowest query, not the sum."""
+        create = fake_exec(OUTPUTS)
+        with (
+            mock.patch.object(pkg, 'read_head_branch', return_value=None),
+            mock.patch.object(pkg, 'read_ident', return_value=None),
+            mock.patch.object(pkg.asyncio, 'create_subprocess_exec', create),
+        ):
+            start = time.perf_counter()
+            result = pkg.gather_git_metadata()
+            elapsed = time.perf_counter() - start
+
+        assert result == {
+            'branchname': '123-branch',
+            'committer_ident': 'John Doe <john@example.com>',
+            'git_diff': 'A\tincolume/x.py\nM\tREADME.md',
+        }
+        assert create.call_count == len(pkg.GIT_QUERIES)
+        assert elapsed < DELAY * 2
+
+    def test_cached_for_invocation(self) -> None:
+        """Test each query runs once, even for concurrent callers."""
+        context = pkg.AsyncGitContext()
+        create = fake_exec(OUTPUTS)
+
+        async def run() -> list[str]:
+            return await asyncio.gather(
+                context.git_diff(), context.git_diff(), context.git_diff()
+            )
+
+        with mock.patch.object(pkg.asyncio, 'create_subprocess_exec', create):
+            assert len(set(asyncio.run(run()))) == 1
+            pkg.gather_git_metadata('git_diff', context=context)
+        create.assert_called_once()
+        assert context.results['git_diff'] == 'A\tincolume/x.py\nM\tREADME.md'
+
+    def test_fast_paths(self) -> None:
+        """Test branch and ident are resolved without forking when possible."""
+        create = fake_exec(OUTPUTS)
+        with (
+            mock.patch.object(pkg, 'read_head_branch', return_value='main'),
+            mock.patch.object(pkg, 'read_ident', return_value='A <a@b>'),
+            mock.patch.object(pkg.asyncio, 'create_subprocess_exec', create),
+        ):
+            result = pkg.gather_git_metadata('branchname', 'committer_ident')
+        assert result == {'branchname': 'main', 'committer_ident': 'A <a@b>'}
+        create.assert_not_called()
+
+    def test_run_git_failure(self) -> None:
+        """Test failures raise RuntimeError."""
+        create = fake_exec(OUTPUTS, returncode=128)
+        with (
+            mock.patch.object(pkg.asyncio, 'create_subprocess_exec', create),
+            pytest.raises(RuntimeError, match='fatal: error'),
+        ):
+            pkg.gather_git_metadata('git_diff')
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_run_git(self) -> None:
+        """Test run_git against real git."""
+        assert asyncio.run(pkg.run_git('--version')).startswith('git version')
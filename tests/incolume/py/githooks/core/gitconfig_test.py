@@ -0,0 +1,256 @@
+"""Tests for gitconfig module."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitconfig as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+IDENT_VARS = (
+    'GIT_COMMITTER_NAME',
+    'GIT_COMMITTER_EMAIL',
+    'GIT_AUTHOR_NAME',
+    'GIT_AUTHOR_EMAIL',
+    'EMAIL',
+)
+
+
+@pytest.fixture
+def isolated_env(tmp_path: Path) -> dict[str, str]:
+    """Environment without identity nor user configuration."""
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in IDENT_VARS and not k.startswith('GIT_CONFIG')
+    }
+    env.update({
+        'HOME': tmp_path.as_posix(),
+        'XDG_CONFIG_HOME': (tmp_path / '.config').as_posix(),
+        'GIT_CONFIG_NOSYSTEM': '1',
+    })
+    with mock.patch.dict(os.environ, env, clear=True):
+        yield env
+
+
+class TestCaseGitConfig:
+    """Test case for pure python git config reading."""
+
+    @pytest.mark.parametrize(
+        ['content', 'expected'],
+        [
+            pytest.param(
+                '[user]\n\tname = John Doe\n\temail = j@example.com\n',
+                {'user.name': 'John Doe', 'user.email': 'j@example.com'},
+                marks=[],
+            ),
+            pytest.param(
+                '[User]\nName = "  quoted ; name  " # comment\n',
+                {'user.name': '  quoted ; name  '},
+                marks=[],
+            ),
+            pytest.param(
+                '[core]\n  bare\n; comment\n# other\n',
+                {'core.bare': 'true'},
+                marks=[],
+            ),
+            pytest.param(
+                '[remote "Origin"]\n  url = a\\\n  b\n',
+                {'remote.Origin.url': 'a  b'},
+                marks=[],
+            ),
+            pytest.param(
+                '[branch.Main]\nmerge = x\\ty\\"z\n',
+                {'branch.main.merge': 'x\ty"z'},
+                marks=[],
+            ),
+            pytest.param(
+                '[user] name = inline\nemail = "x@y"   \n',
+                {'user.name': 'inline', 'user.email': 'x@y'},
+                marks=[],
+            ),
+            pytest.param(
+                '[sec "a\\"b"]\nkey = trailing\\',
+                {'sec.a"b.key': 'trailing'},
+                marks=[],
+            ),
+        ],
+    )
+    def test_parse_config(
+        self, tmp_path: Path, content: str, expected: dict[str, str]
+    ) -> None:
+        """Test parse_config syntax support."""
+        config = tmp_path / 'config'
+        config.write_text(content, encoding='utf-8')
+        assert pkg.parse_config(config) == expected
+
+    def test_parse_config_missing(self, tmp_path: Path) -> None:
+        """Test missing config files are ignored."""
+        assert pkg.parse_config(tmp_path / 'missing') == {}
+
+    def test_parse_config_include(self, tmp_path: Path) -> None:
+        """Test include.path relative to the including file."""
+        (tmp_path / 'inc').mkdir()
+        (tmp_path / 'inc' / 'user').write_text(
+            '[user]\nname = Included\n', encoding='utf-8'
+        )
+        config = tmp_path / 'config'
+        config.write_text(
+            '[user]\nname = Before\n[include]\npath = inc/user\n',
+            encoding='utf-8',
+        )
+        assert pkg.parse_config(config)['user.name'] == 'Included'
+
+    @pytest.mark.parametrize(
+        'content',
+        [
+            pytest.param('[includeIf "gitdir:~/w/"]\npath = x\n', marks=[]),
+            pytest.param('[include]\npath = config\n', marks=[]),
+        ],
+    )
+    def test_parse_config_unsupported(
+        self, tmp_path: Path, content: str
+    ) -> None:
+        """Test configs that only git can evaluate."""
+        config = tmp_path / 'config'
+        config.write_text(content, encoding='utf-8')
+        with pytest.raises(pkg.UnsupportedConfigError):
+            pkg.parse_config(config)
+
+    @pytest.mark.usefixtures('isolated_env')
+    def test_read_config_cascade(self, tmp_path: Path) -> None:
+        """Test local config overrides global and env overrides both."""
+        (tmp_path / '.gitconfig').write_text(
+            '[user]\nname = Global\nemail = g@example.com\n',
+            encoding='utf-8',
+        )
+        git_dir = tmp_path / '.git'
+        git_dir.mkdir()
+        (git_dir / 'config').write_text(
+            '[user]\nname = Local\n', encoding='utf-8'
+        )
+        config = pkg.read_config(git_dir)
+        assert config['user.name'] == 'Local'
+        assert config['user.email'] == 'g@example.com'
+
+        with mock.patch.dict(
+            os.environ,
+            {
+                'GIT_CONFIG_COUNT': '1',
+                'GIT_CONFIG_KEY_0': 'User.Email',
+                'GIT_CONFIG_VALUE_0': 'env@example.com',
+            },
+        ):
+            assert pkg.read_config(git_dir)['user.email'] == 'env@example.com'
+
+    @pytest.mark.parametrize(
+        'env',
+        [
+            pytest.param({'GIT_CONFIG_PARAMETERS': "'user.name'='x'"}),
+            pytest.param({'GIT_CONFIG': '/tmp/config'}, marks=[]),  # noqa: S108
+        ],
+    )
+    @pytest.mark.usefixtures('isolated_env')
+    def test_read_config_unsupported(self, env: dict[str, str]) -> None:
+        """Test `git -c` style configuration is left to git."""
+        with (
+            mock.patch.dict(os.environ, env),
+            pytest.raises(pkg.UnsupportedConfigError),
+        ):
+            pkg.read_config()
+
+    @pytest.mark.usefixtures('isolated_env')
+    def test_config_files(self) -> None:
+        """Test the config cascade order."""
+        with mock.patch.dict(
+            os.environ,
+            {'GIT_CONFIG_SYSTEM': '/etc/x', 'GIT_CONFIG_GLOBAL': '/g'},
+        ):
+            os.environ.pop('GIT_CONFIG_NOSYSTEM')
+            assert [x.as_posix() for x in pkg.config_files()] == [
+                '/etc/x',
+                '/g',
+            ]
+
+    @pytest.mark.parametrize(
+        ['env', 'config', 'role', 'expected'],
+        [
+            pytest.param(
+                {'GIT_COMMITTER_NAME': 'Env', 'GIT_COMMITTER_EMAIL': 'e@x'},
+                '',
+                'committer',
+                'Env <e@x>',
+                marks=[],
+            ),
+            pytest.param(
+                {'GIT_COMMITTER_NAME': ' Env. '},
+                '[user]\nname = Cfg\nemail = <c@x>\n',
+                'committer',
+                'Env <c@x>',
+                marks=[],
+            ),
+            pytest.param(
+                {},
+                '[user]\nname = Cfg\nemail = c@x\n'
+                '[committer]\nname = Committer\n',
+                'committer',
+                'Committer <c@x>',
+                marks=[],
+            ),
+            pytest.param(
+                {'GIT_AUTHOR_NAME': 'Author', 'EMAIL': 'mail@x'},
+                '',
+                'author',
+                'Author <mail@x>',
+                marks=[],
+            ),
+            pytest.param({}, '[user]\nname = Cfg\n', 'committer', None),
+            pytest.param(
+                {'GIT_CONFIG_COUNT': 'x'}, '', 'committer', None, marks=[]
+            ),
+        ],
+    )
+    @pytest.mark.usefixtures('isolated_env')
+    def test_read_ident(
+        self,
+        tmp_path: Path,
+        env: dict[str, str],
+        config: str,
+        role: str,
+        expected: str | None,
+    ) -> None:
+        """Test read_ident precedence."""
+        (tmp_path / '.gitconfig').write_text(config, encoding='utf-8')
+        with (
+            mock.patch.dict(os.environ, env),
+            mock.patch.object(pkg, 'find_git_dir', return_value=None),
+        ):
+            assert pkg.read_ident(role) == expected
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    @pytest.mark.usefixtures('isolated_env')
+    def test_parity_with_git(self, tmp_path: Path) -> None:
+        """Test parity with `git var GIT_COMMITTER_IDENT`."""
+        git = shutil.which('git')
+        repo = tmp_path / 'repo'
+        (tmp_path / '.gitconfig').write_text(
+            '[user]\n\tname = " Fulano de Tal "\n\temail = fulano@x.com\n',
+            encoding='utf-8',
+        )
+        subprocess.run([git, 'init', '-q', repo], check=True)  # noqa: S603
+        with mock.patch.object(
+            pkg, 'find_git_dir', return_value=repo / '.git'
+        ):
+            ident = pkg.read_ident()
+        expected = subprocess.check_output(  # noqa: S603
+            [git, 'var', 'GIT_COMMITTER_IDENT'], cwd=repo, text=True
+        )
+        assert ident == expected.split('>', maxsplit=1)[0] + '>'
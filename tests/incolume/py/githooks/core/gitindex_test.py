@@ -0,0 +1,235 @@
+"""Tests for gitindex module."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks import core
+from incolume.py.githooks.core import gitindex as pkg
+from incolume.py.githooks.core.staged import StagedChange, iter_staged_changes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+
+GIT = shutil.which('git')
+pytestmark = pytest.mark.skipif(not GIT, reason='git not found')
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run git inside `repo`."""
+    return subprocess.run(  # noqa: S603
+        [GIT, *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Generator[Path]:
+    """Repository with a first commit."""
+    with mock.patch.dict(os.environ, {'GIT_CONFIG_GLOBAL': os.devnull}):
+        for key in ('GIT_DIR', 'GIT_INDEX_FILE', 'GIT_OBJECT_DIRECTORY'):
+            os.environ.pop(key, None)
+        git(tmp_path, 'init', '-q', '-b', 'main')
+        for name in ('a/1.txt', 'a/b/2.txt', 'c/3.txt', 'x/5', 'x.z', 'top'):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(name, encoding='utf-8')
+        git(tmp_path, 'add', '.')
+        git(tmp_path, 'commit', '-q', '-m', 'init')
+        yield tmp_path
+
+
+def modify(repo: Path) -> None:
+    """Stage modifications, mode and type changes, dir/file swaps."""
+    (repo / 'a' / '1.txt').write_text('changed', encoding='utf-8')
+    (repo / 'c' / '3.txt').chmod(0o755)
+    shutil.rmtree(repo / 'x')
+    (repo / 'x').write_text('now a file', encoding='utf-8')
+    (repo / 'top').unlink()
+    (repo / 'top').symlink_to('a')
+    (repo / 'sp ace\ttab.py').write_text('new', encoding='utf-8')
+    (repo / 'ita').write_text('intent', encoding='utf-8')
+    git(repo, 'add', '-A')
+    git(repo, 'rm', '-q', '--cached', 'x.z')
+    git(repo, 'add', '-N', 'ita')
+
+
+def packed(repo: Path) -> None:
+    """Pack objects with deltas, then turn a file into a directory."""
+    for idx in range(3):
+        (repo / 'a' / '1.txt').write_text('line\n' * 100 + str(idx), 'utf-8')
+        git(repo, 'commit', '-q', '-am', str(idx))
+    git(repo, 'gc', '-q', '--aggressive')
+    (repo / 'x.z').unlink()
+    (repo / 'x.z').mkdir()
+    (repo / 'x.z' / 'f').write_text('f', encoding='utf-8')
+    git(repo, 'add', '-A')
+
+
+def index_v4(repo: Path) -> None:
+    """Stage changes in an index with path prefix compression."""
+    modify(repo)
+    git(repo, 'update-index', '--index-version', '4')
+
+
+def unmerged(repo: Path) -> None:
+    """Leave a merge conflict in the index."""
+    git(repo, 'checkout', '-q', '-b', 'other')
+    (repo / 'c' / '3.txt').write_text('other', encoding='utf-8')
+    git(repo, 'commit', '-q', '-am', 'other')
+    git(repo, 'checkout', '-q', 'main')
+    (repo / 'c' / '3.txt').write_text('main', encoding='utf-8')
+    git(repo, 'commit', '-q', '-am', 'main')
+    subprocess.run(  # noqa: S603
+        [GIT, 'merge', '-q', 'other'],
+        cwd=repo,
+        capture_output=True,
+        check=False,
+    )
+
+
+def unborn(repo: Path) -> None:
+    """Stage files on an unborn branch."""
+    git(repo, 'checkout', '-q', '--orphan', 'new')
+
+
+class TestCaseGitIndex:
+    """Test case for reading the index without git."""
+
+    @pytest.mark.parametrize(
+        'scenario',
+        [
+            pytest.param(lambda _: None, id='clean'),
+            pytest.param(modify, id='modify'),
+            pytest.param(packed, id='packed'),
+            pytest.param(index_v4, id='index-v4'),
+            pytest.param(unmerged, id='unmerged'),
+            pytest.param(unborn, id='unborn'),
+        ],
+    )
+    def test_parity_with_git(
+        self,
+        repo: Path,
+        scenario: Callable[[Path], None],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test parity with `git diff --cached --name-status --no-renames`."""
+        scenario(repo)
+        monkeypatch.chdir(repo)
+        expected = sorted(
+            iter_staged_changes('--no-renames'), key=lambda x: x.path
+        )
+        assert pkg.read_staged_changes(repo / '.git') == expected
+
+    def test_index_versions(self, repo: Path) -> None:
+        """Test versions 2 to 4 parse to the same entries."""
+        _, trees = pkg.read_index(repo / '.git')
+        assert trees[b''] == bytes.fromhex(
+            git(repo, 'rev-parse', 'HEAD^{tree}').strip()
+        )
+        modify(repo)
+        parsed = []
+        for version in ('2', '3', '4'):
+            git(repo, 'update-index', '--index-version', version)
+            parsed.append(pkg.read_index(repo / '.git'))
+        assert parsed[0] == parsed[1] == parsed[2]
+        assert b'' not in parsed[0][1]
+
+    def test_cache_tree_skips_unchanged(self, repo: Path) -> None:
+        """Test trees of untouched directories are never read."""
+        (repo / 'a' / 'b' / '2.txt').write_text('changed', encoding='utf-8')
+        git(repo, 'add', 'a/b/2.txt')
+        store = pkg.ObjectStore(repo / '.git')
+        with mock.patch.object(
+            store, 'read_tree', wraps=store.read_tree
+        ) as read_tree:
+            entries, trees = pkg.read_index(repo / '.git')
+            tree = store.commit_tree(
+                bytes.fromhex(git(repo, 'rev-parse', 'HEAD').strip())
+            )
+            changes = list(
+                pkg.IndexDiff(store, entries, trees).diff(
+                    tree, b'', 0, len(entries)
+                )
+            )
+        assert changes == [('M', b'a/b/2.txt')]
+        assert read_tree.call_count == 3  # noqa: PLR2004
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            pytest.param(b'DIRC' + struct.pack('>II', 5, 0), id='version'),
+            pytest.param(
+                b'DIRC' + struct.pack('>II', 2, 0) + b'link\0\0\0\0',
+                id='split-index',
+            ),
+        ],
+    )
+    def test_unsupported(self, data: bytes) -> None:
+        """Test layouts only git understands are refused."""
+        with pytest.raises(pkg.UnsupportedIndexError):
+            pkg.parse_index(data + b'\0' * 20)
+
+    @pytest.mark.parametrize(
+        'size',
+        [
+            pytest.param(8, id='header'),
+            pytest.param(40, id='entry'),
+            pytest.param(-30, id='extension'),
+        ],
+    )
+    def test_truncated(self, repo: Path, size: int) -> None:
+        """Test a truncated index raises ValueError and falls back to git."""
+        modify(repo)
+        git(repo, 'write-tree')
+        data = (repo / '.git' / 'index').read_bytes()[:size]
+        with pytest.raises(ValueError, match='Truncated index'):
+            pkg.parse_index(data)
+
+        (repo / '.git' / 'index').write_bytes(data)
+        with mock.patch.object(
+            core, 'iter_staged_changes', return_value=iter([])
+        ) as fallback:
+            assert core.get_staged_changes(repo / '.git') == []
+        fallback.assert_called_once_with('--no-renames')
+
+    def test_fallback(
+        self, repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test git is asked when the index can not be read."""
+        modify(repo)
+        monkeypatch.chdir(repo)
+        with mock.patch.object(
+            core, 'read_staged_changes', side_effect=pkg.UnsupportedIndexError
+        ):
+            files = core.get_staged_files(repo / '.git')
+        assert files == [
+            x.path
+            for x in iter_staged_changes('--no-renames')
+            if x.status != 'D'
+        ]
+
+    def test_staged_files(self, repo: Path) -> None:
+        """Test deleted files are left out."""
+        modify(repo)
+        with mock.patch.object(core, 'iter_staged_changes') as fallback:
+            files = core.get_staged_files(repo / '.git')
+        fallback.assert_not_called()
+        assert 'x.z' not in files
+        assert StagedChange('A', 'sp ace\ttab.py').path in files
+
+    def test_staged_oids(self, repo: Path) -> None:
+        """Test blobs of staged files match `git ls-files --stage`."""
+        modify(repo)
+        expected = {}
+        for line in git(repo, 'ls-files', '--stage', '-z').split('\0'):
+            if line:
+                info, path = line.split('\t', 1)
+                expected[path] = bytes.fromhex(info.split()[1])
+        assert pkg.read_staged_oids(repo / '.git') == expected
@@ -0,0 +1,82 @@
+"""Tests for gitlog module."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitlog as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+LOG = (
+    b'a1\x00feat: #1 first\n\nbody\n\x00\n'
+    b'b2\x00fix: #2 second\n\x00\n'
+    b'c3\x00caf\xe9\x00\n'
+)
+MESSAGES = [
+    ('a1', 'feat: #1 first\n\nbody\n'),
+    ('b2', 'fix: #2 second\n'),
+    ('c3', 'caf\udce9'),
+]
+
+
+class TestCaseGitLog:
+    """Test case for streaming commit messages."""
+
+    def test_parse_log(self) -> None:
+        """Test commits are paired and separators dropped."""
+        fields = pkg.iter_nul_fields(io.BytesIO(LOG), 5)
+        assert list(pkg.parse_log(fields)) == MESSAGES
+
+    def test_iter_commit_messages(self) -> None:
+        """Test messages are streamed from git stdout."""
+        process = mock.MagicMock(returncode=0, stdout=io.BytesIO(LOG))
+        process.__enter__.return_value = process
+        with mock.patch.object(
+            pkg.subprocess, 'Popen', return_value=process
+        ) as popen:
+            assert list(pkg.iter_commit_messages('main..HEAD')) == MESSAGES
+        assert popen.call_args.args[0] == [
+            'git',
+            'log',
+            pkg.LOG_FORMAT,
+            'main..HEAD',
+        ]
+
+    def test_iter_commit_messages_failure(self) -> None:
+        """Test git failure raises RuntimeError."""
+        process = mock.MagicMock(returncode=128, stdout=io.BytesIO(b''))
+        process.__enter__.return_value = process
+        with (
+            mock.patch.object(pkg.subprocess, 'Popen', return_value=process),
+            pytest.raises(RuntimeError, match='git log'),
+        ):
+            list(pkg.iter_commit_messages('x..y'))
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_commit_messages_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test against real git, newest commit first."""
+        monkeypatch.chdir(tmp_path)
+        git = ['git', '-c', 'user.name=A', '-c', 'user.email=a@b']
+        subprocess.run([*git, 'init', '-q'], check=True)  # noqa: S603
+        messages = ['feat: #1 one', 'fix: #2 two\n\nwith body', 'three']
+        for message in messages:
+            subprocess.run(  # noqa: S603
+                [*git, 'commit', '-q', '--allow-empty', '-m', message],
+                check=True,
+            )
+        result = list(pkg.iter_commit_messages('HEAD~2..HEAD'))
+        assert [message for _, message in result] == [
+            'three\n',
+            'fix: #2 two\n\nwith body\n',
+        ]
+        assert all(len(oid) == 40 for oid, _ in result)  # noqa: PLR2004
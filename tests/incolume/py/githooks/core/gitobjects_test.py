@@ -0,0 +1,78 @@
+"""Tests for gitobjects module."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitobjects as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GIT = shutil.which('git')
+
+
+class TestCaseGitObjects:
+    """Test case for reading git objects without git."""
+
+    @pytest.mark.parametrize(
+        ['base', 'delta', 'expected'],
+        [
+            pytest.param(b'hello world', b'\x0b\x05\x05hello', b'hello'),
+            pytest.param(
+                b'hello world', b'\x0b\x0b\x91\x06\x05\x90\x06', b'worldhello '
+            ),
+            pytest.param(
+                b'x' * 0x10000, b'\x80\x80\x04\x80\x80\x04\x80', b'x' * 0x10000
+            ),
+        ],
+    )
+    def test_apply_delta(
+        self, base: bytes, delta: bytes, expected: bytes
+    ) -> None:
+        """Test insert and copy instructions."""
+        assert pkg.apply_delta(base, delta) == expected
+
+    @pytest.mark.skipif(not GIT, reason='git not found')
+    @pytest.mark.parametrize('gc', [False, True], ids=['loose', 'packed'])
+    def test_parity_with_git(self, tmp_path: Path, gc: bool) -> None:  # noqa: FBT001
+        """Test every object reads like `git cat-file`."""
+
+        def git(*args: str) -> bytes:
+            return subprocess.run(  # noqa: S603
+                [GIT, *args], cwd=tmp_path, check=True, capture_output=True
+            ).stdout
+
+        with mock.patch.dict(os.environ, {'GIT_CONFIG_GLOBAL': os.devnull}):
+            git('init', '-q')
+            for idx in range(5):
+                (tmp_path / 'f.txt').write_text(
+                    'line\n' * 200 + str(idx), encoding='utf-8'
+                )
+                git('add', '.')
+                git('commit', '-q', '-m', str(idx))
+            if gc:
+                git('gc', '-q', '--aggressive')
+
+            store = pkg.ObjectStore(tmp_path / '.git')
+            listing = git(
+                'cat-file', '--batch-all-objects', '--batch-check'
+            ).split(b'\n')
+            for line in filter(None, listing):
+                oid, kind, _ = line.split()
+                assert store.read(bytes.fromhex(oid.decode())) == (
+                    pkg.TYPE_IDS[kind],
+                    git('cat-file', kind.decode(), oid.decode()),
+                )
+
+    def test_not_found(self, tmp_path: Path) -> None:
+        """Test missing objects raise ObjectNotFoundError."""
+        store = pkg.ObjectStore(tmp_path)
+        with pytest.raises(pkg.ObjectNotFoundError):
+            store.read(b'\0' * pkg.OID_SIZE)
@@ -0,0 +1,96 @@
+"""Tests for gitrefs module."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitrefs as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestCaseGitRefs:
+    """Test case for streaming refnames."""
+
+    @pytest.mark.parametrize(
+        ['refname', 'expected'],
+        [
+            pytest.param('refs/heads/main', 'main', marks=[]),
+            pytest.param('refs/heads/feat/issue#1', 'feat/issue#1', marks=[]),
+            pytest.param('refs/remotes/origin/123-abc', '123-abc', marks=[]),
+            pytest.param('refs/remotes/origin/fix/a', 'fix/a', marks=[]),
+            pytest.param('refs/remotes/origin', None, marks=[]),
+            pytest.param('refs/tags/v1.0.0', None, marks=[]),
+            pytest.param('refs/notes/commits', None, marks=[]),
+        ],
+    )
+    def test_branch_of(self, refname: str, expected: str | None) -> None:
+        """Test branch names of local and remote-tracking refs."""
+        assert pkg.branch_of(refname) == expected
+
+    def test_iter_refnames(self) -> None:
+        """Test refnames are streamed and symbolic refs dropped."""
+        process = mock.MagicMock(
+            returncode=0,
+            stdout=io.StringIO('refs/heads/a\n\nrefs/remotes/origin/b\n'),
+        )
+        process.__enter__.return_value = process
+        with mock.patch.object(
+            pkg.subprocess, 'Popen', return_value=process
+        ) as popen:
+            assert list(pkg.iter_refnames()) == [
+                'refs/heads/a',
+                'refs/remotes/origin/b',
+            ]
+        assert popen.call_args.args[0] == [
+            'git',
+            'for-each-ref',
+            pkg.REF_FORMAT,
+            *pkg.BRANCH_REFS,
+        ]
+
+    def test_iter_refnames_failure(self) -> None:
+        """Test git failure raises RuntimeError."""
+        process = mock.MagicMock(returncode=128, stdout=io.StringIO(''))
+        process.__enter__.return_value = process
+        with (
+            mock.patch.object(pkg.subprocess, 'Popen', return_value=process),
+            pytest.raises(RuntimeError, match='git for-each-ref'),
+        ):
+            list(pkg.iter_refnames('refs/heads'))
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_refnames_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test against real git, with packed and symbolic refs."""
+        monkeypatch.chdir(tmp_path)
+        git = ['git', '-c', 'user.name=A', '-c', 'user.email=a@b']
+        subprocess.run([*git, 'init', '-q', '-b', 'main'], check=True)  # noqa: S603
+        subprocess.run(  # noqa: S603
+            [*git, 'commit', '-q', '--allow-empty', '-m', 'x'], check=True
+        )
+        for ref in ('refs/heads/wip', 'refs/remotes/origin/123-abc'):
+            subprocess.run([*git, 'update-ref', ref, 'HEAD'], check=True)  # noqa: S603
+        subprocess.run([*git, 'pack-refs', '--all'], check=True)  # noqa: S603
+        subprocess.run(  # noqa: S603
+            [
+                *git,
+                'symbolic-ref',
+                'refs/remotes/origin/HEAD',
+                'refs/remotes/origin/123-abc',
+            ],
+            check=True,
+        )
+        assert list(pkg.iter_refnames()) == [
+            'refs/heads/main',
+            'refs/heads/wip',
+            'refs/remotes/origin/123-abc',
+        ]
@@ -0,0 +1,195 @@
+"""Tests for gitrepo module."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import gitrepo as pkg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+OID = 'a' * 40
+
+
+@pytest.fixture
+def fake_git_dir(tmp_path: Path) -> Path:
+    """Fake git directory with a branch `main`."""
+    git_dir = tmp_path / 'repo' / '.git'
+    (git_dir / 'refs' / 'heads').mkdir(parents=True)
+    (git_dir / 'HEAD').write_text('ref: refs/heads/main\n', encoding='utf-8')
+    (git_dir / 'refs' / 'heads' / 'main').write_text(
+        f'{OID}\n', encoding='utf-8'
+    )
+    return git_dir
+
+
+class TestCaseGitRepo:
+    """Test case for pure python git metadata reading."""
+
+    def test_find_git_dir(self, fake_git_dir: Path) -> None:
+        """Test discovery walking up from a subdirectory."""
+        subdir = fake_git_dir.parent / 'a' / 'b'
+        subdir.mkdir(parents=True)
+        with mock.patch.dict(os.environ, clear=True):
+            assert pkg.find_git_dir(subdir) == fake_git_dir
+
+    def test_find_git_dir_env(self, fake_git_dir: Path) -> None:
+        """Test GIT_DIR has precedence."""
+        with mock.patch.dict(os.environ, {'GIT_DIR': fake_git_dir.as_posix()}):
+            assert pkg.find_git_dir('/') == fake_git_dir
+
+    def test_find_git_dir_not_found(self, tmp_path: Path) -> None:
+        """Test discovery outside any repository."""
+        with (
+            mock.patch.dict(os.environ, clear=True),
+            mock.patch.object(pkg.Path, 'is_dir', return_value=False),
+            mock.patch.object(pkg.Path, 'is_file', return_value=False),
+        ):
+            assert pkg.find_git_dir(tmp_path) is None
+
+    @pytest.mark.parametrize(
+        ['head', 'loose', 'packed', 'expected'],
+        [
+            pytest.param('ref: refs/heads/main', True, '', 'main', marks=[]),
+            pytest.param(
+                'ref: refs/heads/feat/issue#12',
+                False,
+                f'# pack-refs with: peeled\n{OID} refs/heads/feat/issue#12\n'
+                f'^{"b" * 40}\n',
+                'feat/issue#12',
+                marks=[],
+            ),
+            pytest.param('ref: refs/heads/unborn', False, '', None, marks=[]),
+            pytest.param(OID, False, '', 'HEAD', marks=[]),
+            pytest.param('ref: refs/heads/.invalid', False, '', None),
+            pytest.param('ref: refs/remotes/origin/x', False, '', None),
+            pytest.param('garbage', False, '', None, marks=[]),
+        ],
+    )
+    def test_read_head_branch(
+        self,
+        fake_git_dir: Path,
+        head: str,
+        loose: bool,  # noqa: FBT001
+        packed: str,
+        expected: str | None,
+    ) -> None:
+        """Test read_head_branch."""
+        (fake_git_dir / 'HEAD').write_text(f'{head}\n', encoding='utf-8')
+        if loose:
+            ref = fake_git_dir / head.removeprefix('ref: ')
+            ref.parent.mkdir(parents=True, exist_ok=True)
+            ref.write_text(f'{OID}\n', encoding='utf-8')
+        if packed:
+            (fake_git_dir / 'packed-refs').write_text(packed, encoding='utf-8')
+        assert pkg.read_head_branch(fake_git_dir) == expected
+
+    def test_read_head_branch_missing_head(self, tmp_path: Path) -> None:
+        """Test a git directory without HEAD."""
+        assert pkg.read_head_branch(tmp_path) is None
+
+    def test_read_head_branch_outside_repo(self) -> None:
+        """Test read_head_branch when there is no repository."""
+        with mock.patch.object(pkg, 'find_git_dir', return_value=None):
+            assert pkg.read_head_branch() is None
+
+    def test_worktree(self, fake_git_dir: Path, tmp_path: Path) -> None:
+        """Test `.git` file pointing to a linked worktree."""
+        wt_git_dir = fake_git_dir / 'worktrees' / 'wt'
+        wt_git_dir.mkdir(parents=True)
+        (wt_git_dir / 'commondir').write_text('../..\n', encoding='utf-8')
+        (wt_git_dir / 'HEAD').write_text(
+            'ref: refs/heads/123-worktree\n', encoding='utf-8'
+        )
+        (fake_git_dir / 'packed-refs').write_text(
+            f'{OID} refs/heads/123-worktree\n', encoding='utf-8'
+        )
+        worktree = tmp_path / 'wt'
+        worktree.mkdir()
+        (worktree / '.git').write_text(
+            f'gitdir: {wt_git_dir.as_posix()}\n', encoding='utf-8'
+        )
+
+        with mock.patch.dict(os.environ, clear=True):
+            git_dir = pkg.find_git_dir(worktree)
+        assert git_dir == wt_git_dir
+        assert pkg.get_common_dir(git_dir).resolve() == fake_git_dir
+        assert pkg.read_head_branch(git_dir) == '123-worktree'
+
+    @pytest.mark.parametrize(
+        ['content', 'expected'],
+        [
+            pytest.param('gitdir: ../.git/modules/sub', '.git/modules/sub'),
+            pytest.param('nothing', None, marks=[]),
+        ],
+    )
+    def test_read_gitdir_file(
+        self, tmp_path: Path, content: str, expected: str | None
+    ) -> None:
+        """Test relative `gitdir:` pointers."""
+        dotgit = tmp_path / 'sub' / '.git'
+        dotgit.parent.mkdir()
+        dotgit.write_text(content, encoding='utf-8')
+        result = pkg._read_gitdir_file(dotgit)  # noqa: SLF001
+        if expected is None:
+            assert result is None
+        else:
+            assert result.resolve() == (tmp_path / expected).resolve()
+
+    def test_read_gitdir_file_unreadable(self, tmp_path: Path) -> None:
+        """Test unreadable `.git` file."""
+        assert pkg._read_gitdir_file(tmp_path / '.git') is None  # noqa: SLF001
+
+    def test_resolve_ref_symref_loop(self, fake_git_dir: Path) -> None:
+        """Test symbolic ref cycles are not followed forever."""
+        ref = fake_git_dir / 'refs' / 'heads' / 'main'
+        ref.write_text('ref: refs/heads/main\n', encoding='utf-8')
+        assert pkg.resolve_ref(fake_git_dir, 'HEAD') is None
+
+    def test_resolve_ref_absolute_commondir(self, tmp_path: Path) -> None:
+        """Test absolute commondir pointer."""
+        common = tmp_path / 'common'
+        common.mkdir()
+        (common / 'packed-refs').write_text(
+            f'{OID} refs/heads/x\n', encoding='utf-8'
+        )
+        git_dir = tmp_path / 'wt'
+        git_dir.mkdir()
+        (git_dir / 'commondir').write_text(common.as_posix(), encoding='utf-8')
+        assert pkg.resolve_ref(git_dir, 'refs/heads/x') == OID
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    @pytest.mark.parametrize(
+        'args',
+        [
+            pytest.param(['checkout', '-q', '-b', '99-parity'], marks=[]),
+            pytest.param(['pack-refs', '--all'], marks=[]),
+            pytest.param(['checkout', '-q', '--detach'], marks=[]),
+        ],
+    )
+    def test_parity_with_git(self, tmp_path: Path, args: list[str]) -> None:
+        """Test parity with `git rev-parse --abbrev-ref HEAD`."""
+        git = shutil.which('git')
+        with mock.patch.dict(os.environ, clear=False):
+            os.environ.pop('GIT_DIR', None)
+            for cmd in (
+                ['init', '-q', '-b', 'main'],
+                ['commit', '-q', '--allow-empty', '-m', 'init'],
+                args,
+            ):
+                subprocess.run(  # noqa: S603
+                    [git, *cmd], cwd=tmp_path, check=True
+                )
+            expected = subprocess.check_output(  # noqa: S603
+                [git, 'rev-parse', '--abbrev-ref', 'HEAD'],
+                cwd=tmp_path,
+                text=True,
+            ).strip()
+            assert pkg.read_head_branch(pkg.find_git_dir(tmp_path)) == expected
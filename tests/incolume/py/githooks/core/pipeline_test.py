@@ -0,0 +1,84 @@
+"""Tests for pipeline module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import pipeline as pkg
+from incolume.py.githooks.core.rules import Backup
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def msg(tmp_path: Path) -> Path:
+    """Commit message file."""
+    path = tmp_path / 'COMMIT_EDITMSG'
+    path.write_bytes(b'feat: x\r\n\r\nbody\r\n')
+    path.chmod(0o640)
+    return path
+
+
+class TestCaseMessagePipeline:
+    """Test case for the single write message pipeline."""
+
+    def test_single_write(self, msg: Path) -> None:
+        """Test all transformations cost one replace."""
+        pipeline = pkg.MessagePipeline(msg).pipe(
+            str.upper, lambda x: x.replace('BODY', 'Body'), str.rstrip
+        )
+        with mock.patch.object(
+            pkg.Path, 'replace', autospec=True, side_effect=pkg.Path.replace
+        ) as replace:
+            assert pipeline.run()
+        replace.assert_called_once()
+        assert msg.read_bytes() == b'FEAT: X\r\n\r\nBody'
+        assert msg.stat().st_mode & 0o777 == 0o640  # noqa: PLR2004
+        assert list(msg.parent.iterdir()) == [msg]
+
+    def test_unchanged(self, msg: Path) -> None:
+        """Test nothing is written when transformations change nothing."""
+        with mock.patch.object(pkg, 'write_atomic') as write:
+            assert not pkg.MessagePipeline(msg, [str]).run()
+        write.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ['backup', 'linked'],
+        [
+            pytest.param(Backup.LINK, True, marks=[]),
+            pytest.param(Backup.COPY, False, marks=[]),
+        ],
+    )
+    def test_backup(self, msg: Path, backup: Backup, linked: bool) -> None:  # noqa: FBT001
+        """Test the old content is kept as `.bak`."""
+        inode = msg.stat().st_ino
+        assert pkg.MessagePipeline(msg, [str.upper], backup).run()
+        bak = pkg.backup_path(msg)
+        assert bak.read_bytes() == b'feat: x\r\n\r\nbody\r\n'
+        assert (bak.stat().st_ino == inode) is linked
+        assert msg.stat().st_nlink == 1
+
+    def test_backup_link_fallback(self, msg: Path) -> None:
+        """Test a copy is made where hard links are not supported."""
+        with mock.patch.object(pkg.os, 'link', side_effect=OSError):
+            bak = pkg.make_backup(msg, Backup.LINK)
+        assert bak.read_bytes() == msg.read_bytes()
+
+    def test_no_backup(self, msg: Path) -> None:
+        """Test Backup.NONE leaves no `.bak`."""
+        pkg.MessagePipeline(msg, [str.upper]).run()
+        assert not pkg.backup_path(msg).exists()
+
+    def test_atomic_on_failure(self, msg: Path) -> None:
+        """Test a failed write keeps the message and leaves no temp file."""
+        with (
+            mock.patch.object(pkg.os, 'fdopen', side_effect=OSError('full')),
+            pytest.raises(OSError, match='full'),
+        ):
+            pkg.write_atomic(msg, 'new')
+        assert msg.read_bytes() == b'feat: x\r\n\r\nbody\r\n'
+        assert list(msg.parent.iterdir()) == [msg]
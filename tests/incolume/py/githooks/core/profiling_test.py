@@ -0,0 +1,104 @@
+"""Tests for profiling module."""
+
+from __future__ import annotations
+
+import logging
+import pstats
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from incolume.py.githooks.core import profile_var_active
+from incolume.py.githooks.core import profiling as pkg
+from incolume.py.githooks.core.decorators import logging_call
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def leaf() -> None:
+    """Spend some time."""
+    time.sleep(0.01)
+
+
+def branch() -> None:
+    """Call the leaf twice."""
+    leaf()
+    leaf()
+
+
+class TestCaseProfiling:
+    """Test case for profiling hook calls."""
+
+    @pytest.mark.parametrize(
+        ['env', 'expected'],
+        [
+            pytest.param({}, (None, False), marks=[]),
+            pytest.param({pkg.PROFILE_VAR: ''}, (None, False), marks=[]),
+            pytest.param({pkg.PROFILE_VAR: 'p'}, ('p', False), marks=[]),
+            pytest.param(
+                {pkg.PROFILE_VAR: 'p', pkg.COLLAPSED_VAR: 'on'},
+                ('p', True),
+                marks=[],
+            ),
+        ],
+    )
+    def test_profile_var_active(
+        self, env: dict, expected: tuple, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the switch is read from the environment."""
+        monkeypatch.delenv(pkg.PROFILE_VAR, raising=False)
+        monkeypatch.delenv(pkg.COLLAPSED_VAR, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        assert profile_var_active() == expected
+
+    def test_profiled(self, tmp_path: Path) -> None:
+        """Test one `.prof` file per call, named by hook."""
+        assert pkg.profiled(tmp_path / 'profiles')(branch)() is None
+        (path,) = (tmp_path / 'profiles').iterdir()
+        assert path.name.startswith('branch-')
+        assert path.suffix == '.prof'
+        names = {name for _, _, name in pstats.Stats(str(path)).stats}
+        assert {'branch', 'leaf'} <= names
+
+    def test_profiled_raises(self, tmp_path: Path) -> None:
+        """Test a failing call is still profiled."""
+
+        @pkg.profiled(tmp_path)
+        def hook_cli() -> None:
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            hook_cli()
+        assert len(list(tmp_path.glob('hook_cli-*.prof'))) == 1
+
+    def test_collapsed_stacks(self, tmp_path: Path) -> None:
+        """Test stacks nest the callees and add up to the total."""
+        pkg.profiled(tmp_path, collapsed=True)(branch)()
+        (path,) = tmp_path.glob('*.collapsed')
+        stacks = {}
+        for line in path.read_text('utf-8').splitlines():
+            stack, _, weight = line.rpartition(' ')
+            stacks[stack] = int(weight)
+        (sleep,) = (x for x in stacks if x.endswith('time.sleep>'))
+        assert sleep.split(';')[-3:-1] == [
+            pkg.frame_name((__file__, x.__code__.co_firstlineno, x.__name__))
+            for x in (branch, leaf)
+        ]
+        total = pstats.Stats(str(path.with_suffix('.prof'))).total_tt
+        assert sum(stacks.values()) == pytest.approx(total * 1e6, rel=0.01)
+
+    def test_logging_call_profiles(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test entry points are profiled when decorated with the switch."""
+        monkeypatch.setenv(pkg.PROFILE_VAR, str(tmp_path))
+
+        @logging_call(logging.INFO, 'x')
+        def hook_cli() -> int:
+            return 0
+
+        assert hook_cli() == 0
+        assert len(list(tmp_path.glob('hook_cli-*.prof'))) == 1
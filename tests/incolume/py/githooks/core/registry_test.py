@@ -0,0 +1,89 @@
+"""Tests for registry module."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import pickle  # noqa: S403
+import re
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import registry as pkg
+from incolume.py.githooks.core.registry import Rule, RuleRegistry
+from incolume.py.githooks.core.rules import TypeCommit
+
+
+class TestCaseRegistry:
+    """Test case for the compiled rule registry."""
+
+    def test_compiled_lazily_once(self) -> None:
+        """Test each pattern is compiled on first use, only once."""
+        registry = RuleRegistry([Rule('a', r'a+'), Rule('b', r'b+')])
+        with mock.patch.object(pkg.re, 'compile', wraps=re.compile) as m:
+            assert not registry['a'].compiled
+            for _ in range(3):
+                assert registry.match('a', 'aaa')
+            assert registry['a'].compiled
+            assert not registry['b'].compiled
+        m.assert_called_once_with('a+', 0)
+
+    def test_frozen(self) -> None:
+        """Test rules and registry are read-only."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            pkg.RULES['semver'].pattern = '.*'
+        with pytest.raises(TypeError):
+            pkg.RULES['xpto'] = Rule('xpto', '.*')  # type: ignore[index]
+        with pytest.raises(TypeError):
+            pkg.TYPE_ALIASES['wip'] = TypeCommit.FIX  # type: ignore[index]
+
+    def test_serialization(self) -> None:
+        """Test sources round trip through JSON and pickle."""
+        pkg.RULES.match('commit_format', 'feat: #1 x')
+        data = json.loads(json.dumps(pkg.RULES.asdict()))
+        assert RuleRegistry.fromdict(data) == pkg.RULES
+        rule = pickle.loads(pickle.dumps(pkg.RULES['commit_format']))  # noqa: S301
+        assert rule == pkg.RULES['commit_format']
+        assert not rule.compiled
+
+    @pytest.mark.parametrize(
+        ['name', 'entrance', 'expected'],
+        [
+            pytest.param('commit_format', 'FEAT: #1 x', True, marks=[]),
+            pytest.param('commit_format', 'feat: x', False, marks=[]),
+            pytest.param('type_commit', 'fix(ui): x', True, marks=[]),
+            pytest.param('type_commit', 'bugfix: x', False, marks=[]),
+            pytest.param('branchname', '80-fatora-codigo', True, marks=[]),
+            pytest.param('branchname_refused', 'x-WIP', True, marks=[]),
+            pytest.param(
+                'branchname_incolume', 'feat/issue#1', True, marks=[]
+            ),
+            pytest.param('branchname_issue', 'feature/ABC-12', True, marks=[]),
+            pytest.param('semver', '1.9.0', True, marks=[]),
+        ],
+    )
+    def test_rules(self, name: str, entrance: str, expected: bool) -> None:  # noqa: FBT001
+        """Test the registered rules."""
+        assert bool(pkg.RULES.match(name, entrance)) is expected
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('feat', TypeCommit.FEAT, marks=[]),
+            pytest.param('FEATURE', TypeCommit.FEAT, marks=[]),
+            pytest.param(' BugFix ', TypeCommit.FIX, marks=[]),
+            pytest.param('cicd', TypeCommit.CI, marks=[]),
+            pytest.param('buggy', None, marks=[]),
+        ],
+    )
+    def test_resolve_type(
+        self, entrance: str, expected: TypeCommit | None
+    ) -> None:
+        """Test aliases resolve like `TypeCommit(value)`."""
+        assert pkg.resolve_type(entrance) is expected
+
+    def test_type_aliases_parity(self) -> None:
+        """Test every name and value resolves as the enum does."""
+        for name in [*TypeCommit.__members__, *TypeCommit.to_set()]:
+            assert pkg.resolve_type(name) is TypeCommit(name)
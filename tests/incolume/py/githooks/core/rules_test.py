@@ -185,3 +185,53 @@ class TestCaseRules:
 
         assert isinstance(obj, Klass)
         assert expected in dir(obj)
+
+    @pytest.mark.parametrize(
+        'enum',
+        [
+            pytest.param(pkg.TypeCommit, marks=[]),
+            pytest.param(pkg.ProtectedBranchName, marks=[]),
+            pytest.param(pkg.Backup, marks=[]),
+        ],
+    )
+    def test_to_set_to_list_cached(self, enum) -> None:
+        """Test collections are built once, immutable."""
+        assert enum.to_set() is enum.to_set()
+        assert enum.to_list() is enum.to_list()
+        assert isinstance(enum.to_set(), frozenset)
+        assert enum.to_list() == tuple(sorted(enum.to_set()))
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param(' BugFix ', pkg.TypeCommit.FIX, marks=[]),
+            pytest.param('FEATURE', pkg.TypeCommit.FEAT, marks=[]),
+            pytest.param('Docs', pkg.TypeCommit.DOCS, marks=[]),
+            pytest.param('development', pkg.ProtectedBranchName.DEV, marks=[]),
+            pytest.param('Dev', pkg.ProtectedBranchName.DEV, marks=[]),
+        ],
+    )
+    def test_lookup(self, entrance, expected) -> None:
+        """Test names and values resolve case insensitive."""
+        assert type(expected)(entrance) is expected
+        assert type(expected)._lookup_[entrance.strip().casefold()] is (
+            expected
+        )
+
+    @pytest.mark.parametrize(
+        'entrance',
+        [
+            pytest.param(['fix'], marks=[]),
+            pytest.param(2, marks=[]),
+            pytest.param('', marks=[]),
+        ],
+    )
+    def test_lookup_invalid(self, entrance) -> None:
+        """Test invalid entrances raise ValueError."""
+        with pytest.raises(ValueError, match='is not a valid TypeCommit'):
+            pkg.TypeCommit(entrance)
+
+    def test_status_or_invalid(self) -> None:
+        """Test combining with an invalid value still raises ValueError."""
+        with pytest.raises(ValueError, match='is not a valid Status'):
+            pkg.Status.SUCCESS | 2
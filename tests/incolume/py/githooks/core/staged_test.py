@@ -0,0 +1,106 @@
+"""Tests for staged module."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess  # noqa: S404
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import staged as pkg
+from incolume.py.githooks.core.staged import StagedChange
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+NAME_STATUS_Z = (
+    b'M\x00README.md\x00'
+    b'R087\x00old name.py\x00new\tname.py\x00'
+    b'A\x00line\nbreak.txt\x00'
+    b'C100\x00a.py\x00b.py\x00'
+    b'D\x00gone.py\x00'
+)
+CHANGES = [
+    StagedChange('M', 'README.md'),
+    StagedChange('R087', 'new\tname.py', 'old name.py'),
+    StagedChange('A', 'line\nbreak.txt'),
+    StagedChange('C100', 'b.py', 'a.py'),
+    StagedChange('D', 'gone.py'),
+]
+
+
+class TestCaseStaged:
+    """Test case for streaming staged changes."""
+
+    @pytest.mark.parametrize(
+        'chunk_size',
+        [
+            pytest.param(1, marks=[]),
+            pytest.param(7, marks=[]),
+            pytest.param(pkg.CHUNK_SIZE, marks=[]),
+        ],
+    )
+    def test_iter_nul_fields(self, chunk_size: int) -> None:
+        """Test fields split across chunk boundaries."""
+        stream = io.BytesIO(b'M\x00a b.py\x00last')
+        assert list(pkg.iter_nul_fields(stream, chunk_size)) == [
+            'M',
+            'a b.py',
+            'last',
+        ]
+
+    def test_iter_nul_fields_undecodable(self) -> None:
+        """Test non UTF-8 paths survive the round trip."""
+        (field,) = pkg.iter_nul_fields(io.BytesIO(b'caf\xe9.py\x00'))
+        assert field.encode('utf-8', 'surrogateescape') == b'caf\xe9.py'
+
+    def test_parse_name_status_z(self) -> None:
+        """Test renames and copies carry the old path."""
+        fields = pkg.iter_nul_fields(io.BytesIO(NAME_STATUS_Z), 5)
+        assert list(pkg.parse_name_status_z(fields)) == CHANGES
+
+    def test_format_name_status(self) -> None:
+        """Test rendering like `git diff --name-status`."""
+        assert pkg.format_name_status(CHANGES[:2]) == (
+            'M\tREADME.md\nR087\told name.py\tnew\tname.py'
+        )
+
+    def test_iter_staged_changes(self) -> None:
+        """Test changes are streamed from git stdout."""
+        process = mock.MagicMock(
+            returncode=0, stdout=io.BytesIO(NAME_STATUS_Z)
+        )
+        process.__enter__.return_value = process
+        with mock.patch.object(
+            pkg.subprocess, 'Popen', return_value=process
+        ) as popen:
+            assert list(pkg.iter_staged_changes()) == CHANGES
+        assert '-z' in popen.call_args.args[0]
+
+    def test_iter_staged_changes_failure(self) -> None:
+        """Test git failure raises RuntimeError."""
+        process = mock.MagicMock(returncode=128, stdout=io.BytesIO(b''))
+        process.__enter__.return_value = process
+        with (
+            mock.patch.object(pkg.subprocess, 'Popen', return_value=process),
+            pytest.raises(RuntimeError, match='git diff'),
+        ):
+            list(pkg.iter_staged_changes())
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_iter_staged_changes_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test against real git, with awkward file names."""
+        monkeypatch.chdir(tmp_path)
+        subprocess.run(['git', 'init', '-q'], check=True)  # noqa: S607
+        names = ['plain.py', 'with space.py', 'tab\there.py', 'ação.md']
+        for name in names:
+            (tmp_path / name).write_text(name, encoding='utf-8')
+        subprocess.run(['git', 'add', '.'], check=True)  # noqa: S607
+        assert sorted(pkg.iter_staged_changes()) == sorted(
+            StagedChange('A', x) for x in names
+        )
@@ -0,0 +1,123 @@
+"""Tests for tracing module."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from incolume.py.githooks.core import tracing as pkg
+from incolume.py.githooks.core.decorators import logging_call
+from incolume.py.githooks.core.gitlog import iter_log
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def trace(tmp_path: Path) -> Iterator[Path]:
+    """Turn tracing on into a temporary file."""
+    path = tmp_path / 'trace.json'
+    pkg.configure(path)
+    pkg.EVENTS.clear()
+    yield path
+    pkg.configure('')
+    pkg.EVENTS.clear()
+
+
+def load(path: Path) -> list[dict]:
+    """Load a trace as a viewer does, closing the array."""
+    text = path.read_text(encoding='utf-8').rstrip().rstrip(',')
+    return json.loads(f'{text}]')
+
+
+class TestCaseTracing:
+    """Test case for trace-event spans."""
+
+    def test_off(self) -> None:
+        """Test spans and wrappers cost nothing while off."""
+        pkg.configure('')
+        assert pkg.span('x') is pkg.NULL_SPAN
+        assert pkg.traced(len) is len
+        with pkg.span('x'):
+            pass
+        assert pkg.EVENTS == []
+
+    def test_span(self, trace: Path) -> None:  # noqa: ARG002
+        """Test a complete event, even when the block raises."""
+        msg = 'boom'
+        with (
+            pytest.raises(OSError, match=msg),
+            pkg.span('read', 'io', path='a'),
+        ):
+            raise OSError(msg)
+        (event,) = pkg.EVENTS
+        assert event['ph'] == 'X'
+        assert event['dur'] >= 0
+        assert {k: event[k] for k in ('name', 'cat', 'args')} == {
+            'name': 'read',
+            'cat': 'io',
+            'args': {'path': 'a'},
+        }
+
+    def test_hook(self, trace: Path) -> None:  # noqa: ARG002
+        """Test a hook span nests its subprocess and follows the imports."""
+        pkg._hooked = False  # noqa: SLF001
+
+        @logging_call()
+        def hook_cli() -> int:
+            return len(list(iter_log(('%H',), '-1')))
+
+        assert hook_cli()
+        names = [x['name'] for x in pkg.EVENTS]
+        assert names[-2:] == ['git log', 'hook_cli']
+        assert 'imports' in names
+        git, hook = pkg.EVENTS[-2:]
+        assert hook['ts'] <= git['ts']
+        assert git['ts'] + git['dur'] <= hook['ts'] + hook['dur']
+
+    def test_flush(self, trace: Path) -> None:
+        """Test processes append to one array of events."""
+        for name in ('first', 'second'):
+            with pkg.span(name):
+                pass
+            pkg.flush()
+        events = load(trace)
+        assert trace.read_text(encoding='utf-8').startswith('[\n')
+        assert [x['name'] for x in events] == [
+            'first',
+            'process_name',
+            'second',
+            'process_name',
+        ]
+        assert pkg.EVENTS == []
+
+    def test_flush_create(self, trace: Path) -> None:
+        """Test the creating process writes `[` with its events at once."""
+        with pkg.span('first'):
+            pass
+        with mock.patch.object(pkg.os, 'write', wraps=os.write) as write:
+            pkg.flush()
+        (call,) = write.call_args_list
+        assert call.args[1].startswith(b'[\n{')
+        assert trace.read_bytes() == call.args[1]
+
+    def test_process(self, trace: Path) -> None:
+        """Test a hook process writes its trace at exit."""
+        code = (
+            'from incolume.py.githooks.core.tracing import span\n'
+            "with span('child'): pass\n"
+        )
+        subprocess.run(  # noqa: S603
+            [sys.executable, '-c', code],
+            env={pkg.TRACE_VAR: str(trace)},
+            check=True,
+        )
+        events = load(trace)
+        assert [x['name'] for x in events] == ['child', 'process_name']
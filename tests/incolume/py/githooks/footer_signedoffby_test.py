@@ -3,10 +3,54 @@
 from __future__ import annotations
 from typing import NoReturn
 import incolume.py.githooks.footer_signedoffby as pkg
+from incolume.py.githooks import core
+from incolume.py.githooks.core.rules import Backup
 import pytest
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
+import os
+import shutil
+import subprocess  # noqa: S404
+
+SOB = 'Signed-off-by: John Doe <john_doe@example.com>'
+TRAILERS_CORPUS = [
+    '',
+    '\n',
+    'x',
+    'feat: #1 subject',
+    'feat: #1 subject\n',
+    'feat: #1 subject\n\nbody line\n',
+    'feat: #1 subject\n\nbody\n\nAcked-by: A <a@example.com>\n',
+    f'feat: #1 subject\n\n{SOB}\n',
+    f'feat: #1 subject\n\n{SOB.upper()}\n',
+    'feat: #1 subject\n\nSigned-off: John Doe <john_doe@example.com>\n',
+    'feat: #1 subject\n\nSigned-off-by: Other <o@example.com>\n',
+    f'feat: #1 subject\n\nReviewed-by: R\n{SOB}\nAcked-by: A\n',
+    f'{SOB}\n',
+    'feat: #1 subject\n\nbody\nSigned-off-by: A <a>\n# comment\n',
+    'feat: #1 subject\n\nKey :x\n  continued\n(cherry picked from commit 1)'
+    '\nnot a trailer here\n',
+    'feat: #1 subject\n\nnot trailer\nnot trailer\nnot trailer\nA: b\n',
+    'feat: #1 subject\n\nnot\nnot\nnot\nSigned-off-by: A\n',
+    'feat: #1 subject\n\nnot\nnot\nnot\nnot\nSigned-off-by: A\n',
+    'feat: #1 subject\n\n  indented: value\n',
+    'feat: #1 subject\n\nBug: 1\n\n\n# Please enter the commit message\n#\n',
+    '# only comments\n# here\n',
+    '\n# Please enter the commit message\n#\n# On branch main\n',
+    'feat: #1 subject\n\nTested-by: T\n---\n diff --git a/x b/x\n',
+    'feat: #1 subject\n---\nFoo: bar\n',
+    'feat: #1 subject\n\nBar: baz\n# ------------------------ >8'
+    ' ------------------------\n# Do not modify\ndiff --git a/x b/x\n',
+    '# ------------------------ >8 ------------------------\nA: b\n',
+    'feat: #1 subject\n\nFix x\n\nConflicts:\n\tfile.py\n',
+    'feat: #1 subject\r\n\r\nbody\r\n',
+    'feat: #1 subject\n\nçã-ção: valor\n',
+    'feat: #1 subject\n\nSigned-off-by: A\n\n',
+    'title\nsecond title line\nA: b\n',
+    'title\n \nA: b\nB c: d\n',
+    'title\n\nToken-with-dash: v\nEmpty:\n',
+]
 
 
 class TestCaseFooterSignedOffBy:
@@ -38,11 +82,15 @@ class TestCaseFooterSignedOffBy:
 
     def test_get_signed_off_by(self) -> NoReturn:
         """Test get_signed_off_by function."""
-        with patch.object(
-            pkg.subprocess,
-            'check_output',
-            return_value='John Doe <john_doe@example.com>',
-        ) as m:
+        core.get_committer_ident.cache_clear()
+        with (
+            patch.object(core, 'read_ident', return_value=None),
+            patch.object(
+                core.subprocess,
+                'check_output',
+                return_value='John Doe <john_doe@example.com>',
+            ) as m,
+        ):
             assert (
                 pkg.get_signed_off_by()
                 == 'Signed-off-by: John Doe <john_doe@example.com>'
@@ -51,6 +99,25 @@ class TestCaseFooterSignedOffBy:
                 ['git', 'var', 'GIT_COMMITTER_IDENT'],
                 text=True,
             )
+        core.get_committer_ident.cache_clear()
+
+    def test_get_signed_off_by_without_subprocess(self) -> NoReturn:
+        """Test get_signed_off_by resolves the ident once, without git."""
+        core.get_committer_ident.cache_clear()
+        with (
+            patch.object(
+                core, 'read_ident', return_value='Jane <jane@example.com>'
+            ) as ident,
+            patch.object(core.subprocess, 'check_output') as m,
+        ):
+            for _ in range(3):
+                assert (
+                    pkg.get_signed_off_by()
+                    == 'Signed-off-by: Jane <jane@example.com>'
+                )
+            ident.assert_called_once_with('committer')
+            m.assert_not_called()
+        core.get_committer_ident.cache_clear()
 
     def test_add_signed_off_by(self) -> NoReturn:
         """Test add_signed_off_by function."""
@@ -88,3 +155,157 @@ class TestCaseFooterSignedOffBy:
         test_file.write_text(entrance, encoding='utf-8')
         pkg.add_blank_line_if_needed(test_file, commit_source)
         assert test_file.read_text(encoding='utf-8') == expected
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('', f'\n{SOB}\n', marks=[]),
+            pytest.param('feat: #1 x', f'feat: #1 x\n{SOB}\n', marks=[]),
+            pytest.param(
+                'feat: #1 x\n\nAcked-by :A\n# Please enter\n',
+                f'feat: #1 x\n\nAcked-by: A\n{SOB}\n# Please enter\n',
+                marks=[],
+            ),
+            pytest.param(
+                f'feat: #1 x\n\n{SOB}\nAcked-by: A\n',
+                f'feat: #1 x\n\n{SOB}\nAcked-by: A\n',
+                marks=[],
+            ),
+            pytest.param(
+                'feat: #1 x\n\nbody\n---\ndiff\n',
+                f'feat: #1 x\n\nbody\n\n{SOB}\n---\ndiff\n',
+                marks=[],
+            ),
+        ],
+    )
+    def test_interpret_trailers(
+        self, entrance: str, expected: str
+    ) -> NoReturn:
+        """Test interpret_trailers."""
+        assert pkg.interpret_trailers(entrance, SOB) == expected
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    @pytest.mark.parametrize(
+        'entrance',
+        [pytest.param(x, marks=[]) for x in TRAILERS_CORPUS],
+    )
+    def test_interpret_trailers_parity(
+        self, tmp_path: Path, entrance: str
+    ) -> NoReturn:
+        """Test parity with `git interpret-trailers`."""
+        env = {
+            **os.environ,
+            'GIT_CONFIG_NOSYSTEM': '1',
+            'GIT_CONFIG_GLOBAL': os.devnull,
+        }
+        expected = subprocess.run(  # noqa: S603
+            [
+                shutil.which('git'),
+                'interpret-trailers',
+                '--if-exists',
+                'addIfDifferent',
+                '--trailer',
+                SOB,
+            ],
+            input=entrance.encode(),
+            capture_output=True,
+            check=True,
+            cwd=tmp_path,
+            env=env,
+        ).stdout.decode()
+        assert pkg.interpret_trailers(entrance, SOB) == expected
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('feat: #1 x\r\n', f'feat: #1 x\r\n\n{SOB}\n'),
+            pytest.param(f'feat: #1 x\n\n{SOB}\n', f'feat: #1 x\n\n{SOB}\n'),
+        ],
+    )
+    def test_add_signed_off_by_bytes(
+        self, tmp_path: Path, entrance: str, expected: str
+    ) -> NoReturn:
+        """Test add_signed_off_by keeps line endings and skips rewriting."""
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_bytes(entrance.encode())
+        pkg.add_signed_off_by(path=test_file, sob=SOB)
+        assert test_file.read_bytes() == expected.encode()
+
+    @pytest.mark.parametrize(
+        ['entrance', 'expected'],
+        [
+            pytest.param('feat: x\n', 'feat: x\n', marks=[]),
+            pytest.param(
+                'feat: x\r\n  Please enter the commit message\r\n# a\r\n#\r\n'
+                '# b\r\n',
+                'feat: x\r\n# b\r\n',
+                marks=[],
+            ),
+        ],
+    )
+    def test_strip_commit_help(self, entrance, expected) -> None:
+        """Test strip_commit_help keeps everything else verbatim."""
+        assert pkg.strip_commit_help(entrance) == expected
+
+    def test_clean_commit_msg_backup(self, tmp_path) -> None:
+        """Test the original message is hard-linked to `.bak`."""
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_text(
+            'x\nPlease enter the commit message\n#\n', encoding='utf-8'
+        )
+        inode = test_file.stat().st_ino
+        assert pkg.clean_commit_msg(test_file)
+        assert not pkg.clean_commit_msg(test_file, Backup.NONE)
+        backup = test_file.with_suffix('.bak')
+        assert backup.stat().st_ino == inode
+        assert test_file.read_text(encoding='utf-8') == 'x\n'
+
+    @pytest.mark.parametrize(
+        'backup',
+        [
+            pytest.param(Backup.LINK, marks=[]),
+            pytest.param(Backup.COPY, marks=[]),
+            pytest.param(Backup.NONE, marks=[]),
+        ],
+    )
+    def test_clean_commit_msg_streaming(self, tmp_path, backup) -> None:
+        """Test one pass over the file gives the backup and the output."""
+        original = (
+            'feat: x\r\n'
+            + '# keep\n' * 10_000
+            + 'Please enter the commit message\n# help\n#\nbody\n'
+        )
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_bytes(original.encode())
+
+        with (
+            patch.object(Path, 'read_text') as read_text,
+            patch.object(Path, 'read_bytes') as read_bytes,
+        ):
+            assert pkg.clean_commit_msg(test_file, backup)
+        read_text.assert_not_called()
+        read_bytes.assert_not_called()
+
+        assert (
+            test_file.read_bytes()
+            == original.replace(
+                'Please enter the commit message\n# help\n#\n', ''
+            ).encode()
+        )
+        bak = test_file.with_suffix('.bak')
+        assert bak.exists() is (backup is not Backup.NONE)
+        if bak.exists():
+            assert bak.read_bytes() == original.encode()
+        assert sorted(x.name for x in tmp_path.iterdir()) == sorted({
+            test_file.name,
+            bak.name if bak.exists() else test_file.name,
+        })
+
+    def test_clean_commit_msg_unchanged(self, tmp_path) -> None:
+        """Test an unchanged message is neither replaced nor backed up."""
+        test_file = tmp_path / 'COMMIT_EDITMSG'
+        test_file.write_text('feat: x\n', encoding='utf-8')
+        inode = test_file.stat().st_ino
+        assert not pkg.clean_commit_msg(test_file, Backup.COPY)
+        assert test_file.stat().st_ino == inode
+        assert list(tmp_path.iterdir()) == [test_file]
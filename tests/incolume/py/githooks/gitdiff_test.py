@@ -1,6 +1,7 @@
 """Test Module for gitdiff."""
 
 import incolume.py.githooks.gitdiff as pkg
+from incolume.py.githooks.core.staged import StagedChange
 
 import pytest
 import tempfile
@@ -38,3 +39,35 @@ class TestCaseGitDiff:
         test_file.write_text(commit_msg_file, encoding='utf-8')
         pkg.insert_git_diff(test_file, diff_output)
         assert test_file.read_text(encoding='utf-8') == expected
+
+    @pytest.mark.parametrize(
+        ['changes', 'top', 'expected'],
+        [
+            pytest.param([], 10, '', marks=[]),
+            pytest.param(
+                [StagedChange('A', 'x.py')],
+                10,
+                '1 arquivos alterados em 1 diretórios\n1\t./\nA\tx.py',
+                marks=[],
+            ),
+            pytest.param(
+                [StagedChange('M', f'pkg/m{x}.py') for x in range(1000)]
+                + [StagedChange('R100', 'docs/new.md', 'docs/old.md')],
+                2,
+                '1001 arquivos alterados em 2 diretórios\n1000\tpkg/\n'
+                '1\tdocs/\nM\tpkg/m0.py\nM\tpkg/m1.py\n'
+                '... mais 999 arquivos',
+                marks=[],
+            ),
+            pytest.param(
+                [StagedChange('A', f'd{x}/f.py') for x in range(5)],
+                0,
+                '5 arquivos alterados em 5 diretórios\n'
+                '... mais 5 diretórios\n... mais 5 arquivos',
+                marks=[],
+            ),
+        ],
+    )
+    def test_summarize_git_diff(self, changes, top, expected) -> None:
+        """Test summarize_git_diff caps its output."""
+        assert pkg.summarize_git_diff(iter(changes), top) == expected
@@ -4,12 +4,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import os
 import re
 import shutil
+import subprocess  # noqa: S404
 from typing import NoReturn
 from unittest.mock import patch
 from icecream import ic
 import pytest
+from incolume.py.githooks.core import GitContext
 from incolume.py.githooks.core.rules import Result, Status
 import incolume.py.githooks.prepare_commit_msg as pkg
 from tempfile import NamedTemporaryFile, gettempdir
@@ -341,12 +344,11 @@ class TestCasePrepareCommitMsg:
         with NamedTemporaryFile(dir=self.test_dir) as fl:
             test_file = Path(fl.name)
         test_file.write_bytes(message_commit.encode())
-        with patch.object(
-            pkg,
-            'get_branchname',
-            return_value=return_value,
-        ):
-            result = pkg.prefixing_commit_msg(test_file)
+        with patch.object(pkg, 'get_git_context') as m:
+            result = pkg.prefixing_commit_msg(
+                test_file, context=GitContext(branchname=return_value)
+            )
+            m.assert_not_called()
             assert result == expected
             v = (
                 f'[{x.group(2)}] {message_commit}'
@@ -361,3 +363,94 @@ class TestCasePrepareCommitMsg:
             )
             ic(v)
             assert test_file.read_text(encoding='utf-8') == v
+
+
+class TestCaseCommitRange:
+    """Test case for validating a range of commits at once."""
+
+    MESSAGES = (
+        ('a' * 40, 'feat: #1 implementado o metodo fake.\n'),
+        ('b' * 40, 'wip\n'),
+        ('c' * 40, 'fix(ui): #2 [bracket] subject\n\nbody\n'),
+    )
+
+    def test_validate_commit_range(self) -> None:
+        """Test each commit gets its own result from a single log."""
+        with patch.object(
+            pkg, 'iter_commit_messages', return_value=iter(self.MESSAGES)
+        ) as m:
+            results = dict(pkg.validate_commit_range('main..HEAD'))
+        m.assert_called_once_with('main..HEAD')
+        assert [r.code for r in results.values()] == [
+            Status.SUCCESS,
+            Status.FAILURE,
+            Status.SUCCESS,
+        ]
+        failure = results['b' * 40].message.splitlines()
+        assert failure[0] == f'[red][FAIL][/red] {"b" * 12} wip'
+        assert failure[1:] == [
+            '    - format: Your commit was rejected due to the invalid'
+            ' commit message...',
+            '    - type: Error: Commit message must start with a type'
+            ' (e.g., feat:, fix:).',
+            '    - min-len: Error: Commit subject line has an insufficient'
+            ' number of 10 characters allowed (3 - wip).',
+        ]
+        assert r'\[bracket]' in results['c' * 40].message
+
+    def test_validate_commit_range_checks(self) -> None:
+        """Test only the given checks are applied."""
+        with patch.object(
+            pkg, 'iter_commit_messages', return_value=iter(self.MESSAGES)
+        ):
+            results = pkg.validate_commit_range(
+                'x', checks={'max-len': pkg.message_checks()['max-len']}
+            )
+            assert {r.code for _, r in results} == {Status.SUCCESS}
+
+    @pytest.mark.parametrize(
+        ['environ', 'upstream', 'expected'],
+        [
+            pytest.param({}, True, ('@{upstream}..HEAD',), marks=[]),
+            pytest.param({}, False, ('HEAD', '--not', '--remotes'), marks=[]),
+            pytest.param(
+                {'PRE_COMMIT_FROM_REF': 'a1', 'PRE_COMMIT_TO_REF': 'b2'},
+                False,
+                ('a1..b2',),
+                marks=[],
+            ),
+        ],
+    )
+    def test_default_commit_range(
+        self,
+        environ: dict[str, str],
+        upstream: bool,  # noqa: FBT001
+        expected: tuple[str, ...],
+        monkeypatch,
+    ) -> None:
+        """Test the range given by pre-commit is preferred."""
+        monkeypatch.delenv('PRE_COMMIT_FROM_REF', raising=False)
+        monkeypatch.delenv('PRE_COMMIT_TO_REF', raising=False)
+        for key, value in environ.items():
+            monkeypatch.setenv(key, value)
+        with patch.object(pkg, 'has_upstream', return_value=upstream):
+            assert pkg.default_commit_range() == expected
+
+    @pytest.mark.skipif(not shutil.which('git'), reason='git not found')
+    def test_default_commit_range_new_branch(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Test a local branch with no upstream validates its commits."""
+        monkeypatch.delenv('PRE_COMMIT_FROM_REF', raising=False)
+        monkeypatch.delenv('PRE_COMMIT_TO_REF', raising=False)
+        monkeypatch.setenv('GIT_CONFIG_GLOBAL', os.devnull)
+        monkeypatch.chdir(tmp_path)
+        git = ['git', '-c', 'user.name=A', '-c', 'user.email=a@b']
+        subprocess.run([*git, 'init', '-q'], check=True)  # noqa: S603
+        subprocess.run(  # noqa: S603
+            [*git, 'commit', '-q', '--allow-empty', '-m', 'wip'], check=True
+        )
+
+        assert not pkg.has_upstream()
+        results = list(pkg.validate_commit_range(*pkg.default_commit_range()))
+        assert [r.code for _, r in results] == [Status.FAILURE]
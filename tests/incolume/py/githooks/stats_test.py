@@ -0,0 +1,95 @@
+"""Tests for stats module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from incolume.py.githooks import stats as pkg
+from incolume.py.githooks.core.timing import Timing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def history(hook: str, walls: list[float], code: int = 0) -> list[Timing]:
+    """Build timings of a hook."""
+    return [Timing(hook, wall, code=code) for wall in walls]
+
+
+class TestCaseStats:
+    """Test case for hook latency reports."""
+
+    def test_read_history(self, tmp_path: Path) -> None:
+        """Test broken lines and unknown fields are tolerated."""
+        path = tmp_path / 'timings.jsonl'
+        path.write_text(
+            '{"hook":"a_cli","wall":0.5,"extra":1}\n'
+            '{"hook":"b_cli","wa\n'
+            '[]\n'
+            '{"hook":"c_cli","wall":0.1,"code":1}\n',
+            encoding='utf-8',
+        )
+        assert list(pkg.read_history(path)) == [
+            Timing('a_cli', 0.5),
+            Timing('c_cli', 0.1, code=1),
+        ]
+
+    def test_read_history_missing(self, tmp_path: Path) -> None:
+        """Test a missing history is empty."""
+        assert not list(pkg.read_history(tmp_path / 'nope.jsonl'))
+
+    @pytest.mark.parametrize(
+        ['q', 'expected'],
+        [
+            pytest.param(0, 1.0, marks=[]),
+            pytest.param(50, 3.0, marks=[]),
+            pytest.param(100, 5.0, marks=[]),
+        ],
+    )
+    def test_percentile(self, q: float, expected: float) -> None:
+        """Test percentiles of sorted values."""
+        assert pkg.percentile([1.0, 2.0, 3.0, 4.0, 5.0], q) == expected
+
+    def test_hook_stats(self) -> None:
+        """Test percentiles, failures and the slowest hook first."""
+        timings = [
+            *history('fast_cli', [0.01, 0.02, 0.03]),
+            *history('slow_cli', [0.2, 0.4], code=1),
+        ]
+        fast, slow = pkg.hook_stats(timings)[::-1]
+        assert (slow.hook, slow.calls, slow.failures) == ('slow_cli', 2, 2)
+        assert (fast.p50, fast.slowest) == (0.02, 0.03)
+        assert fast.baseline is fast.recent is None
+        assert not fast.regression
+
+    @pytest.mark.parametrize(
+        ['recent_wall', 'expected'],
+        [
+            pytest.param(0.1, False, marks=[]),
+            pytest.param(0.14, False, marks=[]),
+            pytest.param(0.2, True, marks=[]),
+        ],
+    )
+    def test_hook_stats_regression(
+        self, recent_wall: float, *, expected: bool
+    ) -> None:
+        """Test recent calls are compared with the older ones."""
+        timings = history('a_cli', [0.1] * 10 + [recent_wall] * 3)
+        (item,) = pkg.hook_stats(timings, recent=3, threshold=1.5)
+        assert (item.baseline, item.recent) == (0.1, recent_wall)
+        assert item.regression is expected
+
+    def test_hook_stats_no_recent(self) -> None:
+        """Test no trend is computed without recent calls."""
+        (item,) = pkg.hook_stats(history('a_cli', [0.1] * 10), recent=0)
+        assert item.baseline is item.recent is None
+
+    def test_render_stats(self) -> None:
+        """Test one row per hook."""
+        table = pkg.render_stats(
+            pkg.hook_stats(history('a_cli', [0.1] * 6 + [0.5]), recent=1)
+        )
+        assert table.row_count == 1
+        assert table.columns[-1]._cells == ['[red]100.0 -> 500.0[/red]']  # noqa: SLF001
@@ -1,12 +1,24 @@
 """Test for module validate_branchname."""
 
-# ruff: noqa: E501 SLF001
+# ruff: noqa: E501
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 import pytest
+from incolume.py.githooks.core.registry import RULES
 from incolume.py.githooks.core.rules import Status, Result
-from incolume.py.githooks.validate_branchname import ValidateBranchname
+from incolume.py.githooks.validate_branchname import (
+    BranchViolation,
+    RefAudit,
+    ValidateBranchname,
+    audit_refnames,
+    classify_branchname,
+    render_violations,
+    violation_names,
+)
 from icecream import ic
-from incolume.py.githooks.core import debug_enable
+from incolume.py.githooks.core import GitContext, debug_enable
 
 ic(debug_enable())
 
@@ -19,8 +31,6 @@ class TestCaseValidateBranchname:
         [
             pytest.param('msg_ok', marks=[]),
             pytest.param('msg_refused', marks=[]),
-            pytest.param('violation_text', marks=[]),
-            pytest.param('result', marks=[]),
             pytest.param('branchname', marks=[]),
         ],
     )
@@ -32,30 +42,16 @@ class TestCaseValidateBranchname:
         assert entrance in result
 
     @pytest.mark.parametrize(
-        ['branchname', 'violation_txt', 'expected'],
+        ['branchname', 'expected'],
         [
-            pytest.param('main', '', True, marks=[]),
-            pytest.param(
-                'ma',
-                '\n - Branch name "ma" length is invalid. Min 3 and Max 255 characters.',
-                False,
-                marks=[],
-            ),
-            pytest.param(
-                'm' * 256,
-                '\n - Branch name "mmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmmm" length is invalid. Min 3 and Max 255 characters.',
-                False,
-                marks=[],
-            ),
+            pytest.param('main', True, marks=[]),
+            pytest.param('ma', False, marks=[]),
+            pytest.param('m' * 256, False, marks=[]),
         ],
     )
-    def test_is_lenght_valid(
-        self, *, branchname: str, violation_txt: str, expected: bool
-    ) -> None:
+    def test_is_lenght_valid(self, *, branchname: str, expected: bool) -> None:
         """Test if lenght branchname is valid."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_length_valid(branchname) == expected
-        assert v.violation_text == violation_txt
+        assert bool(RULES.match('branchname_length', branchname)) is expected
 
     @pytest.mark.parametrize(
         ['branchname', 'expected'],
@@ -71,8 +67,8 @@ class TestCaseValidateBranchname:
     )
     def test_is_dev_branch(self, *, branchname: str, expected: bool) -> None:
         """Test is_default_branch method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_branch_dev(branchname) == expected
+        violations = classify_branchname(branchname, protected_dev=True)
+        assert bool(violations & BranchViolation.PROTECTED_DEV) is expected
 
     @pytest.mark.parametrize(
         ['branchname', 'expected'],
@@ -88,8 +84,8 @@ class TestCaseValidateBranchname:
     )
     def test_is_tags_branch(self, *, branchname: str, expected: bool) -> None:
         """Test is_default_branch method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_branch_tags(branchname) == expected
+        violations = classify_branchname(branchname, protected_tags=True)
+        assert bool(violations & BranchViolation.PROTECTED_TAGS) is expected
 
     @pytest.mark.parametrize(
         ['branchname', 'expected'],
@@ -106,8 +102,8 @@ class TestCaseValidateBranchname:
     )
     def test_is_main_branch(self, *, branchname: str, expected: bool) -> None:
         """Test is_default_branch method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_branch_main(branchname) == expected
+        violations = classify_branchname(branchname)
+        assert bool(violations & BranchViolation.PROTECTED_MAIN) is expected
 
     @pytest.mark.parametrize(
         ['branchname', 'violation_txt', 'expected'],
@@ -124,22 +120,9 @@ class TestCaseValidateBranchname:
         self, *, branchname: str, violation_txt: str, expected: bool
     ) -> None:
         """Test is_refused method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_refused(branchname) == expected
-        assert v.violation_text == violation_txt
-
-    @pytest.mark.parametrize(
-        ['branchname', 'expected'],
-        [
-            pytest.param('main', True, marks=[]),
-            pytest.param('master', True, marks=[]),
-            pytest.param('develop', False, marks=[]),
-        ],
-    )
-    def test_is_branch_main(self, branchname, expected) -> None:
-        """Test is_branch_main method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_branch_main(branchname) is expected
+        violations = classify_branchname(branchname) & BranchViolation.REFUSED
+        assert bool(violations) is expected
+        assert render_violations(branchname, violations) == violation_txt
 
     @pytest.mark.parametrize(
         ['branchname', 'violation_txt', 'expected'],
@@ -187,11 +170,11 @@ class TestCaseValidateBranchname:
         self, *, branchname: str, violation_txt: str, expected: bool
     ) -> None:
         """Test matches_rule method."""
-        v = ValidateBranchname()
-        assert (
-            v._ValidateBranchname__is_not_matches_rule(branchname) == expected
+        violations = (
+            classify_branchname(branchname) & BranchViolation.NOT_MATCHES_RULE
         )
-        assert v.violation_text == violation_txt
+        assert bool(violations) is expected
+        assert render_violations(branchname, violations) == violation_txt
 
     @pytest.mark.parametrize(
         ['branchname', 'expected'],
@@ -207,8 +190,7 @@ class TestCaseValidateBranchname:
     )
     def test_is_github_branch(self, branchname, expected) -> None:
         """Test is_github_branch method."""
-        v = ValidateBranchname()
-        assert v._ValidateBranchname__is_github_branch(branchname) is expected
+        assert bool(RULES.match('branchname_github', branchname)) is expected
 
     @pytest.mark.parametrize(
         ['branchname', 'expected'],
@@ -223,10 +205,9 @@ class TestCaseValidateBranchname:
         ],
     )
     def test_is_enhancement_epoch(self, branchname, expected) -> None:
-        """Test is_github_branch method."""
-        v = ValidateBranchname()
+        """Test is_enhancement_epoch method."""
         assert (
-            v._ValidateBranchname__is_enhancement_epoch(branchname) is expected
+            bool(RULES.match('branchname_enhancement', branchname)) is expected
         )
 
     @pytest.mark.parametrize(
@@ -243,12 +224,8 @@ class TestCaseValidateBranchname:
         ],
     )
     def test_is_incolume_branch_rule(self, branchname, expected) -> None:
-        """Test is_github_branch method."""
-        v = ValidateBranchname()
-        assert (
-            v._ValidateBranchname__is_incolume_branch_rule(branchname)
-            is expected
-        )
+        """Test is_incolume_branch_rule method."""
+        assert bool(RULES.match('branchname_incolume', branchname)) is expected
 
     @pytest.mark.parametrize(
         ['entrance', 'kwargs', 'expected'],
@@ -341,3 +318,169 @@ class TestCaseValidateBranchname:
         captured = capsys.readouterr()
         assert expected.code.value == result
         assert expected.message == captured.out.strip()
+
+
+class TestCaseValidateReentrant:
+    """Test case for reusing one ValidateBranchname instance."""
+
+    def test_validate_does_not_leak(self, capsys) -> None:
+        """Test a failure does not taint later branch names."""
+        v = ValidateBranchname(context=GitContext(branchname='x'))
+        first = v.validate('wip')
+        second = v.validate('123-abc')
+        assert first.code is Status.FAILURE
+        assert second == Result(Status.SUCCESS, v.msg_ok)
+        assert first is not second
+        assert v.is_valid('123-abc') == Status.SUCCESS.value
+        assert 'OK' in capsys.readouterr().out
+
+    def test_validate_without_git(self) -> None:
+        """Test an explicit branch name never asks git."""
+        with mock.patch(
+            'incolume.py.githooks.core.get_branchname',
+            side_effect=AssertionError('git queried'),
+        ):
+            v = ValidateBranchname(context=GitContext())
+            assert v.validate('123-abc').code is Status.SUCCESS
+
+    def test_validate_threads(self) -> None:
+        """Test one shared instance from many threads."""
+        v = ValidateBranchname(context=GitContext(branchname='x'))
+        names = ['123-abc', 'wip', 'main', 'feat/issue#1'] * 250
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            codes = list(pool.map(lambda x: v.validate(x).code, names))
+        assert (
+            codes
+            == [
+                Status.SUCCESS,
+                Status.FAILURE,
+                Status.FAILURE,
+                Status.SUCCESS,
+            ]
+            * 250
+        )
+
+
+class TestCaseClassifyBranchname:
+    """Test case for the single pass classifier."""
+
+    @pytest.mark.parametrize(
+        ['branchname', 'kwargs', 'expected'],
+        [
+            pytest.param('123-abc', {}, BranchViolation.NONE, marks=[]),
+            pytest.param(
+                'enhancement-1627890123', {}, BranchViolation.NONE, marks=[]
+            ),
+            pytest.param(
+                'main',
+                {},
+                BranchViolation.PROTECTED_MAIN
+                | BranchViolation.NOT_MATCHES_RULE,
+                marks=[],
+            ),
+            pytest.param(
+                'main',
+                {'protected_main': False},
+                BranchViolation.NOT_MATCHES_RULE,
+                marks=[],
+            ),
+            pytest.param(
+                'development',
+                {'protected_dev': True},
+                BranchViolation.PROTECTED_DEV
+                | BranchViolation.NOT_MATCHES_RULE,
+                marks=[],
+            ),
+            pytest.param(
+                'tags',
+                {'protected_tags': True},
+                BranchViolation.PROTECTED_TAGS
+                | BranchViolation.NOT_MATCHES_RULE,
+                marks=[],
+            ),
+            pytest.param(
+                'WIP',
+                {},
+                BranchViolation.REFUSED | BranchViolation.NOT_MATCHES_RULE,
+                marks=[],
+            ),
+            pytest.param('123-wip-fix', {}, BranchViolation.REFUSED, marks=[]),
+        ],
+    )
+    def test_classify_branchname(
+        self, branchname: str, kwargs: dict, expected: BranchViolation
+    ) -> None:
+        """Test violations bitmask."""
+        assert classify_branchname(branchname, **kwargs) == expected
+
+    def test_render_violations(self) -> None:
+        """Test messages are rendered in rule order."""
+        assert render_violations(
+            'main', BranchViolation.PROTECTED_MAIN | BranchViolation.REFUSED
+        ) == (
+            '\n - Branch name "main" is protected.'
+            '\n - Can not be WIP (Work in Progress)'
+        )
+        assert not render_violations('123-abc', BranchViolation.NONE)
+
+
+class TestCaseAuditRefnames:
+    """Test case for the bulk ref name audit."""
+
+    def test_audit_refnames(self, capsys) -> None:
+        """Test offending refs are collected silently."""
+        report = audit_refnames([
+            'refs/heads/main',
+            'refs/heads/123-abc',
+            'refs/heads/wip',
+            'refs/remotes/origin/wip',
+            'refs/remotes/origin/development',
+            'refs/tags/v1.0.0',
+        ])
+        assert report == RefAudit(
+            total=5,
+            offending=[
+                (
+                    'refs/heads/wip',
+                    BranchViolation.REFUSED | BranchViolation.NOT_MATCHES_RULE,
+                ),
+                (
+                    'refs/remotes/origin/wip',
+                    BranchViolation.REFUSED | BranchViolation.NOT_MATCHES_RULE,
+                ),
+            ],
+        )
+        assert not capsys.readouterr().out
+
+    def test_audit_refnames_classifies_once(self) -> None:
+        """Test a branch shared by remotes is classified once."""
+        with mock.patch(
+            'incolume.py.githooks.validate_branchname.classify_branchname',
+            return_value=BranchViolation.NONE,
+        ) as m:
+            report = audit_refnames([
+                'refs/heads/x-y',
+                'refs/remotes/origin/x-y',
+                'refs/remotes/upstream/x-y',
+            ])
+        m.assert_called_once_with('x-y', protected_main=False)
+        assert report == RefAudit(total=3)
+
+    @pytest.mark.parametrize(
+        ['violations', 'expected'],
+        [
+            pytest.param(BranchViolation.NONE, '', marks=[]),
+            pytest.param(BranchViolation.REFUSED, 'refused', marks=[]),
+            pytest.param(
+                BranchViolation.PROTECTED_MAIN
+                | BranchViolation.NOT_MATCHES_RULE,
+                'protected_main, not_matches_rule',
+                marks=[],
+            ),
+        ],
+    )
+    def test_violation_names(
+        self, violations: BranchViolation, expected: str
+    ) -> None:
+        """Test names follow the rule order."""
+        assert violation_names(violations) == expected